@@ -0,0 +1,179 @@
+"""
+Open API 동시 요청기
+
+국가법령정보 Open API처럼 호출 제한이 있는 JSON API를 여러 스레드로 호출합니다.
+- 토큰 버킷 기반 전역 호출 속도 제한 (모든 스레드가 공유)
+- 동시 요청 수 제한 (호출 스레드와 무관하게 전역 세마포어로 제한)
+- 일시적 오류(연결 오류, 타임아웃, 429/5xx, JSON 파싱 실패)에 지수 백오프 재시도
+- requests.Session 커넥션 풀 재사용
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+# 재시도할 HTTP 상태 코드
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 속도 제한기"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 토큰 보충 수 (초당 허용 요청 수)
+            capacity: 버킷 크기 (순간 최대 버스트, 기본: 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개를 얻을 때까지 대기
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+
+                wait = (1.0 - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+
+class ConcurrentFetcher:
+    """속도 제한 + 재시도가 적용된 동시 JSON 요청기"""
+
+    def __init__(self, rate_per_sec: float = 3.0, max_concurrency: int = 4,
+                 max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, timeout: float = 30.0):
+        """
+        Args:
+            rate_per_sec: 초당 최대 요청 수 (모든 스레드 합산)
+            max_concurrency: 동시 요청 수
+            max_retries: 일시적 오류 시 최대 재시도 횟수
+            backoff_base: 첫 재시도 대기 시간 (초), 이후 2배씩 증가
+            backoff_max: 재시도 대기 시간 상한 (초)
+            timeout: 요청 타임아웃 (초)
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.rate_limiter = TokenBucket(rate_per_sec)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self._requests = requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="api-fetch")
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "rate_wait_sec": 0.0}
+
+    def fetch(self, url: str, params: Dict) -> Optional[Dict]:
+        """단일 요청 (속도 제한, 재시도 포함)
+
+        어느 스레드에서 호출해도 동시 요청 수와 속도 제한은 모든 호출이 공유합니다.
+
+        Returns:
+            JSON 응답, 재시도 후에도 실패하면 None
+        """
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            waited = self.rate_limiter.acquire()
+            self._count("rate_wait_sec", waited)
+            self._count("requests")
+
+            retry_after = None
+            try:
+                with self._slots:
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code in TRANSIENT_STATUS:
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                    last_error = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    return response.json()
+            except (self._requests.exceptions.ConnectionError,
+                    self._requests.exceptions.Timeout) as e:
+                last_error = f"{type(e).__name__}: {e}"
+            except ValueError as e:
+                # 서버 과부하 시 JSON 대신 HTML 오류 페이지가 오는 경우
+                last_error = f"JSON 파싱 실패: {e}"
+            except self._requests.exceptions.RequestException as e:
+                # 4xx 등 재시도해도 소용없는 오류
+                print(f"API 요청 실패: {e}")
+                self._count("failures")
+                return None
+
+            if attempt < self.max_retries:
+                self._count("retries")
+                time.sleep(retry_after if retry_after is not None else self._backoff(attempt))
+
+        print(f"API 요청 실패 ({self.max_retries}회 재시도 후): {last_error}")
+        self._count("failures")
+        return None
+
+    def fetch_many(self, url: str, params_list: Iterable[Dict]) -> Iterator[Tuple[Dict, Optional[Dict]]]:
+        """여러 요청을 동시에 실행, 요청 순서대로 (params, 응답) 반환"""
+        params_list = list(params_list)
+        futures = [self._executor.submit(self.fetch, url, params) for params in params_list]
+        for params, future in zip(params_list, futures):
+            yield params, future.result()
+
+    def submit(self, url: str, params: Dict):
+        """요청을 스레드 풀에 제출하고 Future 반환"""
+        return self._executor.submit(self.fetch, url, params)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _backoff(self, attempt: int) -> float:
+        """지수 백오프 + 지터"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return min(self.backoff_max, float(value))
+        except ValueError:
+            return None
+
+    def _count(self, key: str, value: float = 1):
+        with self._stats_lock:
+            self.stats[key] += value
+
@@ -0,0 +1,186 @@
+"""
+전처리 모듈 import 시간 측정
+
+각 모듈을 새 인터프리터에서 `python -X importtime -c "import <module>"`으로 import하여
+- 전체 import 누적 시간
+- 프로세스 시작~종료 wall time
+- 무거운 의존성(torch, transformers 등)이 import 시점에 로딩되는지
+를 보고합니다. --before <git ref>를 주면 해당 커밋의 ai/preprocessing을 임시 디렉토리에
+풀어서 같은 측정을 하고 변경 전/후를 비교합니다.
+
+사용법:
+    python benchmark_import.py
+    python benchmark_import.py --before HEAD~1
+    python benchmark_import.py --save import_baseline.json
+    python benchmark_import.py --compare import_baseline.json
+"""
+
+import json
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+MODULES = [
+    "pdf_extractor",
+    "chunker",
+    "embedder",
+    "extract_contract_fields",
+    "collect_legal_data",
+    "test_embeddings",
+    "search_server",
+]
+
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "pdfplumber",
+    "requests",
+]
+
+
+def parse_importtime(stderr: str) -> Dict:
+    """-X importtime 출력 파싱
+
+    각 줄 형식: "import time: <self us> | <cumulative us> | <들여쓰기><모듈명>"
+    """
+    total_us = 0
+    modules = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        cumulative_us = int(cumulative_us)
+
+        modules[name] = cumulative_us
+        if depth == 0:
+            total_us += cumulative_us
+
+    return {"total_us": total_us, "modules": modules}
+
+
+def measure_module(module: str, cwd: Path, repeat: int = 3) -> Dict:
+    """모듈 하나의 import 시간 측정 (repeat회 중 최소값)"""
+    best: Optional[Dict] = None
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd, capture_output=True, text=True
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "unknown error"
+            return {"module": module, "error": error}
+
+        parsed = parse_importtime(proc.stderr)
+        result = {
+            "module": module,
+            "import_ms": parsed["total_us"] / 1000,
+            "wall_ms": wall_ms,
+            "heavy": sorted(m for m in HEAVY_MODULES if m in parsed["modules"]),
+        }
+        if best is None or result["import_ms"] < best["import_ms"]:
+            best = result
+
+    return best
+
+
+def measure_all(cwd: Path, modules: List[str], repeat: int = 3) -> Dict[str, Dict]:
+    results = {}
+    for module in modules:
+        if not (cwd / f"{module}.py").exists():
+            continue
+        results[module] = measure_module(module, cwd, repeat)
+    return results
+
+
+def export_ref(ref: str, dest: Path) -> Path:
+    """git ref의 ai/preprocessing을 임시 디렉토리로 추출"""
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    archive = subprocess.run(
+        ["git", "-C", str(repo_root), "archive", ref, "ai/preprocessing"],
+        capture_output=True, check=True
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(dest)
+    return dest / "ai" / "preprocessing"
+
+
+def print_report(current: Dict[str, Dict], before: Optional[Dict[str, Dict]] = None):
+    print("\n" + "=" * 80)
+    print("모듈 import 시간")
+    print("=" * 80)
+
+    if before:
+        print(f"{'모듈':<26}{'이전(ms)':>10}{'현재(ms)':>10}{'변화':>9}  무거운 의존성(이전 → 현재)")
+    else:
+        print(f"{'모듈':<26}{'import(ms)':>11}{'wall(ms)':>10}  무거운 의존성")
+    print("-" * 80)
+
+    for module, result in current.items():
+        if "error" in result:
+            print(f"{module:<26}  실패: {result['error']}")
+            continue
+
+        heavy = ", ".join(result["heavy"]) or "-"
+        prev = (before or {}).get(module)
+
+        if before and prev and "error" not in prev:
+            change = result["import_ms"] - prev["import_ms"]
+            prev_heavy = ", ".join(prev["heavy"]) or "-"
+            print(f"{module:<26}{prev['import_ms']:>10.1f}{result['import_ms']:>10.1f}{change:>+9.1f}  "
+                  f"{prev_heavy} → {heavy}")
+        elif before and prev:
+            print(f"{module:<26}{'실패':>10}{result['import_ms']:>10.1f}{'':>9}  ? → {heavy}")
+        else:
+            print(f"{module:<26}{result['import_ms']:>11.1f}{result['wall_ms']:>10.1f}  {heavy}")
+
+    print("=" * 80)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="전처리 모듈 import 시간 측정")
+    parser.add_argument("--before", help="비교할 git ref (예: HEAD~1)")
+    parser.add_argument("--save", help="현재 측정 결과를 JSON으로 저장")
+    parser.add_argument("--compare", help="저장된 JSON 결과와 비교")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    current = measure_all(Path(__file__).resolve().parent, args.modules, args.repeat)
+
+    before = None
+    if args.before:
+        with tempfile.TemporaryDirectory() as tmp:
+            before_dir = export_ref(args.before, Path(tmp))
+            before = measure_all(before_dir, args.modules, args.repeat)
+    elif args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            before = json.load(f)
+
+    print_report(current, before)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"저장 완료: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
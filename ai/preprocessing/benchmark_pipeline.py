@@ -0,0 +1,546 @@
+"""
+전처리 파이프라인 단계별 벤치마크
+
+재현 가능한 합성 코퍼스(한국어 근로계약서 조항, 임금 표, 제N조 조문이 들어간 PDF)를 만들고
+각 단계를 측정합니다.
+
+    extract   PDFExtractor.extract_text                 (PDF 1개 단위)
+    chunk     DocumentChunker 표준계약서/취업규칙 청킹   (문서 1개 단위)
+    validate  ContractValidator 필수 필드 검증          (계약서 1개 단위)
+    terms     수치 조건 추출 + 법정 기준 점검           (계약서 1개 단위)
+    embed     DocumentEmbedder.encode_texts             (배치 단위, 처리량은 청크 기준)
+    search    EmbeddingTester.search_by_embedding       (쿼리 1개 단위, 절반은 category 필터)
+
+단계마다 처리량(건/초), 항목별 지연 시간 p50/p90/p99, 최대 메모리(tracemalloc)를 보고하고,
+--save로 저장한 기준 결과와 --compare로 비교해 허용 범위를 넘는 회귀가 있으면 종료 코드 1로 끝납니다.
+
+PDF는 외부 라이브러리 없이 직접 작성합니다 (비내장 CJK 기본 폰트 HYSMyeongJo-Medium, UniKS-UCS2-H).
+같은 --seed, --contracts면 항상 같은 바이트의 코퍼스가 만들어집니다.
+
+사용법:
+    python benchmark_pipeline.py --contracts 100 --save pipeline_baseline.json
+    python benchmark_pipeline.py --contracts 100 --compare pipeline_baseline.json
+    python benchmark_pipeline.py --stages chunk,validate,terms --skip-embed
+"""
+
+import json
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+STAGES = ["extract", "chunk", "validate", "terms", "embed", "search"]
+
+# 코퍼스 생성 방식이 바뀌면 올림 (저장된 코퍼스 재사용 방지)
+CORPUS_VERSION = 1
+
+# 회귀 판정에서 무시할 절대 변화량 (측정 잡음)
+MIN_LATENCY_DELTA_MS = 1.0
+MIN_MEMORY_DELTA_MB = 1.0
+
+CONTRACT_HEADERS = [
+    "표준근로계약서(기간의 정함이 없는 경우)",
+    "표준근로계약서(기간의 정함이 있는 경우)",
+    "연소근로자(18세 미만인 자) 표준근로계약서",
+    "건설일용근로자 표준근로계약서",
+    "단시간근로자 표준근로계약서",
+]
+
+WORKPLACES = ["서울특별시 강남구 테헤란로 152", "부산광역시 해운대구 센텀중앙로 97",
+              "대전광역시 유성구 대학로 99", "경기도 성남시 분당구 판교역로 235"]
+DUTIES = ["소프트웨어 개발 및 유지보수", "매장 판매 및 재고 관리", "건축 현장 자재 운반",
+          "사무 보조 및 문서 작성", "고객 상담 및 민원 응대"]
+
+ARTICLES = [
+    ("목적", "이 규칙은 회사의 근로조건과 복무규율에 관한 사항을 정함을 목적으로 한다."),
+    ("적용범위", "이 규칙은 회사에 근무하는 모든 근로자에게 적용한다. 다만 단시간근로자는 별도로 정할 수 있다."),
+    ("근로시간", "근로시간은 휴게시간을 제외하고 1일 8시간, 1주 40시간으로 한다. 시업 및 종업 시각은 업무 사정에 따라 조정할 수 있다."),
+    ("연장근로", "당사자 간 합의하면 1주 12시간 한도로 연장근로를 할 수 있으며 통상임금의 50% 이상을 가산하여 지급한다."),
+    ("휴일", "주휴일은 매주 일요일로 하며 근로자의 날과 관공서 공휴일은 유급휴일로 한다."),
+    ("연차유급휴가", "1년간 80퍼센트 이상 출근한 근로자에게 15일의 유급휴가를 준다. 계속근로기간이 1년 미만인 근로자에게는 1개월 개근 시 1일의 유급휴가를 준다."),
+    ("임금의 구성", "임금은 기본급과 제수당으로 구성하며 매월 1일부터 말일까지 산정하여 다음 달 10일에 지급한다."),
+    ("퇴직금", "1년 이상 계속 근로한 근로자가 퇴직하는 경우 계속근로기간 1년에 대하여 30일분 이상의 평균임금을 퇴직금으로 지급한다."),
+    ("징계", "징계는 견책, 감봉, 정직, 해고로 구분하며 징계위원회의 의결을 거쳐 결정한다."),
+    ("안전보건", "회사는 산업안전보건법에 따라 근로자의 안전과 보건을 유지하기 위한 조치를 하여야 한다."),
+]
+
+
+def generate_contract(rng: random.Random, index: int) -> List[List]:
+    """합성 계약서 하나 (페이지 목록, 페이지는 줄 목록. 문자열은 텍스트 줄, 리스트는 표의 한 행)"""
+    header = rng.choice(CONTRACT_HEADERS)
+    start_month = rng.randint(1, 12)
+    hourly = rng.choice([9860, 10030, 10500, 12000])
+    monthly = hourly * 209
+    start_hour = rng.choice([8, 9, 10])
+    work_days = rng.choice([5, 5, 5, 6])
+
+    clauses = [
+        f"근로개시일 : 2025년 {start_month}월 {rng.randint(1, 28)}일부터 2026년 {start_month}월 {rng.randint(1, 28)}일까지",
+        f"근무장소 : {rng.choice(WORKPLACES)}",
+        f"업무의 내용 : {rng.choice(DUTIES)}",
+        f"소정근로시간 : {start_hour:02d}시 00분부터 {start_hour + 9:02d}시 00분까지 (휴게시간 : 12시 00분～13시 00분)",
+        f"근무일/휴일 : 매주 {work_days}일(또는 매일단위)근무, 주휴일 매주 일요일",
+        f"임금\n- 월(일, 시간)급 : {monthly:,}원\n- 시급 : {hourly:,}원\n- 임금지급일 : 매월 {rng.randint(1, 28)}일(휴일의 경우는 전일 지급)",
+        f"연차유급휴가\n- 연차유급휴가는 근로기준법에서 정하는 바에 따라 {rng.choice([15, 15, 12])}일 부여함",
+        "사회보험 적용여부(해당란에 체크)\n■ 고용보험 ■ 산재보험 ■ 국민연금 ■ 건강보험",
+        "근로계약서 교부\n- 사업주는 근로계약을 체결함과 동시에 본 계약서를 사본하여 근로자의 교부요구와 관계없이 근로자에게 교부함",
+        "기 타\n- 이 계약에 정함이 없는 사항은 근로기준법령에 의함",
+    ]
+    # 일부 계약서는 조항 누락
+    if rng.random() < 0.3:
+        clauses.pop(rng.randrange(len(clauses)))
+
+    page = [header, f"계약번호 : BENCH-{index:06d}", ""]
+    for number, clause in enumerate(clauses, 1):
+        lines = clause.split("\n")
+        page.append(f"{number}. {lines[0]}")
+        page.extend(lines[1:])
+    page.append("")
+    page.append(["구분", "금액", "비고"])
+    page.append(["기본급", f"{monthly:,}원", "월 209시간"])
+    page.append(["식대", f"{rng.choice([100000, 200000]):,}원", "비과세"])
+    page.append(["교통비", f"{rng.choice([50000, 100000]):,}원", "-"])
+
+    rules = ["부속 취업규칙", ""]
+    for number, (title, body) in enumerate(rng.sample(ARTICLES, rng.randint(5, len(ARTICLES))), 1):
+        rules.append(f"제{number}조 ({title})")
+        rules.append(body)
+
+    return [page, rules]
+
+
+def wrap_lines(page: List, width: int = 40) -> List:
+    """긴 텍스트 줄을 width 글자 단위로 나눔 (표 행은 그대로)"""
+    wrapped = []
+    for line in page:
+        if isinstance(line, list) or len(line) <= width:
+            wrapped.append(line)
+            continue
+        wrapped.extend(line[i:i + width] for i in range(0, len(line), width))
+    return wrapped
+
+
+def page_text(page: List) -> str:
+    return "\n".join(" ".join(line) if isinstance(line, list) else line for line in wrap_lines(page))
+
+
+def write_pdf(path: Path, pages: List[List], font_size: int = 11, line_height: int = 16):
+    """한국어 텍스트 PDF 작성 (폰트 미내장, 표 행은 칸마다 테두리)"""
+    def hex_text(text: str) -> str:
+        return "<" + text.encode("utf-16-be").hex().upper() + ">"
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages (페이지 객체 번호가 정해진 뒤 작성)
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /HYSMyeongJo-Medium /Encoding /UniKS-UCS2-H "
+        b"/DescendantFonts [4 0 R] >>",
+        b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HYSMyeongJo-Medium "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Korea1) /Supplement 1 >> "
+        b"/FontDescriptor 5 0 R /DW 1000 /W [1 95 500] >>",
+        b"<< /Type /FontDescriptor /FontName /HYSMyeongJo-Medium /Flags 6 /FontBBox [0 -148 1001 880] "
+        b"/ItalicAngle 0 /Ascent 880 /Descent -120 /CapHeight 880 /StemV 93 >>",
+    ]
+
+    page_ids = []
+    for page in pages:
+        ops = []
+        y = 800
+        for line in wrap_lines(page):
+            if isinstance(line, list):
+                for col, cell in enumerate(line):
+                    x = 50 + col * 130
+                    ops.append(f"{x} {y - 5} 130 {line_height + 2} re S")
+                    ops.append(f"BT /F1 {font_size - 1} Tf {x + 4} {y} Td {hex_text(cell)} Tj ET")
+            elif line:
+                ops.append(f"BT /F1 {font_size} Tf 50 {y} Td {hex_text(line)} Tj ET")
+            y -= line_height + 4 if isinstance(line, list) else line_height
+
+        content = zlib.compress(("0.5 w\n" + "\n".join(ops)).encode("ascii"))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content)
+                       + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode())
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as f:
+        f.write(bytes(output))
+
+
+def build_corpus(corpus_dir: Path, contracts: int, seed: int) -> List[Dict]:
+    """합성 코퍼스 생성 (같은 설정으로 이미 만들어져 있으면 재사용)
+
+    Returns:
+        [{"pdf": PDF 경로, "text": PDFExtractor 형식의 원문}, ...]
+    """
+    corpus_dir = Path(corpus_dir)
+    manifest_file = corpus_dir / "manifest.json"
+    config = {"version": CORPUS_VERSION, "contracts": contracts, "seed": seed}
+
+    if manifest_file.exists():
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest["config"] == config and all((corpus_dir / d["pdf"]).exists() for d in manifest["documents"]):
+            return [{"pdf": corpus_dir / d["pdf"], "text": d["text"]} for d in manifest["documents"]]
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    documents = []
+    for index in range(contracts):
+        pages = generate_contract(rng, index)
+        pdf_name = f"contract_{index:06d}.pdf"
+        write_pdf(corpus_dir / pdf_name, pages)
+        text = "\n".join(f"\n--- Page {number} ---\n{page_text(page)}" for number, page in enumerate(pages, 1))
+        documents.append({"pdf": pdf_name, "text": text.strip()})
+
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({"config": config, "documents": documents}, f, ensure_ascii=False)
+    return [{"pdf": corpus_dir / d["pdf"], "text": d["text"]} for d in documents]
+
+
+def measure(items: List, fn: Callable, repeat: int = 3, units: Optional[Callable] = None,
+            trace_memory: bool = True) -> Dict:
+    """항목별로 fn을 실행해 처리량, 지연 시간 분포, 최대 메모리 측정
+
+    지연 시간과 처리량은 repeat회 중 전체 시간이 가장 짧은 회차 기준이며,
+    메모리는 tracemalloc 오버헤드가 시간에 섞이지 않도록 별도 1회 실행에서 잽니다.
+
+    Args:
+        units: 항목 → 처리 단위 수 (예: 배치 → 청크 수). 없으면 항목 1개 = 1단위
+    """
+    best = None
+    for _ in range(max(repeat, 1)):
+        latencies = []
+        start = time.perf_counter()
+        for item in items:
+            item_start = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - item_start)
+        total = time.perf_counter() - start
+        if best is None or total < best[0]:
+            best = (total, latencies)
+
+    total, latencies = best
+    latencies_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    unit_count = sum(units(item) for item in items) if units else len(items)
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        for item in items:
+            fn(item)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    return {
+        "items": len(items),
+        "units": unit_count,
+        "total_sec": total,
+        "throughput": unit_count / total if total > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p90_ms": float(np.percentile(latencies_ms, 90)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "peak_mb": peak_mb,
+        "rss_max_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+class PipelineBenchmark:
+    """합성 코퍼스로 단계별 측정 (앞 단계 결과를 다음 단계 입력으로 사용)"""
+
+    def __init__(self, documents: List[Dict], work_dir: Path, repeat: int = 3,
+                 model_name: str = "nlpai-lab/KURE-v1", batch_size: int = 32,
+                 search_queries: int = 200, trace_memory: bool = True, backend: str = "torch"):
+        self.documents = documents
+        self.work_dir = Path(work_dir)
+        self.repeat = repeat
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.search_queries = search_queries
+        self.trace_memory = trace_memory
+        self.backend = backend
+
+        self.texts: List[str] = [d["text"] for d in documents]
+        self.chunks: List[Dict] = []
+        self.embeddings: Optional[np.ndarray] = None
+
+    def run(self, stages: List[str]) -> Dict[str, Dict]:
+        results = {}
+        for stage in STAGES:
+            if stage not in stages:
+                continue
+            print(f"[{stage}] 측정 중...")
+            try:
+                results[stage] = getattr(self, f"_bench_{stage}")()
+            except ImportError as e:
+                results[stage] = {"skipped": f"의존성 없음: {e.name}"}
+                print(f"[{stage}] 건너뜀 ({e.name} 미설치)")
+        return results
+
+    def _measure(self, items, fn, units=None) -> Dict:
+        return measure(items, fn, self.repeat, units, self.trace_memory)
+
+    def _bench_extract(self) -> Dict:
+        import pdfplumber  # noqa: F401  (없으면 ImportError로 단계 건너뜀)
+        from pdf_extractor import PDFExtractor
+
+        extractor = PDFExtractor(input_dir=str(self.work_dir), output_dir=str(self.work_dir / "extracted"))
+        extracted = {}
+
+        def extract(document):
+            extracted[document["pdf"]] = extractor.extract_text(document["pdf"])
+
+        result = self._measure(self.documents, extract)
+        # 이후 단계는 실제 추출 결과로 진행
+        self.texts = [extracted[d["pdf"]] for d in self.documents]
+        result["chars"] = sum(len(text) for text in self.texts)
+        return result
+
+    def _bench_chunk(self) -> Dict:
+        from chunker import DocumentChunker
+
+        docs_dir = self.work_dir / "documents"
+        docs_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        for index, text in enumerate(self.texts):
+            file = docs_dir / f"contract_{index:06d}.json"
+            with open(file, 'w', encoding='utf-8') as f:
+                json.dump({"text": text}, f, ensure_ascii=False)
+            files.append(file)
+
+        chunker = DocumentChunker(str(docs_dir), str(self.work_dir / "chunks"))
+        chunks_by_file = {}
+
+        def chunk(file):
+            chunks_by_file[file] = chunker.chunk_standard_contract(file) + chunker.chunk_employment_rules(file)
+
+        result = self._measure(files, chunk)
+        self.chunks = [c for file in files for c in chunks_by_file[file]]
+        result["chunks"] = len(self.chunks)
+        return result
+
+    def _bench_validate(self) -> Dict:
+        from contract_validator import ContractValidator
+        from extract_contract_fields import RequiredFieldIndex, extract_fields_from_chunks
+
+        # 첫 계약서를 표준 양식 삼아 체크리스트 구성 (유형 판별은 계약서마다)
+        chunks = self.chunks or self._standard_chunks()
+        index = RequiredFieldIndex(extract_fields_from_chunks(chunks))
+        validator = ContractValidator(index=index)
+        return self._measure(self.texts, validator.validate)
+
+    def _bench_terms(self) -> Dict:
+        from contract_terms import ContractTermExtractor, check_compliance
+
+        extractor = ContractTermExtractor()
+        result = self._measure(self.texts, extractor.extract)
+
+        columns = extractor.extract_batch(self.texts)
+        start = time.perf_counter()
+        check_compliance(columns)
+        result["check_batch_ms"] = (time.perf_counter() - start) * 1000
+        return result
+
+    def _bench_embed(self) -> Dict:
+        # 백엔드 라이브러리가 없으면 ImportError로 단계 건너뜀
+        if self.backend.startswith("torch"):
+            import sentence_transformers  # noqa: F401
+        else:
+            import onnxruntime  # noqa: F401
+        from embedder import DocumentEmbedder
+
+        chunks = self.chunks or self._standard_chunks()
+        embedder = DocumentEmbedder(model_name=self.model_name, batch_size=self.batch_size, backend=self.backend)
+        texts = [embedder.build_text(chunk) for chunk in chunks]
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        embedder.encode_texts(batches[0][:1])  # 모델 로딩은 측정에서 제외
+
+        outputs = {}
+
+        def encode(batch):
+            outputs[id(batch)] = embedder.encode_texts(batch)
+
+        # 모델 메모리는 tracemalloc으로 잡히지 않으므로 rss_max_mb를 함께 봄
+        result = self._measure(batches, encode, units=len)
+        self.embeddings = np.vstack([outputs[id(batch)] for batch in batches]).astype(np.float32)
+        return result
+
+    def _bench_search(self) -> Dict:
+        from test_embeddings import EmbeddingTester
+
+        chunks = self.chunks or self._standard_chunks()
+        embeddings = self.embeddings
+        if embeddings is None:
+            # embed 단계를 건너뛰면 무작위 단위 벡터 사용 (검색 비용은 벡터 값과 무관)
+            rng = np.random.default_rng(0)
+            embeddings = rng.standard_normal((len(chunks), 1024)).astype(np.float32)
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        index_dir = self.work_dir / "index"
+        index_dir.mkdir(parents=True, exist_ok=True)
+        with open(index_dir / "chunks_with_embeddings.json", 'w', encoding='utf-8') as f:
+            json.dump(chunks, f, ensure_ascii=False)
+        np.save(index_dir / "embeddings.npy", embeddings)
+        tester = EmbeddingTester(str(index_dir))
+
+        rng = np.random.default_rng(1)
+        picks = rng.integers(0, len(embeddings), size=self.search_queries)
+        queries = embeddings[picks] + rng.normal(0, 0.05, size=(len(picks), embeddings.shape[1])).astype(np.float32)
+        filters = [None, {"category": "임금"}]
+
+        def search(i):
+            tester.search_by_embedding(queries[i], top_k=5, filters=filters[i % 2])
+
+        result = self._measure(list(range(len(queries))), search)
+        result["index_size"] = len(chunks)
+        return result
+
+    def _standard_chunks(self) -> List[Dict]:
+        """chunk 단계를 건너뛴 경우 다른 단계 입력용 청크"""
+        from chunker import DocumentChunker
+
+        if not self.chunks:
+            chunker = DocumentChunker(str(self.work_dir), str(self.work_dir / "chunks"))
+            for index, text in enumerate(self.texts):
+                file = self.work_dir / f"standard_{index:06d}.json"
+                with open(file, 'w', encoding='utf-8') as f:
+                    json.dump({"text": text}, f, ensure_ascii=False)
+                self.chunks.extend(chunker.chunk_standard_contract(file) + chunker.chunk_employment_rules(file))
+        return self.chunks
+
+
+def compare_results(current: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """기준 결과 대비 회귀 목록 (처리량 감소, p99 지연 증가, 최대 메모리 증가)"""
+    regressions = []
+    for stage, result in current.items():
+        base = baseline.get(stage)
+        if not base or "skipped" in result or "skipped" in base:
+            continue
+
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{stage}: 처리량 {base['throughput']:,.1f} → {result['throughput']:,.1f}/초")
+        if (result["p99_ms"] > base["p99_ms"] * (1 + tolerance)
+                and result["p99_ms"] - base["p99_ms"] > MIN_LATENCY_DELTA_MS):
+            regressions.append(f"{stage}: p99 {base['p99_ms']:.2f} → {result['p99_ms']:.2f}ms")
+        if (result.get("peak_mb") is not None and base.get("peak_mb") is not None
+                and result["peak_mb"] > base["peak_mb"] * (1 + tolerance)
+                and result["peak_mb"] - base["peak_mb"] > MIN_MEMORY_DELTA_MB):
+            regressions.append(f"{stage}: 최대 메모리 {base['peak_mb']:.1f} → {result['peak_mb']:.1f}MB")
+    return regressions
+
+
+def print_report(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None):
+    print("\n" + "=" * 96)
+    print("전처리 파이프라인 벤치마크")
+    print("=" * 96)
+    print(f"{'단계':<10}{'항목':>7}{'처리량(/초)':>14}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}"
+          f"{'메모리(MB)':>12}{'기준 대비':>12}")
+    print("-" * 96)
+
+    for stage, result in results.items():
+        if "skipped" in result:
+            print(f"{stage:<10}  건너뜀: {result['skipped']}")
+            continue
+
+        change = ""
+        base = (baseline or {}).get(stage)
+        if base and "skipped" not in base and base["throughput"]:
+            change = f"{result['throughput'] / base['throughput'] - 1:+.1%}"
+        peak = f"{result['peak_mb']:.1f}" if result.get("peak_mb") is not None else "-"
+        print(f"{stage:<10}{result['units']:>7}{result['throughput']:>14,.1f}{result['p50_ms']:>10.2f}"
+              f"{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}{peak:>12}{change:>12}")
+
+    print("=" * 96)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="전처리 파이프라인 단계별 벤치마크")
+    parser.add_argument("--contracts", type=int, default=50, help="합성 계약서 수")
+    parser.add_argument("--seed", type=int, default=0, help="코퍼스 난수 시드")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="합성 코퍼스 디렉토리 (기본: 임시 디렉토리, 지정하면 재사용)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="측정할 단계 (쉼표 구분)")
+    parser.add_argument("--skip-embed", action="store_true", help="embed 단계 제외 (모델 없이 측정)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (가장 빠른 회차 사용)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--model", default="nlpai-lab/KURE-v1")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backend", default="torch", help="embed 단계 임베딩 백엔드 (torch, torch-int8, onnx, onnx-int8)")
+    parser.add_argument("--save", type=Path, help="결과를 기준 JSON으로 저장")
+    parser.add_argument("--compare", type=Path, help="기준 JSON과 비교 (회귀 시 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀로 판정할 변화 비율")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+    if args.skip_embed and "embed" in stages:
+        stages.remove("embed")
+
+    work_dir = Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+    try:
+        corpus_dir = args.corpus_dir or work_dir / "corpus"
+        documents = build_corpus(corpus_dir, args.contracts, args.seed)
+        print(f"합성 코퍼스: {len(documents)}건 ({corpus_dir})")
+
+        benchmark = PipelineBenchmark(documents, work_dir, repeat=args.repeat, model_name=args.model,
+                                      batch_size=args.batch_size, trace_memory=not args.no_memory,
+                                      backend=args.backend)
+        results = benchmark.run(stages)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+
+    print_report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"config": {"contracts": args.contracts, "seed": args.seed, "stages": stages,
+                                  "model": args.model, "batch_size": args.batch_size, "backend": args.backend},
+                       "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"저장 완료: {args.save}")
+
+    if baseline is not None:
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print("\n" + "!" * 96)
+            print(f"성능 회귀 {len(regressions)}건 (허용 범위 {args.tolerance:.0%})")
+            for regression in regressions:
+                print(f"  - {regression}")
+            print("!" * 96)
+            sys.exit(1)
+        print(f"\n기준 대비 회귀 없음 (허용 범위 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
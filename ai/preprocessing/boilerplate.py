@@ -0,0 +1,152 @@
+"""
+반복 머리말/꼬리말 탐지 (빈도 기반)
+
+표준취업규칙, 채용절차 매뉴얼 같은 정부 PDF는 매 페이지 같은 머리말, 꼬리말, 쪽 번호가 붙어
+청크 content에 섞이고 그대로 임베딩됩니다. 문서의 페이지를 한 번 훑어 줄별로 등장한 페이지 수를
+세고, 대부분의 페이지에 반복되는 줄을 청킹 전에 제거합니다.
+
+- 페이지 가장자리(위/아래 edge_lines 줄)만 대상으로 하고 숫자는 무시하고 비교
+  ("표준취업규칙 - 3 -"과 "표준취업규칙 - 4 -"를 같은 줄로 봄)
+- 본문 줄은 대상이 아님 (표준근로계약서처럼 페이지마다 같은 조항이 반복되는 양식 보호)
+- 조/장/절 제목과 번호 항목 줄, max_line_chars보다 긴 줄은 가장자리에 있어도 제외
+- 양식 제목(페이지 첫 줄의 "…계약서", "…동의서" 등)과 당사자/서명/날짜 줄도 제외
+  (표준근로계약서 여러 장을 묶은 PDF에서 매 장의 "표준근로계약서",
+   "(사업주) 사업체명 : … (서명)", "(근로자) 성 명 : … (서명)", "2025년 1월 1일"이
+   모든 페이지 가장자리에 반복되지만 각 계약서의 내용이므로 남겨야 함)
+
+사용법:
+    python boilerplate.py                         # 추출 문서별 반복 줄과 제거 글자/토큰 수 보고
+    python boilerplate.py --tokenizer nlpai-lab/KURE-v1
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+
+DIGITS_RE = re.compile(r'\d+')
+# 조/장/절 제목, 번호 항목은 가장자리에 있어도 반복 줄로 보지 않음
+STRUCTURE_RE = re.compile(r'^(?:제\d+(?:장|절|조)|\d+\.|[①-⑳])')
+# 당사자/서명/날짜 줄 (공백 제거 후 비교)
+PARTY_RE = re.compile(r'\((?:사업주|근로자|갑|을)\)|사업체명|서명|날인|\(인\)|^(?:\d*년)?\d*월\d*일$')
+# 양식 제목 (페이지 첫 줄)
+FORM_TITLE_RE = re.compile(r'(?:계약서|동의서|확인서|신청서|서약서|합의서|명세서)$')
+SPACE_RE = re.compile(r'\s+')
+
+
+class BoilerplateDetector:
+    """문서 페이지에서 반복되는 머리말/꼬리말 줄 탐지 및 제거"""
+
+    def __init__(self, min_ratio: float = 0.6, min_pages: int = 3, edge_lines: int = 2,
+                 max_line_chars: int = 80):
+        """
+        Args:
+            min_ratio: 이 비율 이상의 페이지에 나오는 줄을 반복 줄로 봄
+            min_pages: 페이지가 이보다 적은 문서는 탐지하지 않음
+            edge_lines: 숫자를 무시하고 비교할 페이지 위/아래 줄 수
+            max_line_chars: 이보다 긴 줄은 본문으로 보고 제외
+        """
+        self.min_ratio = min_ratio
+        self.min_pages = min_pages
+        self.edge_lines = edge_lines
+        self.max_line_chars = max_line_chars
+
+    def _signatures(self, lines: List[str]) -> Dict[int, str]:
+        """가장자리 줄 인덱스 → 비교 키 (공백 제거, 숫자는 #)"""
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        edges = set(non_empty[:self.edge_lines] + non_empty[-self.edge_lines:])
+
+        signatures = {}
+        for i in edges:
+            key = SPACE_RE.sub('', lines[i])
+            if len(key) > self.max_line_chars or STRUCTURE_RE.match(key) or PARTY_RE.search(key):
+                continue
+            if i == non_empty[0] and FORM_TITLE_RE.search(key):
+                continue
+            signatures[i] = DIGITS_RE.sub('#', key)
+        return signatures
+
+    def strip(self, pages: List[List[str]]) -> Tuple[List[List[str]], Dict]:
+        """반복 줄을 빈 줄로 바꾼 페이지와 보고서
+
+        Args:
+            pages: 페이지별 줄 목록
+
+        Returns:
+            (정리된 페이지, {"patterns": 반복 줄 예시 목록, "removed_lines": 줄 수,
+                           "removed_chars": 글자 수, "removed_text": 제거한 줄 목록})
+        """
+        report = {"patterns": [], "removed_lines": 0, "removed_chars": 0, "removed_text": []}
+        if len(pages) < self.min_pages or self.edge_lines <= 0:
+            return pages, report
+
+        page_signatures = [self._signatures(lines) for lines in pages]
+        counts = Counter()
+        for signatures in page_signatures:
+            counts.update(set(signatures.values()))
+
+        threshold = max(self.min_pages, len(pages) * self.min_ratio)
+        repeated: Set[str] = {signature for signature, n in counts.items() if n >= threshold}
+        if not repeated:
+            return pages, report
+
+        examples = {}
+        stripped = []
+        for lines, signatures in zip(pages, page_signatures):
+            kept = list(lines)
+            for i, signature in signatures.items():
+                if signature in repeated:
+                    examples.setdefault(signature, lines[i])
+                    report["removed_text"].append(lines[i])
+                    report["removed_chars"] += len(lines[i])
+                    kept[i] = ''
+            stripped.append(kept)
+
+        report["removed_lines"] = len(report["removed_text"])
+        report["patterns"] = list(examples.values())
+        return stripped, report
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+    import json
+
+    from text_normalizer import load_token_counter, split_pages
+
+    parser = argparse.ArgumentParser(description="반복 머리말/꼬리말 탐지 보고")
+    parser.add_argument("--input-dir", type=Path,
+                        default=Path(__file__).parent.parent / "data" / "processed" / "documents" / "standard_contracts")
+    parser.add_argument("--min-ratio", type=float, default=0.6)
+    parser.add_argument("--tokenizer", default=None, help="토큰 수 측정용 토크나이저 (로컬 캐시)")
+    args = parser.parse_args()
+
+    detector = BoilerplateDetector(min_ratio=args.min_ratio)
+    count_tokens = load_token_counter(args.tokenizer)
+
+    print("\n" + "=" * 72)
+    print("반복 머리말/꼬리말")
+    print("=" * 72)
+    total_chars = total_tokens = 0
+    for path in sorted(args.input_dir.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = json.load(f).get('text', '')
+        pages = [body.split('\n') for _, body in split_pages(text)]
+        _, report = detector.strip(pages)
+        tokens = sum(count_tokens(line) for line in report["removed_text"])
+        total_chars += report["removed_chars"]
+        total_tokens += tokens
+
+        print(f"\n{path.name} ({len(pages)}페이지)")
+        print(f"  제거: {report['removed_lines']}줄, {report['removed_chars']:,}자 "
+              f"({report['removed_chars'] / max(len(text), 1):.1%}), {tokens:,} 토큰")
+        for pattern in report["patterns"][:10]:
+            print(f"    - {pattern}")
+    print("-" * 72)
+    print(f"전체 제거: {total_chars:,}자, {total_tokens:,} 토큰")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+청크 저장소 스트리밍 읽기
+
+all_chunks.json(JSON 배열)과 legal_chunks.jsonl(JSONL)을 파일 전체를 메모리에 올리지 않고
+청크 단위로 읽습니다. JSON 배열은 일정 크기씩 읽으며 json.JSONDecoder.raw_decode로
+원소를 하나씩 디코딩합니다.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+def iter_chunks(path: Path, doc_type: Optional[str] = None,
+                block_size: int = 1 << 16) -> Iterator[Dict]:
+    """청크 파일을 한 청크씩 읽기
+
+    Args:
+        path: 청크 파일 (.json 배열 또는 .jsonl)
+        doc_type: 지정하면 해당 doc_type 청크만 반환
+        block_size: JSON 배열 파일을 읽는 단위 (문자 수)
+    """
+    path = Path(path)
+    chunks = _iter_jsonl(path) if path.suffix == ".jsonl" else _iter_json_array(path, block_size)
+    for chunk in chunks:
+        if doc_type is None or chunk.get("doc_type") == doc_type:
+            yield chunk
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _iter_json_array(path: Path, block_size: int) -> Iterator[Dict]:
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+
+        while True:
+            # 공백과 구분자(',') 건너뛰기
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+
+            if pos >= len(buffer):
+                if eof:
+                    return
+                buffer = f.read(block_size)
+                pos = 0
+                eof = not buffer
+                continue
+
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"JSON 배열 형식이 아닙니다: {path}")
+                started = True
+                pos += 1
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 원소가 블록 경계에 걸침 → 더 읽어서 이어 붙임
+                more = f.read(block_size)
+                if not more:
+                    raise
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+
+            yield item
+            pos = end
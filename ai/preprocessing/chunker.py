@@ -1,27 +1,43 @@
 import json
 import re
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Dict, List
 import uuid
 
+from metrics import timed
+
 
 class DocumentChunker:
+    # 검색용 청크에서 제외하고 필수 필드 체크리스트로만 사용하는 표준근로계약서
+    STANDARD_CONTRACT_FILE = "개정 표준근로계약서(2025년, 배포).json"
+
     def __init__(self, input_dir: str, output_dir: str):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def chunk_all_documents(self):
-        """모든 JSON 문서를 청킹 (standard_contract 제외)"""
-        all_chunks = []
+    def chunk_functions(self, include_standard_contract: bool = False) -> Dict[str, Callable[[Path], List[Dict]]]:
+        """파일명 → 청킹 함수
 
+        표준근로계약서는 검색용 청크에서 제외하고 별도 체크리스트로 관리하므로
+        필수 필드 추출 시에만 포함합니다.
+        """
         files = {
-            # "개정 표준근로계약서(2025년, 배포).json": self.chunk_standard_contract,  # 별도 체크리스트로 관리
             "'25년 채용절차의 공정화에 관한 법률 업무 매뉴얼.json": self.chunk_hiring_manual,
             "개정 표준취업규칙(2025년, 배포).json": self.chunk_employment_rules,
             "2025년 적용 최저임금 안내.json": self.chunk_minimum_wage_guide,
             "★채용절차의 공정화에 관한 법률 리플릿.json": self.chunk_hiring_leaflet
         }
+        if include_standard_contract:
+            files[self.STANDARD_CONTRACT_FILE] = self.chunk_standard_contract
+        return files
+
+    @timed(count_items=True)
+    def chunk_all_documents(self):
+        """모든 JSON 문서를 청킹 (standard_contract 제외)"""
+        all_chunks = []
+
+        files = self.chunk_functions()
 
         for filename, chunker_func in files.items():
             filepath = self.input_dir / filename
@@ -55,6 +71,7 @@ class DocumentChunker:
 
         return all_chunks
 
+    @timed(count_items=True)
     def chunk_standard_contract(self, filepath: Path) -> List[Dict]:
         """표준근로계약서: 계약서 타입별 + 조항별 분할"""
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -118,6 +135,7 @@ class DocumentChunker:
 
         return chunks
 
+    @timed(count_items=True)
     def chunk_hiring_manual(self, filepath: Path) -> List[Dict]:
         """채용절차 법률 매뉴얼: 장/절 단위 분할 (제목+내용 병합, 최소 길이 필터링)"""
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -178,6 +196,7 @@ class DocumentChunker:
 
         return chunks
 
+    @timed(count_items=True)
     def chunk_employment_rules(self, filepath: Path) -> List[Dict]:
         """표준취업규칙: 조문 단위 분할"""
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -217,6 +236,7 @@ class DocumentChunker:
 
         return chunks
 
+    @timed(count_items=True)
     def chunk_minimum_wage_guide(self, filepath: Path) -> List[Dict]:
         """최저임금 안내: 주제별 분할"""
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -265,6 +285,7 @@ class DocumentChunker:
 
         return chunks
 
+    @timed(count_items=True)
     def chunk_hiring_leaflet(self, filepath: Path) -> List[Dict]:
         """채용절차 리플릿: 단계별 분할"""
         with open(filepath, 'r', encoding='utf-8') as f:
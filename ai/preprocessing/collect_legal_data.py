@@ -7,31 +7,109 @@
 - 고용노동부 법령해설
 - 노동위원회 판정례
 - 현행법령
+
+수집 대상은 TARGET_SPECS 표로 정의하며, 모든 대상 × 키워드 작업을 하나의 엔진이
+공유 동시성/호출 속도 한도 안에서 함께 스케줄링합니다.
 """
 
-import requests
 import json
-import time
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from tqdm import tqdm
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from api_fetcher import ConcurrentFetcher
+from collection_checkpoint import CollectionCheckpoint, CollectionState
+from dedup_writer import DedupJsonlWriter, document_id
+
+
+# 수집 대상 정의
+#   response_key: 응답 JSON에서 결과 목록이 담긴 키
+#   detail_key: 본문 조회(lawService.do) 응답에서 본문 객체가 담긴 키
+#   name: 결과 파일 이름, label: 출력용 이름
+#   id_field: 문서 일련번호 필드 (키워드 간 중복 제거 기준)
+#   date_field: 증분 수집 시 비교할 일자 필드
+#   date_range_param: 서버 측 일자 범위 검색 파라미터 (있으면 증분 수집에 사용)
+#   params: 추가 검색 파라미터, max_pages: 키워드당 최대 페이지 수
+TARGET_SPECS = {
+    "expc": {
+        "response_key": "expc",
+        "detail_key": "ExpcService",
+        "name": "interpretations",
+        "label": "법령해석례",
+        "id_field": "법령해석례일련번호",
+        "date_field": "회신일자",
+        "params": {},
+        "max_pages": None,
+    },
+    "prec": {
+        "response_key": "prec",
+        "detail_key": "PrecService",
+        "name": "precedents",
+        "label": "판례",
+        "id_field": "판례일련번호",
+        "date_field": "선고일자",
+        "date_range_param": "prncYd",
+        "default_start_date": "20100101",
+        "params": {},
+        "max_pages": 10,  # 최대 1000건
+    },
+    "moel": {
+        "response_key": "moel",
+        "detail_key": "MoelService",
+        "name": "labor_ministry",
+        "label": "고용노동부 법령해설",
+        "id_field": "해설일련번호",
+        "date_field": "등록일자",
+        "params": {},
+        "max_pages": None,
+    },
+    "lwrc": {
+        "response_key": "lwrc",
+        "detail_key": "LwrcService",
+        "name": "labor_commission",
+        "label": "노동위원회 판정례",
+        "id_field": "판정례일련번호",
+        "date_field": "판정일자",
+        "params": {},
+        "max_pages": None,
+    },
+}
+
+# 키워드 중복 제거 기준 필드 (TARGET_SPECS에서 추출)
+TARGET_ID_FIELDS = {target: spec["id_field"] for target, spec in TARGET_SPECS.items()}
 
 
 class LegalDataCollector:
     """법률 데이터 수집기"""
 
-    def __init__(self, user_id: str, output_dir: Path):
+    def __init__(self, user_id: str, output_dir: Path,
+                 base_url: str = "http://www.law.go.kr/DRF/lawSearch.do",
+                 rate_per_sec: float = 3.0, max_concurrency: int = 4):
         """
         Args:
             user_id: Open API 사용자 ID (이메일 @ 앞부분)
             output_dir: 데이터 저장 디렉토리
+            base_url: 검색 API 주소 (테스트 시 로컬 stub 서버 주소)
+            rate_per_sec: 초당 최대 요청 수 (모든 대상 합산)
+            max_concurrency: 동시 요청 수 (모든 대상 합산)
         """
         self.user_id = user_id
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.base_url = "http://www.law.go.kr/DRF/lawSearch.do"
+        self.base_url = base_url
+        self.fetcher = ConcurrentFetcher(rate_per_sec=rate_per_sec, max_concurrency=max_concurrency)
+
+        # 페이지 단위 체크포인트 (collect_all 실행 중에만 사용)
+        self.checkpoint_dir = self.output_dir / "checkpoints"
+        self.checkpoint: Optional[CollectionCheckpoint] = None
+
+        self._failed_lock = threading.Lock()
+        self._failed_pages: Dict[str, int] = {}
 
         # 근로계약서 관련 검색 키워드
         self.keywords = [
@@ -53,237 +131,267 @@ class LegalDataCollector:
         ]
 
     def _request_api(self, params: Dict) -> Optional[Dict]:
-        """API 요청"""
-        try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API 요청 실패: {e}")
+        """API 요청 (속도 제한, 재시도 포함)"""
+        return self.fetcher.fetch(self.base_url, params)
+
+    def _build_params(self, target: str, keyword: str, since: Optional[str] = None,
+                      end_date: Optional[str] = None) -> Dict:
+        """대상 spec으로 검색 파라미터 구성 (page 제외)"""
+        spec = TARGET_SPECS[target]
+        params = {
+            "OC": self.user_id,
+            "target": target,
+            "type": "JSON",
+            "query": keyword,
+            "display": 100,
+            "search": 2,  # 본문검색
+            **spec["params"],
+        }
+
+        if spec.get("date_range_param"):
+            start_date = since or spec["default_start_date"]
+            end_date = end_date or datetime.now().strftime("%Y%m%d")
+            params[spec["date_range_param"]] = f"{start_date}~{end_date}"
+        elif since:
+            params["sort"] = "ddes"  # 최신순
+
+        return params
+
+    def _page_items(self, page_data: Optional[Dict], response_key: str,
+                    keyword: str) -> Optional[List[Dict]]:
+        """페이지 응답에서 항목 추출 (요청 실패 시 None, 결과 없는 페이지는 빈 리스트)"""
+        if not page_data:
+            return None
+        if response_key not in page_data:
+            return []
+
+        items = page_data[response_key]
+        if not isinstance(items, list):
+            items = [items]
+
+        collected_at = datetime.now().isoformat()
+        for item in items:
+            item['검색키워드'] = keyword
+            item['수집일시'] = collected_at
+        return items
+
+    def _store_page(self, target: str, keyword: str, page: int, total_cnt: int,
+                    items: List[Dict], writer: DedupJsonlWriter,
+                    since: Optional[str] = None) -> bool:
+        """페이지 항목을 writer에 기록한 뒤 체크포인트에 완료 표시
+
+        Returns:
+            증분 수집 기준일 이전 문서가 포함되어 있었는지 (이후 페이지 불필요)
+        """
+        if since:
+            # 날짜가 없는 항목은 기준일과 비교할 수 없으므로 새 문서로 보고 수집 (페이징 중단 근거로 쓰지 않음)
+            date_field = TARGET_SPECS[target]["date_field"]
+            newer = [item for item in items
+                     if not str(item.get(date_field) or '').strip()
+                     or str(item.get(date_field)).strip() >= since]
+        else:
+            newer = items
+        reached_since = len(newer) < len(items)
+
+        # 문서를 먼저 디스크에 기록한 뒤 체크포인트 (중단 시 중복은 writer가 걸러냄)
+        writer.add_many(newer, keyword)
+        if self.checkpoint:
+            ids = [document_id(item, writer.id_field) for item in newer]
+            self.checkpoint.record_page(target, keyword, page, total_cnt, ids, reached_since)
+        return reached_since
+
+    def _replay_page(self, record: Dict, writer: DedupJsonlWriter, keyword: str):
+        """체크포인트에 완료된 페이지의 키워드 병합 복원"""
+        for doc_id in record['ids']:
+            writer.merge_keyword(doc_id, keyword)
+
+    def _get_page(self, params: Dict, keyword: str, page: int, writer: DedupJsonlWriter,
+                  since: Optional[str] = None) -> Optional[Tuple[int, bool]]:
+        """단일 페이지 수집 (체크포인트에 있으면 요청 생략)
+
+        Returns:
+            (totalCnt, 기준일 도달 여부), 요청 실패 시 None
+        """
+        target = params['target']
+        record = self.checkpoint.get_page(target, keyword, page) if self.checkpoint else None
+        if record:
+            self._replay_page(record, writer, keyword)
+            return record['total_cnt'], record['reached_since']
+
+        data = self._request_api({**params, "page": page})
+        if not data or 'totalCnt' not in data:
             return None
 
-    def collect_interpretations(self, keywords: List[str] = None) -> List[Dict]:
-        """법령해석례 수집"""
-        print("\n=== 법령해석례 수집 시작 ===")
-
-        if keywords is None:
-            keywords = self.keywords
-
-        all_data = []
-
-        for keyword in keywords:
-            print(f"\n키워드: '{keyword}' 검색 중...")
-
-            # 첫 요청으로 총 개수 확인
-            params = {
-                "OC": self.user_id,
-                "target": "expc",
-                "type": "JSON",
-                "query": keyword,
-                "display": 100,
-                "search": 2,  # 본문검색
-                "page": 1,
-            }
-
-            data = self._request_api(params)
-            if not data or 'totalCnt' not in data:
-                print(f"  검색 결과 없음")
-                continue
-
-            total_cnt = int(data.get('totalCnt', 0))
-            print(f"  총 {total_cnt}건 발견")
+        total_cnt = int(data.get('totalCnt', 0))
+        items = self._page_items(data, TARGET_SPECS[target]["response_key"], keyword)
+        reached_since = self._store_page(target, keyword, page, total_cnt, items, writer, since)
+        return total_cnt, reached_since
 
-            if total_cnt == 0:
-                continue
+    def _count_failure(self, target: str):
+        with self._failed_lock:
+            self._failed_pages[target] = self._failed_pages.get(target, 0) + 1
 
-            # 페이지별 수집
-            total_pages = (total_cnt // 100) + 1
-            for page in tqdm(range(1, total_pages + 1), desc=f"  {keyword}"):
-                params['page'] = page
-                page_data = self._request_api(params)
+    def _collect_keyword(self, target: str, keyword: str, writer: DedupJsonlWriter,
+                         since: Optional[str] = None, end_date: Optional[str] = None) -> Dict:
+        """(대상, 키워드) 하나의 모든 페이지를 수집해 writer에 기록
 
-                if not page_data or 'expc' not in page_data:
+        Args:
+            target: 수집 대상 (TARGET_SPECS 키)
+            keyword: 검색 키워드
+            writer: 중복 제거 기록기
+            since: 증분 수집 기준일 (YYYYMMDD). 서버 일자 범위 검색이 없는 대상은
+                   최신순 결과를 앞 페이지부터 받다가 기준일 이전 문서가 나오면 중단
+            end_date: 일자 범위 검색 종료일 (기본: 오늘)
+
+        Returns:
+            {"total_cnt": 검색 결과 수, "pages": 확인한 페이지 수}
+        """
+        spec = TARGET_SPECS[target]
+        params = self._build_params(target, keyword, since, end_date)
+
+        # 서버 측 일자 범위 검색이 있으면 결과 전체가 신규 문서
+        page_since = None if spec.get("date_range_param") else since
+
+        first = self._get_page(params, keyword, 1, writer, page_since)
+        if first is None:
+            self._count_failure(target)
+            return {"total_cnt": None, "pages": 0}
+
+        total_cnt, reached_since = first
+        if total_cnt == 0:
+            return {"total_cnt": 0, "pages": 1}
+
+        total_pages = math.ceil(total_cnt / 100)
+        if spec["max_pages"]:
+            total_pages = min(total_pages, spec["max_pages"])
+
+        if page_since:
+            # 최신순 결과를 한 페이지씩 확인하다가 기준일 이전 문서가 나오면 중단
+            page = 1
+            while not reached_since and page < total_pages:
+                page += 1
+                result = self._get_page(params, keyword, page, writer, page_since)
+                if result is None:
+                    self._count_failure(target)
                     break
+                _, reached_since = result
+            return {"total_cnt": total_cnt, "pages": page}
+
+        # 나머지 페이지: 체크포인트에 있으면 재사용, 없는 페이지만 동시 요청
+        pending = []
+        for page in range(2, total_pages + 1):
+            record = self.checkpoint.get_page(target, keyword, page) if self.checkpoint else None
+            if record:
+                self._replay_page(record, writer, keyword)
+            else:
+                pending.append({**params, "page": page})
+
+        for page_params, page_data in self.fetcher.fetch_many(self.base_url, pending):
+            items = self._page_items(page_data, spec["response_key"], keyword)
+            if items is None:
+                self._count_failure(target)
+                continue
+            self._store_page(target, keyword, page_params['page'], total_cnt, items, writer)
 
-                items = page_data['expc']
-                if not isinstance(items, list):
-                    items = [items]
-
-                for item in items:
-                    item['검색키워드'] = keyword
-                    item['수집일시'] = datetime.now().isoformat()
-                    all_data.append(item)
+        return {"total_cnt": total_cnt, "pages": total_pages}
 
-                time.sleep(0.3)  # API 부하 방지
+    def collect_targets(self, targets: List[str], writers: Dict[str, DedupJsonlWriter],
+                        keywords: List[str] = None, since: Optional[Dict[str, str]] = None,
+                        end_date: Optional[str] = None) -> Dict[str, int]:
+        """여러 대상 × 키워드를 한꺼번에 수집
 
-        print(f"\n총 {len(all_data)}건의 법령해석례 수집 완료")
-        return all_data
-
-    def collect_precedents(self, keywords: List[str] = None,
-                          start_date: str = "20100101",
-                          end_date: str = None) -> List[Dict]:
-        """판례 수집"""
-        print("\n=== 판례 수집 시작 ===")
+        모든 (대상, 키워드) 작업을 동시에 스케줄링하고, 실제 요청 수와 속도는
+        ConcurrentFetcher의 공유 한도로 제한합니다. 따라서 전체 소요 시간은 대상 수가
+        아니라 총 요청 수 / 호출 속도 한도에 의해 결정됩니다.
 
+        Args:
+            targets: 수집 대상 목록 (TARGET_SPECS 키)
+            writers: 대상별 결과 기록기
+            keywords: 검색 키워드 (기본: self.keywords)
+            since: 대상별 증분 수집 기준일 (YYYYMMDD)
+            end_date: 일자 범위 검색 종료일 (기본: 오늘)
+
+        Returns:
+            대상별 실패한 페이지 수
+        """
         if keywords is None:
             keywords = self.keywords
+        since = since or {}
 
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y%m%d")
+        tasks = [(target, keyword) for target in targets for keyword in keywords]
+        self._failed_pages = {target: 0 for target in targets}
 
-        all_data = []
+        # 작업 스레드는 대부분 요청 슬롯/토큰을 기다리므로 동시 요청 수보다 넉넉하게
+        workers = min(len(tasks), max(4, self.fetcher.max_concurrency * 4)) or 1
 
-        for keyword in keywords:
-            print(f"\n키워드: '{keyword}' 검색 중...")
-
-            params = {
-                "OC": self.user_id,
-                "target": "prec",
-                "type": "JSON",
-                "query": keyword,
-                "display": 100,
-                "search": 2,  # 본문검색
-                "prncYd": f"{start_date}~{end_date}",
-                "page": 1,
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collect") as executor:
+            futures = {
+                executor.submit(self._collect_keyword, target, keyword, writers[target],
+                                since.get(target), end_date): (target, keyword)
+                for target, keyword in tasks
             }
 
-            data = self._request_api(params)
-            if not data or 'totalCnt' not in data:
-                print(f"  검색 결과 없음")
-                continue
+            with tqdm(total=len(tasks), desc="  수집") as progress:
+                for future in as_completed(futures):
+                    target, keyword = futures[future]
+                    result = future.result()
+                    label = TARGET_SPECS[target]["label"]
 
-            total_cnt = int(data.get('totalCnt', 0))
-            print(f"  총 {total_cnt}건 발견")
+                    if result["total_cnt"] is None:
+                        progress.write(f"  [{label}] '{keyword}': 검색 실패")
+                    else:
+                        progress.write(f"  [{label}] '{keyword}': {result['total_cnt']}건 "
+                                       f"({result['pages']}페이지)")
+                    progress.update(1)
 
-            if total_cnt == 0:
-                continue
-
-            # 페이지별 수집
-            total_pages = min((total_cnt // 100) + 1, 10)  # 최대 1000건
-            for page in tqdm(range(1, total_pages + 1), desc=f"  {keyword}"):
-                params['page'] = page
-                page_data = self._request_api(params)
-
-                if not page_data or 'prec' not in page_data:
-                    break
-
-                items = page_data['prec']
-                if not isinstance(items, list):
-                    items = [items]
-
-                for item in items:
-                    item['검색키워드'] = keyword
-                    item['수집일시'] = datetime.now().isoformat()
-                    all_data.append(item)
-
-                time.sleep(0.3)
-
-        print(f"\n총 {len(all_data)}건의 판례 수집 완료")
-        return all_data
-
-    def collect_labor_ministry_interpretations(self) -> List[Dict]:
-        """고용노동부 법령해설 수집"""
-        print("\n=== 고용노동부 법령해설 수집 시작 ===")
+        return dict(self._failed_pages)
 
-        all_data = []
+    def collect_target(self, target: str, keywords: List[str] = None,
+                       since: Optional[str] = None, end_date: Optional[str] = None,
+                       writer: Optional[DedupJsonlWriter] = None) -> List[Dict]:
+        """단일 대상 수집
 
-        for keyword in self.keywords:
-            print(f"\n키워드: '{keyword}' 검색 중...")
-
-            params = {
-                "OC": self.user_id,
-                "target": "moel",  # 고용노동부
-                "type": "JSON",
-                "query": keyword,
-                "display": 100,
-                "search": 2,
-                "page": 1,
-            }
-
-            data = self._request_api(params)
-            if not data or 'totalCnt' not in data:
-                print(f"  검색 결과 없음")
-                continue
-
-            total_cnt = int(data.get('totalCnt', 0))
-            print(f"  총 {total_cnt}건 발견")
-
-            if total_cnt == 0:
-                continue
+        Args:
+            target: 수집 대상 (TARGET_SPECS 키)
+            keywords: 검색 키워드 (기본: self.keywords)
+            since: 증분 수집 기준일 (YYYYMMDD)
+            end_date: 일자 범위 검색 종료일 (기본: 오늘)
+            writer: 지정 시 결과를 writer로 스트리밍하고 빈 리스트 반환
+
+        Returns:
+            중복 제거된 문서 목록 (writer 미지정 시)
+        """
+        label = TARGET_SPECS[target]["label"]
+        print(f"\n=== {label} 수집 시작 ===")
 
-            total_pages = (total_cnt // 100) + 1
-            for page in tqdm(range(1, total_pages + 1), desc=f"  {keyword}"):
-                params['page'] = page
-                page_data = self._request_api(params)
+        own_writer = writer is None
+        if own_writer:
+            writer = DedupJsonlWriter(None, TARGET_ID_FIELDS[target])
 
-                if not page_data or 'moel' not in page_data:
-                    break
+        self.collect_targets([target], {target: writer}, keywords,
+                             since={target: since} if since else None, end_date=end_date)
 
-                items = page_data['moel']
-                if not isinstance(items, list):
-                    items = [items]
+        print(f"\n총 {writer.count}건의 {label} 수집 완료 (키워드 간 중복 {writer.duplicates}건 병합)")
+        return writer.records() if own_writer else []
 
-                for item in items:
-                    item['검색키워드'] = keyword
-                    item['수집일시'] = datetime.now().isoformat()
-                    all_data.append(item)
+    def collect_interpretations(self, keywords: List[str] = None,
+                                since: Optional[str] = None) -> List[Dict]:
+        """법령해석례 수집"""
+        return self.collect_target("expc", keywords, since=since)
 
-                time.sleep(0.3)
+    def collect_precedents(self, keywords: List[str] = None,
+                          start_date: str = "20100101",
+                          end_date: str = None) -> List[Dict]:
+        """판례 수집"""
+        return self.collect_target("prec", keywords, since=start_date, end_date=end_date)
 
-        print(f"\n총 {len(all_data)}건의 고용노동부 법령해설 수집 완료")
-        return all_data
+    def collect_labor_ministry_interpretations(self, since: Optional[str] = None) -> List[Dict]:
+        """고용노동부 법령해설 수집"""
+        return self.collect_target("moel", since=since)
 
-    def collect_labor_commission(self) -> List[Dict]:
+    def collect_labor_commission(self, since: Optional[str] = None) -> List[Dict]:
         """노동위원회 판정례 수집"""
-        print("\n=== 노동위원회 판정례 수집 시작 ===")
-
-        all_data = []
-
-        for keyword in self.keywords:
-            print(f"\n키워드: '{keyword}' 검색 중...")
-
-            params = {
-                "OC": self.user_id,
-                "target": "lwrc",  # 노동위원회
-                "type": "JSON",
-                "query": keyword,
-                "display": 100,
-                "search": 2,
-                "page": 1,
-            }
-
-            data = self._request_api(params)
-            if not data or 'totalCnt' not in data:
-                print(f"  검색 결과 없음")
-                continue
-
-            total_cnt = int(data.get('totalCnt', 0))
-            print(f"  총 {total_cnt}건 발견")
-
-            if total_cnt == 0:
-                continue
-
-            total_pages = (total_cnt // 100) + 1
-            for page in tqdm(range(1, total_pages + 1), desc=f"  {keyword}"):
-                params['page'] = page
-                page_data = self._request_api(params)
-
-                if not page_data or 'lwrc' not in page_data:
-                    break
-
-                items = page_data['lwrc']
-                if not isinstance(items, list):
-                    items = [items]
-
-                for item in items:
-                    item['검색키워드'] = keyword
-                    item['수집일시'] = datetime.now().isoformat()
-                    all_data.append(item)
-
-                time.sleep(0.3)
-
-        print(f"\n총 {len(all_data)}건의 노동위원회 판정례 수집 완료")
-        return all_data
+        return self.collect_target("lwrc", since=since)
 
     def save_data(self, data: List[Dict], filename: str):
         """데이터 저장"""
@@ -297,59 +405,121 @@ class LegalDataCollector:
 
         print(f"저장 완료: {filepath} ({len(data)}건)")
 
-    def collect_all(self):
-        """모든 데이터 수집 및 저장"""
+    def collect_all(self, incremental: bool = False, run_id: Optional[str] = None,
+                    targets: Optional[List[str]] = None):
+        """모든 데이터 수집 및 저장
+
+        Args:
+            incremental: True면 대상별 마지막 수집일 이후 문서만 수집
+            run_id: 체크포인트 실행 ID. 중단된 실행과 같은 ID면 이어서 수집
+                    (기본: 오늘 날짜, 이미 완료된 실행이면 새 ID)
+            targets: 수집 대상 (기본: TARGET_SPECS 전체)
+        """
+        targets = targets or list(TARGET_SPECS)
+        today = datetime.now().strftime('%Y%m%d')
+        if run_id is None:
+            run_id = f"{today}_incremental" if incremental else today
+            if self._checkpoint_path(run_id).exists():
+                previous = CollectionCheckpoint(self.checkpoint_dir, run_id)
+                previous.close()
+                if previous.run_done:
+                    run_id = f"{run_id}_{datetime.now().strftime('%H%M%S')}"
+
+        self.checkpoint = CollectionCheckpoint(self.checkpoint_dir, run_id)
+        state = CollectionState(self.output_dir / "collection_state.json")
+
         print("\n" + "="*60)
         print("국가법령정보 Open API 데이터 수집 시작")
         print(f"사용자 ID: {self.user_id}")
         print(f"저장 경로: {self.output_dir}")
+        print(f"실행 ID: {run_id} ({'증분' if incremental else '전체'} 수집)")
+        print(f"대상: {', '.join(TARGET_SPECS[t]['label'] for t in targets)} × 키워드 {len(self.keywords)}개")
         print("="*60)
 
-        # 1. 법령해석례
-        interpretations = self.collect_interpretations()
-        self.save_data(
-            interpretations,
-            f"interpretations_{datetime.now().strftime('%Y%m%d')}.json"
-        )
-
-        # 2. 판례
-        precedents = self.collect_precedents()
-        self.save_data(
-            precedents,
-            f"precedents_{datetime.now().strftime('%Y%m%d')}.json"
-        )
-
-        # 3. 고용노동부 법령해설
-        labor_ministry = self.collect_labor_ministry_interpretations()
-        self.save_data(
-            labor_ministry,
-            f"labor_ministry_{datetime.now().strftime('%Y%m%d')}.json"
-        )
-
-        # 4. 노동위원회
-        labor_commission = self.collect_labor_commission()
-        self.save_data(
-            labor_commission,
-            f"labor_commission_{datetime.now().strftime('%Y%m%d')}.json"
-        )
+        for target in targets:
+            if self.checkpoint.is_target_done(target):
+                print(f"[{TARGET_SPECS[target]['name']}] 체크포인트에서 복원")
+
+        since = {}
+        if incremental:
+            for target in targets:
+                last_run_date = state.get(target).get('last_run_date')
+                if last_run_date:
+                    since[target] = last_run_date
+
+        # 수집과 동시에 JSONL로 기록 (중복 문서는 키워드만 병합)
+        writers = {
+            target: DedupJsonlWriter(
+                self.output_dir / f"{TARGET_SPECS[target]['name']}_{run_id}.jsonl",
+                TARGET_ID_FIELDS[target]
+            )
+            for target in targets
+        }
+
+        try:
+            failed = self.collect_targets(targets, writers, since=since)
+
+            for target in targets:
+                spec = TARGET_SPECS[target]
+                writers[target].close()
+                print(f"저장 완료: {writers[target].path} ({writers[target].count}건, "
+                      f"키워드 간 중복 {writers[target].duplicates}건 병합)")
+
+                # 실패한 페이지가 있으면 다음 실행에서 다시 받도록 상태를 갱신하지 않음
+                if failed[target] == 0:
+                    self.checkpoint.mark_target_done(target)
+                    state.update(target, last_run_date=today)
+                else:
+                    print(f"⚠️  {spec['name']}: {failed[target]}개 페이지 실패 - 같은 실행 ID로 재실행하면 이어서 수집")
+            state.save()
+
+            if all(self.checkpoint.is_target_done(target) for target in targets):
+                self.checkpoint.mark_run_done()
+        finally:
+            for writer in writers.values():
+                writer.close()
+            self.checkpoint.close()
+            self.checkpoint = None
 
         # 요약 통계
         print("\n" + "="*60)
         print("수집 완료 요약")
         print("="*60)
-        print(f"법령해석례:          {len(interpretations):>6}건")
-        print(f"판례:                {len(precedents):>6}건")
-        print(f"고용노동부 법령해설: {len(labor_ministry):>6}건")
-        print(f"노동위원회 판정례:   {len(labor_commission):>6}건")
-        print(f"총합:                {len(interpretations) + len(precedents) + len(labor_ministry) + len(labor_commission):>6}건")
+        for target in targets:
+            label = TARGET_SPECS[target]['label']
+            print(f"{label + ':':<22}{writers[target].count:>6}건")
+        print(f"{'총합:':<22}{sum(w.count for w in writers.values()):>6}건")
+        stats = self.fetcher.stats
+        print(f"API 요청: {stats['requests']}회 (재시도 {stats['retries']}회, 실패 {stats['failures']}회)")
         print("="*60)
 
+    def _checkpoint_path(self, run_id: str) -> Path:
+        return self.checkpoint_dir / f"{run_id}.jsonl"
+
+    def close(self):
+        """커넥션 풀 및 스레드 풀 정리"""
+        self.fetcher.close()
+
 
 def main():
     """메인 실행 함수"""
+    import argparse
     import os
     from dotenv import load_dotenv
 
+    parser = argparse.ArgumentParser(description="국가법령정보 Open API 데이터 수집")
+    parser.add_argument("--base-url", default="http://www.law.go.kr/DRF/lawSearch.do",
+                        help="검색 API 주소 (로컬 stub 서버 테스트용)")
+    parser.add_argument("--rate", type=float, default=3.0, help="초당 최대 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--incremental", action="store_true",
+                        help="마지막 수집일 이후 문서만 수집")
+    parser.add_argument("--run-id", default=None,
+                        help="이어서 수집할 실행 ID (checkpoints/<run_id>.jsonl)")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGET_SPECS), default=None,
+                        help="수집 대상 (기본: 전체)")
+    args = parser.parse_args()
+
     # 환경 변수 로드
     load_dotenv()
 
@@ -367,8 +537,13 @@ def main():
     output_dir = project_root / "data" / "raw" / "api"
 
     # 데이터 수집 실행
-    collector = LegalDataCollector(user_id, output_dir)
-    collector.collect_all()
+    collector = LegalDataCollector(user_id, output_dir, base_url=args.base_url,
+                                   rate_per_sec=args.rate, max_concurrency=args.concurrency)
+    try:
+        collector.collect_all(incremental=args.incremental, run_id=args.run_id,
+                              targets=args.targets)
+    finally:
+        collector.close()
 
 
 if __name__ == "__main__":
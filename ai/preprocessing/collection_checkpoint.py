@@ -0,0 +1,142 @@
+"""
+법률 데이터 수집 체크포인트
+
+수집 도중 중단되어도 이어서 받을 수 있도록 (target, keyword, page) 단위 완료 기록을
+append-only JSONL 파일에 남기고, 대상(target)별 마지막 수집일을 상태 파일에 남깁니다.
+문서 본문은 DedupJsonlWriter가 결과 파일에 먼저 기록하고, 체크포인트에는 페이지에
+포함된 문서 일련번호만 남깁니다 (재시작 시 키워드 병합 복원용).
+
+체크포인트 파일 (checkpoints/<run_id>.jsonl), 한 줄에 하나의 레코드:
+    {"type": "page", "target": "prec", "keyword": "해고", "page": 3, "total_cnt": 812,
+     "ids": ["..."], "reached_since": false}
+    {"type": "target_done", "target": "prec"}
+    {"type": "run_done"}
+
+상태 파일 (collection_state.json):
+    {"targets": {"prec": {"last_run_date": "20251027"}}}
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class CollectionCheckpoint:
+    """(target, keyword, page) 단위 append-only 체크포인트"""
+
+    def __init__(self, checkpoint_dir: Path, run_id: str):
+        """
+        Args:
+            checkpoint_dir: 체크포인트 저장 디렉토리
+            run_id: 수집 실행 ID (같은 ID로 재실행하면 이어서 수집)
+        """
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id
+        self.path = self.checkpoint_dir / f"{run_id}.jsonl"
+
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, str, int], Dict] = {}
+        self._done_targets = set()
+        self.run_done = False
+
+        self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단된 마지막 줄은 무시 (해당 페이지는 다시 요청)
+                    continue
+
+                if record["type"] == "page":
+                    key = (record["target"], record["keyword"], record["page"])
+                    self._pages[key] = record
+                elif record["type"] == "target_done":
+                    self._done_targets.add(record["target"])
+                elif record["type"] == "run_done":
+                    self.run_done = True
+
+        if self._pages:
+            print(f"체크포인트 로딩: {self.path.name} ({len(self._pages)}개 페이지 완료)")
+
+    def get_page(self, target: str, keyword: str, page: int) -> Optional[Dict]:
+        """완료된 페이지 레코드 (없으면 None)"""
+        return self._pages.get((target, keyword, page))
+
+    def pages(self, target: str) -> List[Dict]:
+        """대상의 완료된 페이지 레코드 목록"""
+        return [record for (t, _, _), record in self._pages.items() if t == target]
+
+    def record_page(self, target: str, keyword: str, page: int, total_cnt: int,
+                    ids: List[str], reached_since: bool = False):
+        """페이지 완료 기록 (즉시 디스크에 반영)
+
+        Args:
+            ids: 페이지에 포함된 문서 일련번호
+            reached_since: 증분 수집 기준일 이전 문서가 나와 이후 페이지가 필요 없는지
+        """
+        record = {
+            "type": "page",
+            "target": target,
+            "keyword": keyword,
+            "page": page,
+            "total_cnt": total_cnt,
+            "ids": ids,
+            "reached_since": reached_since,
+        }
+        with self._lock:
+            self._pages[(target, keyword, page)] = record
+            self._append(record)
+
+    def is_target_done(self, target: str) -> bool:
+        return target in self._done_targets
+
+    def mark_target_done(self, target: str):
+        with self._lock:
+            self._done_targets.add(target)
+            self._append({"type": "target_done", "target": target})
+
+    def mark_run_done(self):
+        with self._lock:
+            self.run_done = True
+            self._append({"type": "run_done"})
+
+    def close(self):
+        self._file.close()
+
+    def _append(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+class CollectionState:
+    """대상별 마지막 수집 정보 (증분 수집 기준)"""
+
+    def __init__(self, state_file: Path):
+        self.state_file = Path(state_file)
+        self.state = {"targets": {}}
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def get(self, target: str) -> Dict:
+        return self.state["targets"].get(target, {})
+
+    def update(self, target: str, **values):
+        self.state["targets"].setdefault(target, {}).update(values)
+
+    def save(self):
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
@@ -0,0 +1,309 @@
+"""
+계약서 조항 정렬 비교
+
+두 계약서를 조항 단위로 나누고 조항 임베딩 유사도 행렬로 조항을 짝지은 뒤,
+짝지어진 조항에만 글자 단위 diff를 적용해 추가(added) / 삭제(removed) /
+수정(modified) / 동일(unchanged) 조항을 보고합니다.
+
+- 정규화한 내용이 같은 조항은 임베딩 없이 먼저 짝지음
+- 나머지 조항은 두 문서 것을 한 번에 배치 임베딩 (조항 텍스트별 임베딩 캐시)
+- 유사도 행렬에서 헝가리안(scipy) 또는 탐욕(greedy) 할당으로 1:1 정렬
+- 모든 조항 쌍이 아닌 정렬된 쌍에만 difflib 적용
+
+사용법:
+    python contract_compare.py --left old.json --right new.json
+    python contract_compare.py --left old.txt --right new.txt --method greedy --output diff.json
+"""
+
+import difflib
+import json
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from chunker import DocumentChunker
+from contract_validator import split_clauses
+from embedder import DocumentEmbedder
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class ContractComparer(DocumentChunker):
+    """조항 정렬 기반 계약서 비교기
+
+    조항 제목 추출은 DocumentChunker 규칙을 그대로 사용합니다.
+    """
+
+    def __init__(self, embedder: Optional[DocumentEmbedder] = None, method: str = "hungarian",
+                 threshold: float = 0.6, cache_size: int = 4096):
+        """
+        Args:
+            embedder: 조항 임베딩에 쓸 임베더 (기본: KURE-v1)
+            method: 정렬 방식 (hungarian: 유사도 합 최대, greedy: 유사도 높은 쌍부터)
+            threshold: 이보다 유사도가 낮은 쌍은 짝짓지 않고 추가/삭제로 보고
+            cache_size: 조항 임베딩 캐시 크기 (표준 양식 조항 재사용)
+        """
+        if method not in ("hungarian", "greedy"):
+            raise ValueError(f"지원하지 않는 정렬 방식: {method}")
+
+        self.embedder = embedder or DocumentEmbedder()
+        self.method = method
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def compare(self, left_text: str, right_text: str) -> Dict:
+        """두 계약서 텍스트 비교
+
+        Returns:
+            clauses: 조항별 비교 결과 (왼쪽 문서 조항 순서, 추가 조항은 오른쪽 위치에 삽입)
+            summary: 상태별 조항 수
+            timings: 단계별 소요 시간
+        """
+        start = time.perf_counter()
+        left = self._clauses(left_text)
+        right = self._clauses(right_text)
+
+        # 1. 내용이 같은 조항 먼저 짝짓기
+        pairs, left_rest, right_rest = self._exact_pairs(left, right)
+
+        # 2. 나머지는 임베딩 유사도로 정렬
+        embed_start = time.perf_counter()
+        similarity = self._similarity([left[i]["normalized"] for i in left_rest],
+                                      [right[j]["normalized"] for j in right_rest])
+        align_start = time.perf_counter()
+        for a, b, score in self._assign(similarity):
+            pairs.append((left_rest[a], right_rest[b], score))
+        diff_start = time.perf_counter()
+
+        # 3. 짝지어진 조항만 글자 단위 diff
+        clauses = self._build_report(left, right, pairs)
+        end = time.perf_counter()
+
+        summary = {"left_clauses": len(left), "right_clauses": len(right)}
+        for status in ("unchanged", "modified", "added", "removed"):
+            summary[status] = sum(1 for clause in clauses if clause["status"] == status)
+
+        return {
+            "summary": summary,
+            "clauses": clauses,
+            "timings": {
+                "embed_sec": align_start - embed_start,
+                "align_sec": diff_start - align_start,
+                "diff_sec": end - diff_start,
+                "total_sec": end - start,
+                "embedded_clauses": len(left_rest) + len(right_rest),
+            },
+        }
+
+    def _clauses(self, text: str) -> List[Dict]:
+        return [{
+            "clause_number": number,
+            "title": self._extract_section_title(content),
+            "content": content,
+            "normalized": _WHITESPACE.sub(' ', content).strip(),
+        } for number, content in split_clauses(text)]
+
+    def _exact_pairs(self, left: List[Dict], right: List[Dict]) -> Tuple[List, List[int], List[int]]:
+        """정규화한 내용이 같은 조항 짝짓기 → (쌍 목록, 남은 왼쪽, 남은 오른쪽)"""
+        right_by_text: Dict[str, List[int]] = {}
+        for j, clause in enumerate(right):
+            right_by_text.setdefault(clause["normalized"], []).append(j)
+
+        pairs = []
+        left_rest = []
+        for i, clause in enumerate(left):
+            candidates = right_by_text.get(clause["normalized"])
+            if candidates:
+                pairs.append((i, candidates.pop(0), 1.0))
+            else:
+                left_rest.append(i)
+
+        matched = {j for _, j, _ in pairs}
+        right_rest = [j for j in range(len(right)) if j not in matched]
+        return pairs, left_rest, right_rest
+
+    def _similarity(self, left_texts: List[str], right_texts: List[str]) -> np.ndarray:
+        """코사인 유사도 행렬 (두 문서 조항을 한 배치로 임베딩)"""
+        if not left_texts or not right_texts:
+            return np.zeros((len(left_texts), len(right_texts)), dtype=np.float32)
+
+        vectors = self._embed(left_texts + right_texts)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors[:len(left_texts)] @ vectors[len(left_texts):].T
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """캐시에 없는 조항만 임베딩
+
+        결과는 이번 호출에서 모은 벡터로 만들므로, 캐시가 작아 새 항목을 넣다가
+        이번 호출의 항목이 밀려나도 영향이 없습니다.
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            if text in self._cache:
+                # 적중 항목을 먼저 최근 사용으로 옮겨 이번 호출의 삽입으로 밀려나지 않게 함
+                self._cache.move_to_end(text)
+                found[text] = self._cache[text]
+            else:
+                missing.append(text)
+
+        if missing:
+            embeddings = self.embedder.encode_texts(missing)
+            for text, vector in zip(missing, embeddings):
+                found[text] = np.asarray(vector, dtype=np.float32)
+                self._cache[text] = found[text]
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.stack([found[text] for text in texts])
+
+    def _assign(self, similarity: np.ndarray) -> List[Tuple[int, int, float]]:
+        """유사도 행렬에서 1:1 조항 정렬 (threshold 미만 쌍은 제외)"""
+        if similarity.size == 0:
+            return []
+
+        if self.method == "hungarian":
+            from scipy.optimize import linear_sum_assignment
+
+            rows, cols = linear_sum_assignment(similarity, maximize=True)
+        else:
+            # 유사도 높은 쌍부터, 이미 짝지어진 행/열은 건너뜀
+            order = np.argsort(similarity, axis=None)[::-1]
+            rows, cols = np.unravel_index(order, similarity.shape)
+            used_rows, used_cols = set(), set()
+            picked = []
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                if similarity[row, col] < self.threshold:
+                    break
+                if row in used_rows or col in used_cols:
+                    continue
+                used_rows.add(row)
+                used_cols.add(col)
+                picked.append((row, col))
+                if len(picked) == min(similarity.shape):
+                    break
+            rows = [row for row, _ in picked]
+            cols = [col for _, col in picked]
+
+        return [(int(row), int(col), float(similarity[row, col]))
+                for row, col in zip(rows, cols) if similarity[row, col] >= self.threshold]
+
+    def _build_report(self, left: List[Dict], right: List[Dict],
+                      pairs: List[Tuple[int, int, float]]) -> List[Dict]:
+        """조항별 결과 (왼쪽 순서 기준, 오른쪽에만 있는 조항은 앞 조항 뒤에 삽입)"""
+        right_to_left = {j: (i, score) for i, j, score in pairs}
+        left_to_right = {i: (j, score) for i, j, score in pairs}
+
+        def summary(clause):
+            return {"clause_number": clause["clause_number"], "title": clause["title"]}
+
+        added_after: Dict[int, List[int]] = {}
+        last_left = -1
+        for j in range(len(right)):
+            if j in right_to_left:
+                last_left = right_to_left[j][0]
+            else:
+                added_after.setdefault(last_left, []).append(j)
+
+        clauses = []
+
+        def add_right_only(position):
+            for j in added_after.get(position, []):
+                clauses.append({"status": "added", "left": None, "right": summary(right[j]),
+                                "similarity": None, "diff": []})
+
+        add_right_only(-1)
+        for i, clause in enumerate(left):
+            if i not in left_to_right:
+                clauses.append({"status": "removed", "left": summary(clause), "right": None,
+                                "similarity": None, "diff": []})
+            else:
+                j, score = left_to_right[i]
+                diff = self._diff(clause["normalized"], right[j]["normalized"])
+                clauses.append({
+                    "status": "modified" if diff else "unchanged",
+                    "left": summary(clause),
+                    "right": summary(right[j]),
+                    "similarity": round(score, 4),
+                    "diff": diff,
+                })
+            add_right_only(i)
+
+        return clauses
+
+    def _diff(self, before: str, after: str) -> List[Dict]:
+        """글자 단위 변경 구간 (같으면 빈 목록)"""
+        if before == after:
+            return []
+
+        matcher = difflib.SequenceMatcher(None, before, after, autojunk=False)
+        return [{"op": tag, "before": before[i1:i2], "after": after[j1:j2]}
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def load_contract_text(path: Path) -> str:
+    """PDFExtractor 출력 JSON 또는 텍스트 파일에서 계약서 텍스트 읽기"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".json":
+            return json.load(f)["text"]
+        return f.read()
+
+
+def print_comparison(result: Dict):
+    summary = result["summary"]
+    timings = result["timings"]
+
+    print("\n" + "="*60)
+    print("계약서 조항 비교 결과")
+    print("="*60)
+    print(f"조항 수:   왼쪽 {summary['left_clauses']}개 / 오른쪽 {summary['right_clauses']}개")
+    print(f"동일 {summary['unchanged']}개, 수정 {summary['modified']}개, "
+          f"추가 {summary['added']}개, 삭제 {summary['removed']}개")
+    print(f"소요 시간: {timings['total_sec'] * 1000:.1f}ms "
+          f"(임베딩 {timings['embed_sec'] * 1000:.1f}ms / {timings['embedded_clauses']}개 조항, "
+          f"정렬 {timings['align_sec'] * 1000:.1f}ms, diff {timings['diff_sec'] * 1000:.1f}ms)")
+    print("-"*60)
+    labels = {"unchanged": "동일", "modified": "수정", "added": "추가", "removed": "삭제"}
+    for clause in result["clauses"]:
+        if clause["status"] == "unchanged":
+            continue
+        side = clause["left"] or clause["right"]
+        print(f"[{labels[clause['status']]}] {side['clause_number']}. {side['title']}")
+        for change in clause["diff"][:3]:
+            print(f"    - '{change['before']}' → '{change['after']}'")
+    print("="*60)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="계약서 조항 정렬 비교")
+    parser.add_argument("--left", type=Path, required=True, help="기준 계약서 (추출 JSON 또는 텍스트)")
+    parser.add_argument("--right", type=Path, required=True, help="비교 계약서 (추출 JSON 또는 텍스트)")
+    parser.add_argument("--method", choices=["hungarian", "greedy"], default="hungarian")
+    parser.add_argument("--threshold", type=float, default=0.6, help="조항을 짝지을 최소 코사인 유사도")
+    parser.add_argument("--model", default="nlpai-lab/KURE-v1", help="임베딩 모델")
+    parser.add_argument("--output", type=Path, default=None, help="비교 결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    comparer = ContractComparer(DocumentEmbedder(model_name=args.model),
+                                method=args.method, threshold=args.threshold)
+    result = comparer.compare(load_contract_text(args.left), load_contract_text(args.right))
+    print_comparison(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+계약서 수치 조건 추출 및 법정 기준 일괄 점검
+
+계약서 조항에서 임금(월급/시급/일급), 근로시간, 근무일수, 연차 일수, 계약기간을
+정규식으로 뽑아 열(column) 단위 NumPy 배열로 모으고, 법정 기준(COMPLIANCE_RULES)을
+배열 연산으로 한 번에 점검합니다. 계약서 수천 건도 계약서별 반복 없이 규칙 수만큼의
+배열 비교로 끝납니다.
+
+값을 찾지 못한 항목은 NaN(날짜는 NaT)으로 두고, 해당 규칙은 "판단 불가"로 집계합니다.
+
+사용법:
+    python contract_terms.py --input contracts.jsonl
+    python contract_terms.py --input ../data/processed/documents/uploads --output terms.jsonl
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from chunker import DocumentChunker
+from contract_validator import _NAME_NORMALIZE, iter_contracts, split_clauses
+from extract_contract_fields import FIELD_MATCHER
+
+
+# 법정 기준 (2025년)
+MINIMUM_HOURLY_WAGE = 10030      # 최저임금 시급 (원)
+MONTHLY_STANDARD_HOURS = 209     # 월 소정근로시간 환산 기준 (주 40시간 + 주휴 8시간)
+WEEKS_PER_MONTH = 4.345          # 월 평균 주 수 (365일 / 7 / 12)
+MIN_WEEKLY_HOURS_FOR_HOLIDAY = 15  # 주휴일 부여 기준 1주 소정근로시간 (근로기준법 제18조)
+MAX_DAILY_HOURS = 8              # 1일 법정 근로시간
+MAX_WEEKLY_HOURS = 40            # 1주 법정 근로시간
+MIN_ANNUAL_LEAVE_DAYS = 15       # 1년 근무 시 연차유급휴가
+
+# 추출 열 (이름 → dtype)
+TERM_COLUMNS = {
+    "monthly_wage": np.float64,
+    "daily_wage": np.float64,
+    "hourly_wage": np.float64,
+    "daily_hours": np.float64,
+    "weekly_hours": np.float64,
+    "work_days_per_week": np.float64,
+    "annual_leave_days": np.float64,
+    "start_date": "datetime64[D]",
+    "end_date": "datetime64[D]",
+}
+
+# 점검 규칙: (이름, 점검 열, 위반 조건, 설명, 관련 규정)
+#   열은 TERM_COLUMNS 또는 derive_columns가 만드는 파생 열
+COMPLIANCE_RULES = [
+    ("minimum_wage", "effective_hourly_wage", lambda v: v < MINIMUM_HOURLY_WAGE,
+     f"시급 환산액이 최저임금({MINIMUM_HOURLY_WAGE:,}원) 미만", "최저임금법 제6조"),
+    ("daily_hours", "daily_hours", lambda v: v > MAX_DAILY_HOURS,
+     f"1일 소정근로시간 {MAX_DAILY_HOURS}시간 초과", "근로기준법 제50조"),
+    ("weekly_hours", "effective_weekly_hours", lambda v: v > MAX_WEEKLY_HOURS,
+     f"1주 소정근로시간 {MAX_WEEKLY_HOURS}시간 초과", "근로기준법 제50조"),
+    ("annual_leave", "full_time_annual_leave_days", lambda v: v < MIN_ANNUAL_LEAVE_DAYS,
+     f"연차유급휴가 {MIN_ANNUAL_LEAVE_DAYS}일 미만", "근로기준법 제60조"),
+    ("contract_period", "contract_days", lambda v: v < 0,
+     "계약 종료일이 시작일보다 빠름", "근로기준법 제17조"),
+]
+
+_WAGE = re.compile(r'(월\s*\([^)]*\)\s*급|월\s*급여?|월\s*임금|기본급|시\s*급|시간급|일\s*급|일당)\s*[:：]?\s*([\d,]{3,})\s*원')
+_DATE = re.compile(r'(\d{4})\s*[년.\-/]\s*(\d{1,2})\s*[월.\-/]\s*(\d{1,2})')
+_TIME = re.compile(r'(\d{1,2})\s*(?:시\s*(?:(\d{1,2})\s*분)?|:\s*(\d{2}))')
+# "주 5일 40시간"의 "5일"을 1일 근로시간으로 읽지 않도록 숫자 뒤의 "일"은 제외
+_DAILY_HOURS = re.compile(r'(?:1\s*일|하루|(?<!\d)(?<!\d\s)일)\s*(\d+(?:\.\d+)?)\s*시간')
+_WEEKLY_HOURS = re.compile(r'(?:1주|주당|주)\s*(?:\d\s*일\s*,?\s*)?(\d+(?:\.\d+)?)\s*시간')
+_WORK_DAYS = re.compile(r'(?:매\s*주|1주|주)\s*(\d)\s*일')
+# "매년 1월 1일 기준으로 15일 부여"의 날짜(1월 1일)는 제외
+_LEAVE_DAYS = re.compile(r'(?<![\d월])(?<!월\s)(\d{1,2})\s*일')
+_BREAK_MINUTES = re.compile(r'휴게\D{0,10}?(\d+)\s*(분|시간)')
+
+
+class ContractTermExtractor(DocumentChunker):
+    """계약서 수치 조건 추출기
+
+    조항은 필드 규칙(FIELD_MATCHER)으로 분류하고, 분류된 조항에서만 해당 값을 찾습니다.
+    """
+
+    def __init__(self):
+        # 입출력 디렉토리를 쓰지 않으므로 DocumentChunker 초기화(디렉토리 생성)는 생략
+        pass
+
+    def extract(self, text: str) -> Dict:
+        """계약서 하나의 수치 조건 (없는 값은 None)"""
+        terms = {column: None for column in TERM_COLUMNS}
+        terms["contract_type"] = self._extract_contract_type(text)
+
+        for _, content in split_clauses(text):
+            # 표준 양식의 "임 금", "근 무 장 소"처럼 글자 사이가 띄어진 제목도 규칙에 맞도록 공백 제거
+            title = _NAME_NORMALIZE.sub('', self._extract_section_title(content))
+            field_key = FIELD_MATCHER.describe(title, content, terms["contract_type"])[0]
+
+            if field_key == "임금":
+                self._parse_wages(content, terms)
+            elif field_key == "근로시간":
+                self._parse_hours(content, terms)
+            elif field_key == "근무일및휴일":
+                self._parse_work_days(content, terms)
+            elif field_key == "연차유급휴가":
+                match = _LEAVE_DAYS.search(content)
+                if match and terms["annual_leave_days"] is None:
+                    terms["annual_leave_days"] = float(match.group(1))
+            elif field_key == "근로계약기간":
+                dates = [self._date(m) for m in _DATE.finditer(content)]
+                dates = [d for d in dates if d is not None]
+                if dates and terms["start_date"] is None:
+                    terms["start_date"] = dates[0]
+                    terms["end_date"] = dates[1] if len(dates) > 1 else None
+
+        return terms
+
+    def extract_batch(self, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """계약서 여러 건 → 열 단위 배열 (없는 값은 NaN/NaT)"""
+        rows = [self.extract(text) for text in texts]
+        columns = {"contract_type": np.array([row["contract_type"] for row in rows], dtype=object)}
+        for column, dtype in TERM_COLUMNS.items():
+            missing = np.datetime64("NaT") if dtype == "datetime64[D]" else np.nan
+            columns[column] = np.array([missing if row[column] is None else row[column] for row in rows],
+                                       dtype=dtype)
+        return columns
+
+    def _parse_wages(self, content: str, terms: Dict):
+        for kind, amount in _WAGE.findall(content):
+            value = float(amount.replace(',', ''))
+            kind = re.sub(r'\s+', '', kind)
+            column = ("hourly_wage" if kind in ("시급", "시간급")
+                      else "daily_wage" if kind in ("일급", "일당") else "monthly_wage")
+            if terms[column] is None:
+                terms[column] = value
+
+    def _parse_hours(self, content: str, terms: Dict):
+        explicit = _DAILY_HOURS.search(content)
+        if explicit:
+            terms["daily_hours"] = float(explicit.group(1))
+        weekly = _WEEKLY_HOURS.search(content)
+        if weekly:
+            terms["weekly_hours"] = float(weekly.group(1))
+        if explicit:
+            return
+
+        # "09시 00분부터 18시 00분까지 (휴게시간 : 12시 00분~13시 00분)"
+        work_part, _, break_part = content.partition("휴게")
+        work_times = [self._hour(m) for m in _TIME.finditer(work_part)]
+        if len(work_times) < 2:
+            return
+        hours = (work_times[1] - work_times[0]) % 24
+
+        break_times = [self._hour(m) for m in _TIME.finditer(break_part)]
+        break_minutes = _BREAK_MINUTES.search("휴게" + break_part) if break_part else None
+        if len(break_times) >= 2:
+            hours -= (break_times[1] - break_times[0]) % 24
+        elif break_minutes:
+            amount = float(break_minutes.group(1))
+            hours -= amount / 60 if break_minutes.group(2) == "분" else amount
+        terms["daily_hours"] = hours
+
+    def _parse_work_days(self, content: str, terms: Dict):
+        match = _WORK_DAYS.search(content)
+        if match and terms["work_days_per_week"] is None:
+            terms["work_days_per_week"] = float(match.group(1))
+
+    @staticmethod
+    def _hour(match) -> float:
+        minutes = match.group(2) or match.group(3) or 0
+        return int(match.group(1)) + int(minutes) / 60
+
+    @staticmethod
+    def _date(match) -> Optional[np.datetime64]:
+        year, month, day = (int(g) for g in match.groups())
+        try:
+            return np.datetime64(f"{year:04d}-{month:02d}-{day:02d}", "D")
+        except ValueError:
+            return None
+
+
+def derive_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """점검용 파생 열 추가 (시급 환산액, 주 근로시간, 계약 일수 등)"""
+    derived = dict(columns)
+    daily_hours = columns["daily_hours"]
+
+    weekly = columns["weekly_hours"]
+    weekly = np.where(np.isnan(weekly), daily_hours * columns["work_days_per_week"], weekly)
+    derived["effective_weekly_hours"] = weekly
+
+    # 월 소정근로시간: (주 근로시간 + 주휴시간) × 월 평균 주 수, 주 근로시간을 모르면 209시간
+    #   주휴시간은 주 15시간 이상일 때 주 근로시간에 비례 (주 40시간 → 8시간)
+    #   예) 1일 4시간 × 주 5일 → (20 + 4) × 4.345 ≈ 104시간, 월 1,100,000원 → 시급 약 10,550원
+    with np.errstate(invalid='ignore'):
+        holiday = np.where(weekly >= MIN_WEEKLY_HOURS_FOR_HOLIDAY,
+                           np.minimum(weekly, MAX_WEEKLY_HOURS) / MAX_WEEKLY_HOURS * 8, 0.0)
+    monthly_hours = np.where(np.isnan(weekly), MONTHLY_STANDARD_HOURS, (weekly + holiday) * WEEKS_PER_MONTH)
+
+    # 시급 환산: 시급 > 일급 / 1일 근로시간 > 월급 / 월 소정근로시간 순으로 사용
+    hourly = columns["hourly_wage"].copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        from_daily = np.where(daily_hours > 0, columns["daily_wage"] / daily_hours, np.nan)
+        from_monthly = np.where(monthly_hours > 0, columns["monthly_wage"] / monthly_hours, np.nan)
+    hourly = np.where(np.isnan(hourly), from_daily, hourly)
+    hourly = np.where(np.isnan(hourly), from_monthly, hourly)
+    derived["effective_hourly_wage"] = hourly
+
+    # 단시간근로자는 연차가 근로시간 비례라 15일 기준에서 제외
+    part_time = columns["contract_type"] == "단시간근로자"
+    derived["full_time_annual_leave_days"] = np.where(part_time, np.nan, columns["annual_leave_days"])
+
+    period = columns["end_date"] - columns["start_date"]
+    derived["contract_days"] = np.where(np.isnat(period), np.nan, period.astype("timedelta64[D]").astype(np.float64))
+    return derived
+
+
+def check_compliance(columns: Dict[str, np.ndarray]) -> Dict[str, Dict[str, np.ndarray]]:
+    """법정 기준 일괄 점검
+
+    Returns:
+        규칙 이름 → {"violation": 위반 여부, "evaluated": 값이 있어 점검했는지} (계약서 수 길이 bool 배열)
+    """
+    derived = derive_columns(columns)
+    results = {}
+    for name, column, violates, _, _ in COMPLIANCE_RULES:
+        values = derived[column]
+        evaluated = ~np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            results[name] = {"violation": evaluated & violates(values), "evaluated": evaluated}
+    return results
+
+
+def compliance_records(columns: Dict[str, np.ndarray], results: Dict[str, Dict[str, np.ndarray]],
+                       contract_ids: List[Optional[str]]) -> List[Dict]:
+    """계약서별 결과 레코드 (추출 값 + 위반 항목)"""
+    violations = np.stack([results[name]["violation"] for name, *_ in COMPLIANCE_RULES], axis=1)
+    records = []
+    for i, contract_id in enumerate(contract_ids):
+        terms = {}
+        for column in TERM_COLUMNS:
+            value = columns[column][i]
+            if isinstance(value, np.datetime64):
+                terms[column] = None if np.isnat(value) else str(value)
+            else:
+                terms[column] = None if np.isnan(value) else float(value)
+
+        records.append({
+            "contract_id": contract_id,
+            "contract_type": columns["contract_type"][i],
+            "terms": terms,
+            "violations": [{"rule": name, "description": description, "regulation": regulation}
+                           for (name, _, _, description, regulation), hit
+                           in zip(COMPLIANCE_RULES, violations[i]) if hit],
+        })
+    return records
+
+
+def print_summary(results: Dict[str, Dict[str, np.ndarray]], count: int, elapsed: Dict[str, float]):
+    print("\n" + "="*60)
+    print("계약서 법정 기준 점검 결과")
+    print("="*60)
+    print(f"계약서: {count}건 (추출 {elapsed['extract']:.2f}초, 점검 {elapsed['check'] * 1000:.1f}ms)")
+    print(f"{'규칙':<18}{'점검':>8}{'위반':>8}{'판단 불가':>10}")
+    for name, _, _, description, _ in COMPLIANCE_RULES:
+        evaluated = int(results[name]["evaluated"].sum())
+        violations = int(results[name]["violation"].sum())
+        print(f"{name:<18}{evaluated:>8}{violations:>8}{count - evaluated:>10}  {description}")
+    print("="*60)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="계약서 수치 조건 추출 및 법정 기준 점검")
+    parser.add_argument("--input", type=Path, required=True,
+                        help="추출된 계약서 JSON 디렉토리 또는 JSONL 파일")
+    parser.add_argument("--output", type=Path, default=None, help="계약서별 결과 JSONL 저장 경로")
+    args = parser.parse_args()
+
+    contracts = list(iter_contracts(args.input))
+    extractor = ContractTermExtractor()
+
+    start = time.perf_counter()
+    columns = extractor.extract_batch(contract["text"] for contract in contracts)
+    extracted = time.perf_counter()
+    results = check_compliance(columns)
+    checked = time.perf_counter()
+
+    print_summary(results, len(contracts), {"extract": extracted - start, "check": checked - extracted})
+
+    if args.output:
+        records = compliance_records(columns, results, [c.get("contract_id") for c in contracts])
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+업로드 계약서 필수 필드 검증
+
+PDFExtractor로 추출한 계약서 텍스트를 조항 단위로 나누고, 판별한 계약 유형의
+필수 필드 체크리스트(required_contract_fields.json)에 조항을 맞춰
+누락(missing) / 기재(present) / 의심(suspicious) 필드를 보고합니다.
+
+조항 정렬은 extract_contract_fields의 컴파일된 필드 규칙과 필드 색인을 그대로 쓰고,
+의심 패턴도 하나의 정규식으로 묶어 조항마다 한 번만 훑으므로 모델 없이 CPU에서
+초당 수천 건을 처리합니다 (PDF 추출 제외).
+
+사용법:
+    python contract_validator.py --input ../data/processed/documents/uploads
+    python contract_validator.py --input contracts.jsonl --output validation.jsonl
+"""
+
+import json
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chunker import DocumentChunker
+from extract_contract_fields import DEFAULT_FIELDS_FILE, FIELD_MATCHER, RequiredFieldIndex, load_field_index
+from metrics import timed
+
+
+# 조항 분할 (chunk_standard_contract와 같은 "1. 제목" 패턴)
+_PAGE_MARKER = re.compile(r'\n?--- Page \d+ ---\n?')
+_CLAUSE_SPLIT = re.compile(r'\n(\d+)\.\s+')
+_NAME_NORMALIZE = re.compile(r'[\s\W_]+')
+
+# 기재 내용이 의심스러운 패턴 (이름, 정규식, 사유)
+SUSPICIOUS_PATTERNS = [
+    ("blank_underline", r'_{3,}|＿{2,}', "빈칸(밑줄)이 채워지지 않음"),
+    ("blank_parenthesis", r'\(\s*\)|（\s*）', "괄호 안이 비어 있음"),
+    ("placeholder", r'○○|OO|△△|xx원|XX원', "예시 자리표시자가 남아 있음"),
+    ("blank_date", r'(?<!\d)\s년\s+월\s+일', "날짜가 기재되지 않음"),
+    ("blank_amount", r'(?<![\d,])\s+원(?:\s|$|[,.)])', "금액이 기재되지 않음"),
+]
+
+_SUSPICIOUS = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in SUSPICIOUS_PATTERNS))
+_SUSPICIOUS_REASONS = {name: reason for name, _, reason in SUSPICIOUS_PATTERNS}
+
+
+class ContractValidator(DocumentChunker):
+    """계약서 필수 필드 검증기
+
+    계약 유형 판별과 조항 제목 추출은 DocumentChunker 규칙을 그대로 사용해
+    체크리스트를 만든 표준근로계약서와 같은 기준으로 조항을 나눕니다.
+    """
+
+    def __init__(self, fields_file: Path = DEFAULT_FIELDS_FILE,
+                 index: Optional[RequiredFieldIndex] = None,
+                 fallback_type: str = "정규직", min_content_chars: int = 2):
+        """
+        Args:
+            fields_file: 필수 필드 체크리스트 (index를 주면 사용하지 않음)
+            index: 미리 만든 필수 필드 색인
+            fallback_type: 판별한 유형의 체크리스트가 없을 때 대신 쓸 유형
+            min_content_chars: 조항 제목을 뺀 내용이 이보다 짧으면 의심 필드로 보고
+        """
+        self.index = index or load_field_index(fields_file)
+        self.fallback_type = fallback_type
+        self.min_content_chars = min_content_chars
+        self._name_maps: Dict[str, Dict[str, str]] = {}
+
+    @timed("validate_contract")
+    def validate(self, text: str, contract_id: Optional[str] = None) -> Dict:
+        """계약서 텍스트 하나 검증
+
+        Returns:
+            contract_type, checklist_type, present / missing / suspicious 필드,
+            체크리스트에 없는 조항(extra_clauses), 완성도 및 위험도 요약
+        """
+        text = _PAGE_MARKER.sub('\n', text)
+        contract_type = self._extract_contract_type(text)
+        checklist_type = contract_type if self.index.fields(contract_type) else self.fallback_type
+
+        present = {}
+        suspicious = []
+        extra_clauses = []
+        for clause_number, content in split_clauses(text):
+            title = self._extract_section_title(content)
+            field_key = self._align(title, content, checklist_type)
+            if field_key is None:
+                extra_clauses.append({"clause_number": clause_number, "title": title})
+                continue
+
+            field = self.index.get(checklist_type, field_key)
+            reasons = self._suspicious_reasons(title, content)
+            if field_key in present:
+                reasons.append("같은 항목이 여러 번 기재됨")
+            else:
+                present[field_key] = {
+                    "field_key": field_key,
+                    "field_name": field["field_name"],
+                    "clause_number": clause_number,
+                    "title": title,
+                }
+
+            if reasons:
+                suspicious.append({
+                    "field_key": field_key,
+                    "field_name": field["field_name"],
+                    "clause_number": clause_number,
+                    "reasons": reasons,
+                    "regulation": field.get("regulation"),
+                    "risk_level": "중간",
+                })
+
+        missing = []
+        for key in self.index.keys(checklist_type):
+            if key in present:
+                continue
+            field = self.index.get(checklist_type, key)
+            if not field.get("required", True):
+                continue
+            missing.append({
+                "field_key": key,
+                "field_name": field["field_name"],
+                "description": field.get("description", ""),
+                "regulation": field.get("regulation"),
+                # 필드 규칙이 있는 법정 기재사항 누락은 높음, 그 외 양식 조항은 낮음
+                "risk_level": "높음" if field.get("field_key") else "낮음",
+            })
+
+        required_count = len(present) + len(missing)
+        high_risks = sum(1 for field in missing if field["risk_level"] == "높음")
+        return {
+            "contract_id": contract_id,
+            "contract_type": contract_type,
+            "checklist_type": checklist_type,
+            "present": list(present.values()),
+            "missing": missing,
+            "suspicious": suspicious,
+            "extra_clauses": extra_clauses,
+            "completeness": len(present) / required_count if required_count else 0.0,
+            "risk_summary": {
+                "overall": "높음" if high_risks else "중간" if suspicious else "낮음",
+                "high_risks": high_risks,
+                "medium_risks": len(suspicious),
+                "low_risks": len(missing) - high_risks,
+            },
+        }
+
+    def validate_batch(self, contracts: Iterable[Dict]) -> Iterator[Dict]:
+        """계약서 여러 건 검증 ({"contract_id", "text"} 목록, 결과는 입력 순서대로)"""
+        for contract in contracts:
+            yield self.validate(contract["text"], contract.get("contract_id"))
+
+    def _align(self, title: str, content: str, checklist_type: str) -> Optional[str]:
+        """조항을 체크리스트 필드에 맞추기 (필드 규칙 우선, 없으면 필드명 일치)"""
+        field_key = FIELD_MATCHER.describe(title, content, checklist_type)[0]
+        if field_key is not None and self.index.get(checklist_type, field_key):
+            return field_key
+        return self._name_map(checklist_type).get(_NAME_NORMALIZE.sub('', title))
+
+    def _name_map(self, checklist_type: str) -> Dict[str, str]:
+        """정규화한 필드명 → 색인 key (유형별 1회 생성)"""
+        if checklist_type not in self._name_maps:
+            self._name_maps[checklist_type] = {
+                _NAME_NORMALIZE.sub('', field["field_name"]): field["field_key"] or field["field_name"]
+                for field in self.index.fields(checklist_type)
+            }
+        return self._name_maps[checklist_type]
+
+    def _suspicious_reasons(self, title: str, content: str) -> List[str]:
+        reasons = []
+        body = content[len(title):] if content.startswith(title) else content
+        if len(body.strip(" :\n")) < self.min_content_chars:
+            reasons.append("기재 내용이 없거나 너무 짧음")
+
+        for match in _SUSPICIOUS.finditer(content):
+            reason = _SUSPICIOUS_REASONS[match.lastgroup]
+            if reason not in reasons:
+                reasons.append(reason)
+        return reasons
+
+
+def split_clauses(text: str) -> List[Tuple[str, str]]:
+    """계약서 텍스트를 (조항 번호, 조항 내용) 목록으로 분할 (번호 앞 머리말은 제외)"""
+    parts = _CLAUSE_SPLIT.split(_PAGE_MARKER.sub('\n', text))
+    clauses = []
+    for i in range(1, len(parts) - 1, 2):
+        content = parts[i + 1].strip()
+        if content:
+            clauses.append((parts[i], content))
+    return clauses
+
+
+def iter_contracts(path: Path) -> Iterator[Dict]:
+    """검증할 계약서 읽기
+
+    - 디렉토리: PDFExtractor 출력 JSON 파일들 (contract_id는 원본 파일명)
+    - .jsonl: 한 줄에 {"contract_id", "text"} 하나
+    """
+    path = Path(path)
+    if path.is_dir():
+        for file in sorted(path.glob('*.json')):
+            with open(file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            yield {"contract_id": data.get("filename", file.name), "text": data.get("text", "")}
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def print_summary(results: List[Dict], elapsed: float):
+    missing_counts = Counter(field["field_name"] for result in results for field in result["missing"])
+    overall = Counter(result["risk_summary"]["overall"] for result in results)
+
+    print("\n" + "="*60)
+    print("계약서 필수 필드 검증 결과")
+    print("="*60)
+    print(f"계약서:       {len(results):>8}건")
+    print(f"처리 시간:    {elapsed:>8.2f}초 ({len(results) / elapsed if elapsed else 0:,.0f}건/초)")
+    print(f"위험도:       높음 {overall['높음']}건 / 중간 {overall['중간']}건 / 낮음 {overall['낮음']}건")
+    if missing_counts:
+        print("\n자주 누락된 필드:")
+        for name, count in missing_counts.most_common(5):
+            print(f"  - {name}: {count}건")
+    print("="*60)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="계약서 필수 필드 검증")
+    parser.add_argument("--input", type=Path, required=True,
+                        help="추출된 계약서 JSON 디렉토리 또는 JSONL 파일")
+    parser.add_argument("--fields", type=Path, default=DEFAULT_FIELDS_FILE, help="필수 필드 체크리스트")
+    parser.add_argument("--output", type=Path, default=None, help="검증 결과 JSONL 저장 경로")
+    args = parser.parse_args()
+
+    validator = ContractValidator(fields_file=args.fields)
+
+    start = time.perf_counter()
+    results = list(validator.validate_batch(iter_contracts(args.input)))
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"저장: {args.output}")
+
+    print_summary(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
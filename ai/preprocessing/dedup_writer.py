@@ -0,0 +1,187 @@
+"""
+일련번호 기준 중복 제거 + JSONL 스트리밍 저장
+
+여러 키워드 검색 결과에 같은 판례/해석례가 반복해서 나오므로, API의 문서 일련번호로
+처음 본 문서만 즉시 JSONL에 한 줄씩 기록하고 이후 중복은 검색 키워드만 병합합니다.
+메모리에는 일련번호 → 키워드 목록만 유지하며, 병합된 키워드는 close() 시 파일을 한 번
+스트리밍으로 다시 써서 반영합니다.
+
+저장 레코드:
+    {"판례일련번호": "...", ..., "검색키워드": ["해고", "임금"], "수집일시": "..."}
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+def document_id(item: Dict, id_field: Optional[str] = None) -> str:
+    """문서 일련번호 (필드가 없으면 내용 해시)"""
+    if id_field and item.get(id_field):
+        return str(item[id_field])
+
+    for key, value in item.items():
+        if key.endswith("일련번호") and value:
+            return str(value)
+
+    content = {k: v for k, v in item.items() if k not in ("검색키워드", "수집일시")}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class DedupJsonlWriter:
+    """일련번호 기준 중복 제거 JSONL 기록기"""
+
+    def __init__(self, path: Optional[Path], id_field: Optional[str] = None):
+        """
+        Args:
+            path: 저장할 JSONL 경로. None이면 파일 없이 메모리에만 보관
+            id_field: 문서 일련번호 필드 (예: "판례일련번호")
+        """
+        self.path = Path(path) if path else None
+        self.id_field = id_field
+
+        self._keywords: Dict[str, List[str]] = {}
+        self._records: Dict[str, Dict] = {}  # 메모리 모드 전용
+        self._dirty = False
+        self._file = None
+        self._lock = threading.RLock()
+
+        self.count = 0
+        self.duplicates = 0
+
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._load_existing()
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load_existing(self):
+        """이전 실행에서 기록된 파일이 있으면 일련번호/키워드 복원 (이어서 수집)"""
+        if not self.path.exists():
+            return
+
+        valid_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # 기록 도중 중단된 마지막 줄
+                valid_size += len(line)
+                self._keywords[document_id(record, self.id_field)] = list(record.get("검색키워드", []))
+
+        # 잘린 줄 제거 후 이어쓰기
+        if valid_size < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+
+        self.count = len(self._keywords)
+        if self.count:
+            print(f"  기존 결과 복원: {self.path.name} ({self.count}건)")
+
+    def add(self, item: Dict, keyword: Optional[str] = None) -> bool:
+        """문서 추가
+
+        Returns:
+            새 문서이면 True, 이미 있던 문서(키워드만 병합)면 False
+        """
+        keyword = keyword or item.get("검색키워드")
+        doc_id = document_id(item, self.id_field)
+
+        with self._lock:
+            return self._add(doc_id, item, keyword)
+
+    def _add(self, doc_id: str, item: Dict, keyword: Optional[str]) -> bool:
+        keywords = self._keywords.get(doc_id)
+        if keywords is not None:
+            self.duplicates += 1
+            if keyword and keyword not in keywords:
+                keywords.append(keyword)
+                if self.path:
+                    self._dirty = True
+                else:
+                    self._records[doc_id]["검색키워드"] = keywords
+            return False
+
+        record = dict(item)
+        record["검색키워드"] = [keyword] if keyword else []
+        self._keywords[doc_id] = list(record["검색키워드"])
+        self.count += 1
+
+        if self.path:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._records[doc_id] = record
+        return True
+
+    def merge_keyword(self, doc_id: str, keyword: str):
+        """이미 기록된 문서에 검색 키워드 병합 (체크포인트 복원용)"""
+        with self._lock:
+            keywords = self._keywords.get(doc_id)
+            if keywords is not None and keyword not in keywords:
+                keywords.append(keyword)
+                if self.path:
+                    self._dirty = True
+                else:
+                    self._records[doc_id]["검색키워드"] = keywords
+
+    def add_many(self, items: List[Dict], keyword: Optional[str] = None) -> int:
+        """여러 문서 추가 후 디스크에 반영, 새 문서 수 반환"""
+        with self._lock:
+            added = sum(self.add(item, keyword) for item in items)
+            self.flush()
+        return added
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def records(self) -> List[Dict]:
+        """저장된 전체 문서 (메모리 모드는 메모리에서, 파일 모드는 파일에서 읽음)"""
+        if not self.path:
+            return list(self._records.values())
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator[Dict]:
+        """파일을 한 줄씩 읽으며 병합된 키워드를 반영해 반환"""
+        if not self.path:
+            yield from self._records.values()
+            return
+
+        self.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                record["검색키워드"] = self._keywords.get(
+                    document_id(record, self.id_field), record.get("검색키워드", [])
+                )
+                yield record
+
+    def close(self):
+        """파일을 닫고, 중복으로 병합된 키워드가 있으면 파일에 반영"""
+        if not self._file:
+            return
+
+        self._file.close()
+        self._file = None
+
+        if self._dirty:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(self.path, 'r', encoding='utf-8') as src, \
+                    open(tmp_path, 'w', encoding='utf-8') as dst:
+                for line in src:
+                    record = json.loads(line)
+                    record["검색키워드"] = self._keywords[document_id(record, self.id_field)]
+                    dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
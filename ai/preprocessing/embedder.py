@@ -2,22 +2,51 @@ import json
 from pathlib import Path
 from typing import List, Dict
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from tqdm import tqdm
-import pickle
+
+from embedding_backend import EmbeddingBackend, create_backend
+from metrics import timed
 
 
 class DocumentEmbedder:
-    def __init__(self, model_name: str = "nlpai-lab/KURE-v1", batch_size: int = 32):
+    def __init__(self, model_name: str = "nlpai-lab/KURE-v1", batch_size: int = 32, backend: str = "torch"):
         """
         Args:
             model_name: 사용할 임베딩 모델 (기본: KURE-v1)
             batch_size: 배치 크기
+            backend: 추론 백엔드 (torch, torch-int8, onnx, onnx-int8)
         """
-        print(f"임베딩 모델 로딩 중: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
         self.batch_size = batch_size
-        print(f"모델 로딩 완료 (차원: {self.model.get_sentence_embedding_dimension()})")
+        self.backend_name = backend
+        # KURE 모델 최대 길이 512 토큰으로 제한 (메모리 절약), 모델은 첫 인코딩 시 로딩
+        self.backend: EmbeddingBackend = create_backend(backend, model_name, max_seq_length=512)
+
+    @property
+    def cache_key(self) -> str:
+        """임베딩 캐시 키에 쓸 모델 식별자 (torch 외 백엔드는 결과가 조금 달라 구분)"""
+        return self.model_name if self.backend_name == "torch" else f"{self.model_name}@{self.backend_name}"
+
+    @staticmethod
+    def build_text(chunk: Dict) -> str:
+        """청크를 임베딩 입력 텍스트로 변환"""
+        # content를 기본으로, 추가 컨텍스트 포함
+        text = chunk['content']
+
+        # 메타데이터를 텍스트에 추가 (검색 성능 향상)
+        if chunk.get('category'):
+            text = f"[{chunk['category']}] {text}"
+
+        if chunk.get('keywords'):
+            keywords_str = ", ".join(chunk['keywords'][:3])  # 상위 3개 키워드만
+            if keywords_str:
+                text = f"{text}\n키워드: {keywords_str}"
+
+        return text
+
+    @timed("encode", count_items=True)
+    def encode_texts(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        """텍스트 목록 임베딩 (배치 단위)"""
+        return self.backend.encode(texts, batch_size=self.batch_size, show_progress_bar=show_progress_bar)
 
     def embed_chunks(self, chunks_file: Path, output_dir: Path):
         """청크 파일을 읽어서 임베딩 생성"""
@@ -30,38 +59,22 @@ class DocumentEmbedder:
 
         print(f"총 {len(chunks)}개 청크 로딩 완료")
 
-        # 임베딩할 텍스트 추출
-        texts = []
-        for chunk in chunks:
-            # content를 기본으로, 추가 컨텍스트 포함
-            text = chunk['content']
-
-            # 메타데이터를 텍스트에 추가 (검색 성능 향상)
-            if chunk.get('category'):
-                text = f"[{chunk['category']}] {text}"
-
-            if chunk.get('keywords'):
-                keywords_str = ", ".join(chunk['keywords'][:3])  # 상위 3개 키워드만
-                if keywords_str:
-                    text = f"{text}\n키워드: {keywords_str}"
-
-            texts.append(text)
-
         # 임베딩 생성
         print(f"\n임베딩 생성 중... (배치 크기: {self.batch_size})")
-        # 최대 시퀀스 길이 제한 (메모리 절약)
-        self.model.max_seq_length = 512  # KURE 모델 최대 길이
-
-        embeddings = self.model.encode(
-            texts,
-            batch_size=self.batch_size,
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            normalize_embeddings=False
-        )
+        embeddings = self.encode_texts([self.build_text(chunk) for chunk in chunks],
+                                       show_progress_bar=True)
 
         print(f"임베딩 생성 완료: {embeddings.shape}")
 
+        self.save_embeddings(chunks, embeddings, output_dir)
+
+        return chunks, embeddings
+
+    @timed()
+    def save_embeddings(self, chunks: List[Dict], embeddings: np.ndarray, output_dir: Path):
+        """임베딩 포함 청크, numpy 배열, 메타데이터 저장"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+
         # 청크에 임베딩 추가
         for i, chunk in enumerate(chunks):
             chunk['embedding'] = embeddings[i].tolist()
@@ -81,7 +94,8 @@ class DocumentEmbedder:
         metadata = {
             "total_chunks": len(chunks),
             "embedding_dim": embeddings.shape[1],
-            "model_name": self.model._modules['0'].auto_model.config._name_or_path,
+            "model_name": self.model_name,
+            "backend": self.backend_name,
             "batch_size": self.batch_size
         }
 
@@ -93,15 +107,13 @@ class DocumentEmbedder:
         print(f"총 청크 수: {metadata['total_chunks']}")
         print(f"임베딩 차원: {metadata['embedding_dim']}")
 
-        return chunks, embeddings
-
     def test_similarity(self, chunks: List[Dict], embeddings: np.ndarray, query: str, top_k: int = 5):
         """테스트: 쿼리와 유사한 청크 검색"""
         print(f"\n=== 유사도 테스트 ===")
         print(f"쿼리: {query}")
 
         # 쿼리 임베딩
-        query_embedding = self.model.encode([query], convert_to_numpy=True)[0]
+        query_embedding = self.encode_texts([query])[0]
 
         # 코사인 유사도 계산
         similarities = np.dot(embeddings, query_embedding) / (
@@ -0,0 +1,372 @@
+"""
+임베딩 모델 백엔드 (PyTorch / PyTorch 동적 int8 / ONNX Runtime)
+
+DocumentEmbedder(색인)와 EmbeddingTester(쿼리)는 모델을 직접 부르지 않고 이 모듈의 백엔드를 씁니다.
+모든 백엔드는 같은 인터페이스 encode(texts, batch_size, show_progress_bar) -> float32 배열을 가집니다.
+
+    torch        SentenceTransformer (기존 동작, 기본값)
+    torch-int8   SentenceTransformer + torch 동적 int8 양자화 (Linear 층, CPU)
+    onnx         로컬 캐시 모델을 ONNX로 한 번 내보내 ONNX Runtime으로 추론
+    onnx-int8    위 ONNX 모델의 동적 int8 양자화본
+
+ONNX 내보내기는 로컬에 저장된 모델만 사용하고(local_files_only), 토크나이저와 풀링 설정을
+내보낸 디렉토리에 함께 저장하므로 이후 추론은 오프라인에서 torch 없이 동작합니다.
+
+int8 백엔드는 결과 벡터가 조금 달라지므로 바꾸기 전에 compare로 코사인 차이와 처리량을 확인합니다.
+
+사용법:
+    python embedding_backend.py export --model nlpai-lab/KURE-v1            # ONNX + int8 내보내기
+    python embedding_backend.py compare --backends torch torch-int8 onnx onnx-int8 --limit 256
+    python pipeline.py --backend onnx-int8
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+DEFAULT_EXPORT_DIR = Path(__file__).parent.parent / "data" / "models" / "onnx"
+DEFAULT_MAX_SEQ_LENGTH = 512
+# compare 기본 허용치: 기준 백엔드 대비 1 - 코사인 유사도의 최댓값
+DEFAULT_MAX_DRIFT = 0.02
+
+
+class EmbeddingBackend(ABC):
+    """임베딩 백엔드 인터페이스"""
+
+    name = "base"
+
+    def __init__(self, model_name: str, max_seq_length: int = DEFAULT_MAX_SEQ_LENGTH):
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        """텍스트 목록 → float32 [len(texts), dim]"""
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """임베딩 차원"""
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """SentenceTransformer (PyTorch)"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str, max_seq_length: int = DEFAULT_MAX_SEQ_LENGTH, device: Optional[str] = None):
+        super().__init__(model_name, max_seq_length)
+        self.device = device
+        self._model = None
+
+    def _load(self):
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(self.model_name, device=self.device)
+
+    @property
+    def model(self):
+        """모델 (첫 사용 시 로딩, torch/transformers import 포함)"""
+        if self._model is None:
+            print(f"임베딩 모델 로딩 중: {self.model_name} ({self.name})")
+            self._model = self._load()
+            self._model.max_seq_length = self.max_seq_length
+            print(f"모델 로딩 완료 (차원: {self._model.get_sentence_embedding_dimension()})")
+        return self._model
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=show_progress_bar,
+            convert_to_numpy=True,
+            normalize_embeddings=False
+        ).astype(np.float32, copy=False)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+
+class TorchInt8Backend(SentenceTransformerBackend):
+    """SentenceTransformer + torch 동적 int8 양자화 (CPU 전용)"""
+
+    name = "torch-int8"
+
+    def _load(self):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(self.model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_dir_for(model_name: str, export_root: Path = DEFAULT_EXPORT_DIR) -> Path:
+    return Path(export_root) / model_name.replace("/", "__")
+
+
+def export_onnx(model_name: str, export_root: Path = DEFAULT_EXPORT_DIR, quantize: bool = True,
+                opset: int = 17) -> Path:
+    """로컬에 저장된 SentenceTransformer 모델을 ONNX로 내보내기
+
+    transformer 본체만 ONNX로 내보내고, 풀링(CLS/평균/최대)과 정규화 설정은 backend_config.json에
+    기록해 추론 시 numpy로 적용합니다.
+
+    Returns:
+        내보낸 디렉토리 (model.onnx, model.int8.onnx, 토크나이저, backend_config.json)
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+
+    output_dir = export_dir_for(model_name, export_root)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"ONNX 내보내기: {model_name} → {output_dir}")
+    model = SentenceTransformer(model_name, device="cpu", local_files_only=True)
+    transformer, pooling = model[0], model[1]
+    pooling_config = pooling.get_config_dict()
+
+    dummy = transformer.tokenizer(["근로계약서 예시 문장입니다."], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    auto_model = transformer.auto_model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            auto_model,
+            tuple(dummy[name] for name in input_names),
+            str(output_dir / "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    transformer.tokenizer.save_pretrained(str(output_dir))
+
+    config = {
+        "source_model": model_name,
+        "input_names": input_names,
+        "max_seq_length": model.max_seq_length,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "pooling": ("cls" if pooling_config.get("pooling_mode_cls_token")
+                    else "max" if pooling_config.get("pooling_mode_max_tokens") else "mean"),
+        "normalize": any(isinstance(module, Normalize) for module in model),
+    }
+    with open(output_dir / "backend_config.json", 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print("ONNX 동적 int8 양자화...")
+        quantize_dynamic(str(output_dir / "model.onnx"), str(output_dir / "model.int8.onnx"),
+                         weight_type=QuantType.QInt8, use_external_data_format=True)
+
+    print(f"내보내기 완료: {output_dir}")
+    return output_dir
+
+
+class ONNXBackend(EmbeddingBackend):
+    """ONNX Runtime 추론 (export_onnx로 내보낸 모델, torch 불필요)"""
+
+    name = "onnx"
+    model_file = "model.onnx"
+
+    def __init__(self, model_name: str, max_seq_length: int = DEFAULT_MAX_SEQ_LENGTH,
+                 export_root: Path = DEFAULT_EXPORT_DIR, threads: Optional[int] = None):
+        super().__init__(model_name, max_seq_length)
+        self.export_dir = export_dir_for(model_name, export_root)
+        self.threads = threads
+        self._session = None
+
+    def _load(self):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = self.export_dir / self.model_file
+        if not model_path.exists():
+            raise FileNotFoundError(f"{model_path} 없음 (python embedding_backend.py export --model {self.model_name})")
+
+        with open(self.export_dir / "backend_config.json", 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.export_dir), local_files_only=True)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        print(f"ONNX 모델 로딩: {model_path}")
+        return ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self._load()
+        return self._session
+
+    def _pool(self, hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if self.config["pooling"] == "cls":
+            pooled = hidden[:, 0]
+        elif self.config["pooling"] == "max":
+            pooled = np.where(mask[:, :, None] > 0, hidden, -np.inf).max(axis=1)
+        else:
+            weights = mask[:, :, None].astype(np.float32)
+            pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        if self.config["normalize"]:
+            pooled = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32, copy=False)
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        session = self.session
+        max_length = min(self.max_seq_length, self.config["max_seq_length"])
+
+        # 길이순으로 묶어 패딩을 줄이고 결과는 원래 순서로 되돌림
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        output = np.zeros((len(texts), self.config["dimension"]), dtype=np.float32)
+
+        batches = range(0, len(texts), batch_size)
+        if show_progress_bar:
+            from tqdm import tqdm
+            batches = tqdm(batches, desc=f"encode ({self.name})")
+        for start in batches:
+            index = order[start:start + batch_size]
+            encoded = self.tokenizer([texts[i] for i in index], padding=True, truncation=True,
+                                     max_length=max_length, return_tensors="np")
+            feeds = {name: encoded[name].astype(np.int64) for name in self.config["input_names"]}
+            hidden = session.run(["last_hidden_state"], feeds)[0]
+            output[index] = self._pool(hidden, encoded["attention_mask"])
+        return output
+
+    @property
+    def dimension(self) -> int:
+        self.session
+        return self.config["dimension"]
+
+
+class ONNXInt8Backend(ONNXBackend):
+    """ONNX Runtime + 동적 int8 양자화 모델"""
+
+    name = "onnx-int8"
+    model_file = "model.int8.onnx"
+
+
+BACKENDS = {
+    "torch": SentenceTransformerBackend,
+    "torch-int8": TorchInt8Backend,
+    "onnx": ONNXBackend,
+    "onnx-int8": ONNXInt8Backend,
+}
+
+
+def create_backend(name: str, model_name: str, **kwargs) -> EmbeddingBackend:
+    """이름으로 백엔드 생성"""
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 백엔드: {name} ({', '.join(BACKENDS)})")
+    return BACKENDS[name](model_name, **kwargs)
+
+
+def compare_backends(texts: List[str], model_name: str, backends: List[str], batch_size: int = 32,
+                     repeat: int = 1) -> Dict[str, Dict]:
+    """첫 백엔드를 기준으로 코사인 차이와 처리량 비교
+
+    Returns:
+        {백엔드: {"texts_per_sec", "load_sec", "mean_cosine", "min_cosine", "max_drift"}}
+    """
+    results = {}
+    reference = None
+    for name in backends:
+        backend = create_backend(name, model_name)
+
+        start = time.perf_counter()
+        backend.encode(texts[:1], batch_size=batch_size)  # 로딩 + 예열
+        load_sec = time.perf_counter() - start
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            vectors = backend.encode(texts, batch_size=batch_size)
+            timings.append(time.perf_counter() - start)
+
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        if reference is None:
+            reference = vectors
+        cosine = np.sum(vectors * reference, axis=1)
+        results[name] = {
+            "texts_per_sec": len(texts) / min(timings),
+            "load_sec": load_sec,
+            "mean_cosine": float(cosine.mean()),
+            "min_cosine": float(cosine.min()),
+            "max_drift": float(1.0 - cosine.min()),
+        }
+        del backend
+    return results
+
+
+def print_comparison(results: Dict[str, Dict], max_drift: float):
+    print("\n" + "=" * 72)
+    print(f"임베딩 백엔드 비교 (기준: {next(iter(results))})")
+    print("=" * 72)
+    print(f"{'백엔드':<14}{'텍스트/초':>11}{'배속':>8}{'로딩(초)':>10}{'평균 cos':>11}{'최소 cos':>11}{'판정':>7}")
+    print("-" * 72)
+    base = next(iter(results.values()))["texts_per_sec"]
+    for name, r in results.items():
+        verdict = "OK" if r["max_drift"] <= max_drift else "초과"
+        print(f"{name:<14}{r['texts_per_sec']:>11.1f}{r['texts_per_sec'] / base:>7.2f}x{r['load_sec']:>10.1f}"
+              f"{r['mean_cosine']:>11.4f}{r['min_cosine']:>11.4f}{verdict:>7}")
+    print("=" * 72)
+    print(f"허용 코사인 차이(1 - cos): {max_drift}")
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 내보내기/비교")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="로컬 모델을 ONNX(+int8)로 내보내기")
+    export_parser.add_argument("--model", default="nlpai-lab/KURE-v1")
+    export_parser.add_argument("--export-dir", type=Path, default=DEFAULT_EXPORT_DIR)
+    export_parser.add_argument("--no-quantize", action="store_true", help="int8 양자화본 생성 안 함")
+
+    compare_parser = subparsers.add_parser("compare", help="코사인 차이와 처리량 비교 (첫 백엔드가 기준)")
+    compare_parser.add_argument("--model", default="nlpai-lab/KURE-v1")
+    compare_parser.add_argument("--backends", nargs="+", default=["torch", "onnx-int8"], choices=list(BACKENDS))
+    compare_parser.add_argument("--chunks", type=Path,
+                                default=Path(__file__).parent.parent / "data" / "processed" / "chunks" / "all_chunks.json")
+    compare_parser.add_argument("--limit", type=int, default=256, help="비교에 쓸 청크 수")
+    compare_parser.add_argument("--batch-size", type=int, default=32)
+    compare_parser.add_argument("--repeat", type=int, default=1)
+    compare_parser.add_argument("--max-drift", type=float, default=DEFAULT_MAX_DRIFT,
+                                help="허용 1 - cos 최댓값 (넘으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_onnx(args.model, args.export_dir, quantize=not args.no_quantize)
+        return
+
+    from chunk_store import iter_chunks
+    from embedder import DocumentEmbedder
+
+    texts = []
+    for chunk in iter_chunks(args.chunks):
+        texts.append(DocumentEmbedder.build_text(chunk))
+        if len(texts) >= args.limit:
+            break
+    print(f"비교 텍스트: {len(texts)}개")
+
+    results = compare_backends(texts, args.model, args.backends, args.batch_size, args.repeat)
+    print_comparison(results, args.max_drift)
+    if any(r["max_drift"] > args.max_drift for r in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,250 @@
+"""
+표준근로계약서 청크에서 계약 유형별 필수 필드 체크리스트 추출
+
+필드별 설명/규정은 FIELD_RULES 표로 정의하고, 표의 섹션 키워드를 하나의 정규식으로
+컴파일한 FieldRuleMatcher가 섹션 제목을 한 번 훑어 적용할 규칙을 찾습니다.
+청크 파일은 chunk_store.iter_chunks로 스트리밍해 읽으며, 결과는 RequiredFieldIndex로
+contract_type/field_key 기준 O(1) 조회할 수 있습니다.
+"""
+
 import json
-from pathlib import Path
-from typing import List, Dict
+import os
 import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from chunk_store import iter_chunks
 
-def extract_required_fields(chunks_file: Path) -> Dict:
-    """standard_contract 청크에서 contract_type별 필수 필드 추출"""
 
-    with open(chunks_file, 'r', encoding='utf-8') as f:
-        chunks = json.load(f)
+DEFAULT_FIELDS_FILE = Path(__file__).parent.parent / "data" / "processed" / "required_contract_fields.json"
+
+# 필드 규칙 (위에서부터 먼저 맞는 규칙 하나만 적용)
+#   key: 필드 식별자 (계약 유형과 무관하게 같은 항목이면 같은 key)
+#   sections: 섹션 제목에 포함되면 적용할 키워드
+#   content: 지정하면 조항 내용에도 이 중 하나가 있어야 적용
+#   description/regulation: 필드 설명, 관련 규정
+#   by_contract_type: contract_type에 키가 포함되면 덮어쓸 값
+FIELD_RULES = [
+    {
+        "key": "근로계약기간",
+        "sections": ["근로개시일", "근로계약기간"],
+        "description": "근로 시작일 또는 계약 기간 명시 필요",
+        "by_contract_type": {"기간제": {"regulation": "계약 시작일과 종료일 명확히 기재"}},
+    },
+    {
+        "key": "근무장소",
+        "sections": ["근무장소"],
+        "description": "실제 근무할 장소 주소 기재",
+    },
+    {
+        "key": "근로시간",
+        "sections": ["근로시간"],
+        "description": "1일 소정근로시간 명시 (휴게시간 제외)",
+        "regulation": "1일 8시간, 주 40시간이 법정 기준",
+        "by_contract_type": {"단시간": {"regulation": "주 15시간 이상 시 주휴수당 발생"}},
+    },
+    {
+        "key": "근무일및휴일",
+        "sections": ["근무일", "휴일", "근로일"],
+        "description": "주 근무일 및 휴일 명시",
+        "by_contract_type": {"단시간": {"regulation": "근로일별 상세 시간표 작성 필요"}},
+    },
+    {
+        "key": "임금",
+        "sections": ["임금", "급여"],
+        "description": "임금 구성항목, 계산방법, 지급방법 명시",
+        "regulation": "2025년 최저임금: 시급 10,030원",
+    },
+    {
+        "key": "연차유급휴가",
+        "sections": ["연차"],
+        "description": "연차유급휴가 일수 명시",
+        "regulation": "1년 근무 시 15일 부여",
+    },
+    {
+        "key": "사회보험",
+        "sections": ["사회보험"],
+        "description": "4대보험 적용여부 명시",
+        "regulation": "고용보험, 산재보험, 국민연금, 건강보험",
+    },
+    {
+        "key": "근로계약서교부",
+        "sections": ["근로계약서"],
+        "content": ["교부"],
+        "description": "근로계약서 서면 교부 의무",
+        "regulation": "근로기준법 제17조",
+    },
+    {
+        "key": "친권자동의",
+        "sections": ["친권자", "후견인"],
+        "description": "18세 미만 근로자의 친권자 또는 후견인 동의 필요",
+        "regulation": "근로기준법 제66조",
+    },
+]
+
+
+class FieldRuleMatcher:
+    """FIELD_RULES를 컴파일한 단일 패스 매처
+
+    모든 섹션 키워드를 겹치는 위치까지 찾는 정규식 하나로 묶어 섹션 제목을 한 번만 훑고,
+    찾은 키워드에 연결된 규칙 중 표에서 가장 앞선 규칙을 반환합니다.
+    """
+
+    def __init__(self, rules: List[Dict]):
+        self.rules = rules
+
+        # 키워드 → 규칙 번호 (다른 키워드의 접두어인 키워드도 함께 연결)
+        keywords = {kw for rule in rules for kw in rule["sections"]}
+        self._keyword_rules: Dict[str, List[int]] = {}
+        for keyword in keywords:
+            self._keyword_rules[keyword] = sorted(
+                i for i, rule in enumerate(rules)
+                if any(keyword.startswith(kw) for kw in rule["sections"])
+            )
+
+        alternatives = "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternatives}))")
+
+    def match(self, section: str, content: str = "") -> Optional[Dict]:
+        """섹션 제목(과 내용)에 맞는 첫 번째 규칙 (없으면 None)"""
+        candidates = set()
+        for keyword in self._pattern.findall(section):
+            candidates.update(self._keyword_rules[keyword])
+
+        for i in sorted(candidates):
+            rule = self.rules[i]
+            if rule.get("content") and not any(term in content for term in rule["content"]):
+                continue
+            return rule
+        return None
 
-    # standard_contract 청크만 필터링
-    contract_chunks = [c for c in chunks if c.get('doc_type') == 'standard_contract']
+    def describe(self, section: str, content: str, contract_type: str) -> Tuple[Optional[str], str, Optional[str]]:
+        """(field_key, description, regulation)"""
+        rule = self.match(section, content)
+        if rule is None:
+            return None, "", None
 
-    print(f"총 standard_contract 청크: {len(contract_chunks)}개")
+        description = rule.get("description", "")
+        regulation = rule.get("regulation")
+        for type_keyword, override in rule.get("by_contract_type", {}).items():
+            if type_keyword in contract_type:
+                description = override.get("description", description)
+                regulation = override.get("regulation", regulation)
+        return rule["key"], description, regulation
 
-    # contract_type별로 그룹화
+
+FIELD_MATCHER = FieldRuleMatcher(FIELD_RULES)
+
+
+def extract_required_fields(chunks_file: Path) -> Dict:
+    """standard_contract 청크에서 contract_type별 필수 필드 추출 (청크 파일 스트리밍)"""
+    return extract_fields_from_chunks(iter_chunks(chunks_file, doc_type='standard_contract'))
+
+
+def extract_fields_from_chunks(chunks: Iterable[Dict]) -> Dict:
+    """청크에서 contract_type별 필수 필드 추출 (standard_contract 외 청크는 무시)"""
     fields_by_type = {}
+    contract_chunk_count = 0
 
-    for chunk in contract_chunks:
-        contract_type = chunk.get('contract_type', 'unknown')
-        section = chunk.get('section', '')
-        content = chunk.get('content', '')
-        is_mandatory = chunk.get('is_mandatory', False)
-        clause_number = chunk.get('clause_number')
+    for chunk in chunks:
+        if chunk.get('doc_type') != 'standard_contract':
+            continue
+        contract_chunk_count += 1
 
+        section = chunk.get('section', '')
         # 헤더는 제외
         if section == "헤더":
             continue
 
-        # contract_type별 리스트 초기화
-        if contract_type not in fields_by_type:
-            fields_by_type[contract_type] = []
+        contract_type = chunk.get('contract_type', 'unknown')
+        content = chunk.get('content', '')
+        field_key, description, regulation = FIELD_MATCHER.describe(section, content, contract_type)
 
         # 필드 정보 구성
         field_info = {
             "field_name": section.strip(),
-            "clause_number": clause_number,
-            "required": is_mandatory,
+            "field_key": field_key,
+            "clause_number": chunk.get('clause_number'),
+            "required": chunk.get('is_mandatory', False),
             "template": content.strip(),
-            "description": ""
+            "description": description
         }
+        if regulation:
+            field_info["regulation"] = regulation
 
-        # 필드별 설명 추가
-        if "근로개시일" in section or "근로계약기간" in section:
-            field_info["description"] = "근로 시작일 또는 계약 기간 명시 필요"
-            if "기간제" in contract_type:
-                field_info["regulation"] = "계약 시작일과 종료일 명확히 기재"
-        elif "근무장소" in section:
-            field_info["description"] = "실제 근무할 장소 주소 기재"
-        elif "근로시간" in section:
-            field_info["description"] = "1일 소정근로시간 명시 (휴게시간 제외)"
-            field_info["regulation"] = "1일 8시간, 주 40시간이 법정 기준"
-            if "단시간" in contract_type:
-                field_info["regulation"] = "주 15시간 이상 시 주휴수당 발생"
-        elif "근무일" in section or "휴일" in section or "근로일" in section:
-            field_info["description"] = "주 근무일 및 휴일 명시"
-            if "단시간" in contract_type:
-                field_info["regulation"] = "근로일별 상세 시간표 작성 필요"
-        elif "임금" in section or "급여" in section:
-            field_info["description"] = "임금 구성항목, 계산방법, 지급방법 명시"
-            field_info["regulation"] = "2025년 최저임금: 시급 10,030원"
-        elif "연차" in section:
-            field_info["description"] = "연차유급휴가 일수 명시"
-            field_info["regulation"] = "1년 근무 시 15일 부여"
-        elif "사회보험" in section:
-            field_info["description"] = "4대보험 적용여부 명시"
-            field_info["regulation"] = "고용보험, 산재보험, 국민연금, 건강보험"
-        elif "근로계약서" in section and "교부" in content:
-            field_info["description"] = "근로계약서 서면 교부 의무"
-            field_info["regulation"] = "근로기준법 제17조"
-        elif "친권자" in section or "후견인" in section:
-            field_info["description"] = "18세 미만 근로자의 친권자 또는 후견인 동의 필요"
-            field_info["regulation"] = "근로기준법 제66조"
-
-        fields_by_type[contract_type].append(field_info)
+        fields_by_type.setdefault(contract_type, []).append(field_info)
 
+    print(f"총 standard_contract 청크: {contract_chunk_count}개")
     return fields_by_type
 
 
+class RequiredFieldIndex:
+    """contract_type별 필수 필드 색인
+
+    체크리스트를 한 번 읽어 contract_type → field_key → 필드 사전을 만들어 두고,
+    분석할 때마다 목록을 다시 만들지 않고 바로 조회합니다.
+    """
+
+    def __init__(self, contract_types: Dict[str, List[Dict]]):
+        self._fields = contract_types
+        self._by_key: Dict[str, Dict[str, Dict]] = {}
+
+        for contract_type, fields in contract_types.items():
+            index = self._by_key[contract_type] = {}
+            for field in fields:
+                # 이전 버전 체크리스트(field_key 없음)는 규칙으로 key 부여
+                if "field_key" not in field:
+                    field["field_key"] = FIELD_MATCHER.describe(
+                        field["field_name"], field.get("template", ""), contract_type)[0]
+                index.setdefault(field["field_key"] or field["field_name"], field)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RequiredFieldIndex":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["contract_types"])
+
+    def contract_types(self) -> List[str]:
+        return list(self._fields)
+
+    def fields(self, contract_type: str) -> List[Dict]:
+        """계약 유형의 필수 필드 목록 (없는 유형이면 빈 목록)"""
+        return self._fields.get(contract_type, [])
+
+    def get(self, contract_type: str, field_key: str) -> Optional[Dict]:
+        """계약 유형의 특정 필드 (field_key 또는 field_name)"""
+        return self._by_key.get(contract_type, {}).get(field_key)
+
+    def keys(self, contract_type: str) -> List[str]:
+        return list(self._by_key.get(contract_type, {}))
+
+
+_index_cache: Dict[str, Tuple[int, RequiredFieldIndex]] = {}
+
+
+def load_field_index(path: Path = DEFAULT_FIELDS_FILE) -> RequiredFieldIndex:
+    """필수 필드 색인 로딩 (파일이 바뀌지 않았으면 이전에 만든 색인 재사용)"""
+    path = Path(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _index_cache.get(str(path))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    index = RequiredFieldIndex.from_file(path)
+    _index_cache[str(path)] = (mtime, index)
+    return index
+
+
+def build_contract_requirements(fields_by_type: Dict) -> Dict:
+    """저장용 체크리스트 구조 생성"""
+    return {
+        "document_type": "standard_employment_contract",
+        "description": "표준 근로계약서 필수 항목 체크리스트 (계약 유형별)",
+        "total_types": len(fields_by_type),
+        "total_fields": sum(len(fields) for fields in fields_by_type.values()),
+        "contract_types": fields_by_type
+    }
+
+
 def main():
     project_root = Path(__file__).parent.parent.parent
     chunks_file = project_root / "ai/data/processed/chunks/all_chunks.json"
@@ -93,13 +259,7 @@ def main():
     total_fields = sum(len(fields) for fields in fields_by_type.values())
 
     # 최종 구조
-    contract_requirements = {
-        "document_type": "standard_employment_contract",
-        "description": "표준 근로계약서 필수 항목 체크리스트 (계약 유형별)",
-        "total_types": len(fields_by_type),
-        "total_fields": total_fields,
-        "contract_types": fields_by_type
-    }
+    contract_requirements = build_contract_requirements(fields_by_type)
 
     # 저장
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,503 @@
+"""
+계약서 분석 작업 큐 (SQLite, 로컬 워커 풀)
+
+업로드된 계약서를 작업으로 등록하면 워커 풀이 추출 → 조항 분할 → 관련 규정 검색 → 검증
+단계를 백그라운드에서 실행합니다. 별도 브로커 없이 SQLite 파일 하나로 동작합니다.
+
+- 같은 내용의 파일(SHA-256)은 다시 등록해도 기존 작업을 돌려줌 (실패한 작업만 재등록)
+- 작은 파일부터 처리해 대기 시간을 줄이고, 오래 기다린 작업은 우선순위를 올려 밀리지 않게 함
+- 작업별 상태(queued/running/ocr_pending/done/failed), 현재 단계, 진행률 조회
+- 스캔 페이지가 있는 PDF는 OCR을 등록만 하고 워커를 놓아 줌 (ocr_pending). OCR이 끝나면
+  워커가 새 작업보다 먼저 이어서 처리하므로 텍스트 PDF가 OCR 뒤에 밀리지 않음
+- 워커가 비정상 종료해 running/ocr_pending으로 남은 작업은 다음 시작 시 다시 대기열로
+
+사용법:
+    python job_queue.py submit contract1.pdf contract2.pdf
+    python job_queue.py work --workers 4 --embeddings-dir ../data/processed/embeddings
+    python job_queue.py status
+    python job_queue.py status 3
+"""
+
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from contract_terms import ContractTermExtractor, check_compliance, compliance_records
+from contract_validator import ContractValidator, split_clauses
+from ocr import OCRPool
+from pdf_extractor import PDFExtractor
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "processed" / "jobs" / "jobs.db"
+
+# 작업 단계 (이름, 설명)
+JOB_STAGES = [
+    ("extract", "텍스트 추출"),
+    ("chunk", "조항 분할"),
+    ("retrieve", "관련 규정 검색"),
+    ("validate", "필수 필드 및 법정 기준 검증"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash  TEXT NOT NULL UNIQUE,
+    filename      TEXT NOT NULL,
+    path          TEXT NOT NULL,
+    size_bytes    INTEGER NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'queued',
+    stage         TEXT,
+    progress      REAL NOT NULL DEFAULT 0,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    result        TEXT,
+    error         TEXT,
+    created_at    REAL NOT NULL,
+    started_at    REAL,
+    finished_at   REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, size_bytes);
+"""
+
+
+def sha256_file(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class JobQueue:
+    """SQLite 작업 큐 (스레드마다 별도 연결)"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, aging_bytes_per_sec: float = 64 * 1024):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            aging_bytes_per_sec: 대기 1초당 깎아 주는 파일 크기 (큰 파일이 무한정 밀리지 않도록)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.aging_bytes_per_sec = aging_bytes_per_sec
+        self._local = threading.local()
+
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, path: Path) -> Tuple[int, bool]:
+        """파일을 작업으로 등록
+
+        Returns:
+            (작업 id, 새로 등록했는지). 같은 내용의 작업이 있으면 그 작업 id
+        """
+        path = Path(path).resolve()
+        content_hash = sha256_file(path)
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT id, status FROM jobs WHERE content_hash = ?",
+                               (content_hash,)).fetchone()
+            if row is None:
+                cursor = conn.execute(
+                    "INSERT INTO jobs (content_hash, filename, path, size_bytes, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, path.name, str(path), path.stat().st_size, time.time()))
+                job_id, created = cursor.lastrowid, True
+            elif row["status"] == "failed":
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', stage = NULL, progress = 0, error = NULL, "
+                    "path = ?, created_at = ? WHERE id = ?", (str(path), time.time(), row["id"]))
+                job_id, created = row["id"], True
+            else:
+                job_id, created = row["id"], False
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return job_id, created
+
+    def claim(self) -> Optional[Dict]:
+        """대기 중인 작업 하나를 running으로 가져오기 (작은 파일 우선, 대기 시간만큼 가산)"""
+        conn = self._conn()
+        now = time.time()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' "
+                "ORDER BY size_bytes - (? - created_at) * ?, id LIMIT 1",
+                (now, self.aging_bytes_per_sec)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (now, row["id"]))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return dict(row)
+
+    def set_status(self, job_id: int, status: str):
+        self._conn().execute("UPDATE jobs SET status = ? WHERE id = ?", (status, job_id))
+
+    def update_progress(self, job_id: int, stage: str, progress: float):
+        self._conn().execute("UPDATE jobs SET stage = ?, progress = ? WHERE id = ?",
+                             (stage, progress, job_id))
+
+    def complete(self, job_id: int, result: Dict):
+        self._conn().execute(
+            "UPDATE jobs SET status = 'done', progress = 1, result = ?, finished_at = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), job_id))
+
+    def fail(self, job_id: int, error: str):
+        self._conn().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+            (error, time.time(), job_id))
+
+    def requeue_running(self) -> int:
+        """running/ocr_pending으로 남은 작업(이전 워커 비정상 종료)을 대기열로 되돌림"""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = 'queued', stage = NULL, progress = 0 "
+            "WHERE status IN ('running', 'ocr_pending')")
+        return cursor.rowcount
+
+    def status(self, job_id: int) -> Optional[Dict]:
+        """작업 상태 (완료된 작업은 result 포함)"""
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """작업 목록 (결과 본문 제외, 최근 등록 순)"""
+        query = ("SELECT id, filename, size_bytes, status, stage, progress, attempts, error, "
+                 "created_at, started_at, finished_at FROM jobs")
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY id DESC LIMIT ?"
+        return [dict(row) for row in self._conn().execute(query, params + (limit,))]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+
+
+class EmbeddingRetriever:
+    """EmbeddingTester 기반 조항별 관련 규정 검색 (조항 쿼리는 한 번에 임베딩)"""
+
+    def __init__(self, tester, top_k: int = 3, max_query_chars: int = 300):
+        self.tester = tester
+        self.top_k = top_k
+        self.max_query_chars = max_query_chars
+        self._lock = threading.Lock()
+
+    def __call__(self, clauses: List[Dict]) -> List[List[Dict]]:
+        if not clauses:
+            return []
+        queries = [clause["content"][:self.max_query_chars] for clause in clauses]
+        # 모델 호출은 워커 간 직렬화 (모델 하나를 공유)
+        with self._lock:
+            embeddings = self.tester.encode_queries(queries)
+
+        related = []
+        for embedding in embeddings:
+            results = self.tester.search_by_embedding(embedding, top_k=self.top_k)
+            related.append([{
+                "chunk_id": result["chunk"].get("chunk_id"),
+                "source": result["chunk"].get("source"),
+                "category": result["chunk"].get("category"),
+                "similarity": round(result["similarity"], 4),
+            } for result in results])
+        return related
+
+
+class AnalysisWorkerPool:
+    """작업 큐를 소비하는 로컬 워커 스레드 풀"""
+
+    def __init__(self, job_queue: JobQueue, workers: int = 2,
+                 validator: Optional[ContractValidator] = None,
+                 retriever: Optional[Callable[[List[Dict]], List[List[Dict]]]] = None,
+                 poll_interval: float = 0.5, ocr: Optional[OCRPool] = None):
+        """
+        Args:
+            job_queue: 작업 큐
+            workers: 워커 스레드 수
+            validator: 필수 필드 검증기 (기본: required_contract_fields.json)
+            retriever: 조항 목록 → 조항별 관련 규정 목록 (없으면 검색 단계 생략)
+            poll_interval: 대기열이 비었을 때 다시 확인하는 간격 (초)
+            ocr: 스캔 PDF용 OCR 풀 (워커 스레드와 별도로 동시 실행 수가 제한됨)
+        """
+        self.queue = job_queue
+        self.workers = workers
+        self.validator = validator or ContractValidator()
+        self.term_extractor = ContractTermExtractor()
+        self.retriever = retriever
+        self.poll_interval = poll_interval
+        self.extractor = PDFExtractor(input_dir=str(job_queue.db_path.parent),
+                                      output_dir=str(job_queue.db_path.parent / "extracted"), ocr=ocr)
+
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._exit_when_idle = False
+        # OCR이 끝나 이어서 처리할 작업 (작업, PDF 경로, 페이지 텍스트, OCR future)
+        self._ocr_ready: "queue.Queue[Tuple[Dict, Path, List[str], Dict]]" = queue.Queue()
+        self._ocr_waiting = 0
+        self._ocr_lock = threading.Lock()
+
+    def start(self):
+        requeued = self.queue.requeue_running()
+        if requeued:
+            print(f"중단된 작업 {requeued}개를 대기열로 되돌림")
+
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def run_until_empty(self):
+        """대기열이 빌 때까지 처리하고 종료 (일괄 처리용)"""
+        self._exit_when_idle = True
+        self.start()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            # OCR이 끝난 작업을 새 작업보다 먼저 이어서 처리
+            try:
+                job, path, pages, futures = self._ocr_ready.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                with self._ocr_lock:
+                    self._ocr_waiting -= 1
+                self._run(job, lambda: self._resume_ocr(job, path, pages, futures))
+                continue
+
+            job = self.queue.claim()
+            if job is None:
+                with self._ocr_lock:
+                    waiting = self._ocr_waiting
+                if self._exit_when_idle and not waiting:
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+
+            self._run(job, lambda: self._process(job))
+
+    def _run(self, job: Dict, work: Callable[[], Optional[Dict]]):
+        """작업 실행 후 완료/실패 기록 (None이면 OCR 대기로 넘긴 것)"""
+        try:
+            result = work()
+        except Exception as e:
+            self.queue.fail(job["id"], f"{type(e).__name__}: {e}")
+            print(f"작업 {job['id']} 실패 ({job['filename']}): {e}")
+        else:
+            if result is None:
+                return
+            self.queue.complete(job["id"], result)
+            print(f"작업 {job['id']} 완료 ({job['filename']}, {result['timings']['total_sec']:.2f}초)")
+
+    def _step(self, job: Dict, index: int, name: str) -> float:
+        self.queue.update_progress(job["id"], name, index / len(JOB_STAGES))
+        return time.perf_counter()
+
+    def _process(self, job: Dict) -> Optional[Dict]:
+        """추출 → 조항 분할 → 관련 규정 검색 → 검증 (스캔 PDF는 OCR 등록 후 None)"""
+        start = time.perf_counter()
+        stage_start = self._step(job, 0, "extract")
+        path = Path(job["path"])
+
+        if path.suffix.lower() != ".pdf":
+            text = self._read_text(path)
+        else:
+            pages, scanned = self.extractor.extract_pages(path)
+            futures = self.extractor.submit_ocr(path, scanned)
+            if futures:
+                self._park_for_ocr({**job, "start": start, "extract_sec": time.perf_counter() - stage_start},
+                                   path, pages, futures)
+                return None
+            text = self.extractor.join_pages(pages)
+
+        return self._analyze(job, text, {"extract_sec": time.perf_counter() - stage_start}, start)
+
+    def _park_for_ocr(self, job: Dict, path: Path, pages: List[str], futures: Dict):
+        """OCR이 모두 끝나면 완료 큐에 넣고 워커는 바로 다음 작업으로"""
+        job["parked_at"] = time.perf_counter()
+        self.queue.set_status(job["id"], "ocr_pending")
+        with self._ocr_lock:
+            self._ocr_waiting += 1
+
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def on_done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self._ocr_ready.put((job, path, pages, futures))
+
+        for future in futures.values():
+            future.add_done_callback(on_done)
+
+    def _resume_ocr(self, job: Dict, path: Path, pages: List[str], futures: Dict) -> Dict:
+        """OCR이 끝난 작업을 이어서 처리 (future는 모두 완료되어 기다리지 않음)"""
+        self.queue.set_status(job["id"], "running")
+        resume_start = time.perf_counter()
+        self.extractor.collect_ocr(path, pages, futures)
+        text = self.extractor.join_pages(pages)
+
+        timings = {
+            "extract_sec": job["extract_sec"] + time.perf_counter() - resume_start,
+            "ocr_wait_sec": resume_start - job["parked_at"],
+        }
+        return self._analyze(job, text, timings, job["start"])
+
+    def _analyze(self, job: Dict, text: str, timings: Dict, start: float) -> Dict:
+        """추출 이후 단계 (조항 분할 → 관련 규정 검색 → 검증), 전체 시간은 OCR 대기 포함"""
+        if not text:
+            raise ValueError("추출된 텍스트가 없습니다 (스캔 문서일 수 있음)")
+
+        stage_start = self._step(job, 1, "chunk")
+        clauses = [{"clause_number": number,
+                    "title": self.validator._extract_section_title(content),
+                    "content": content}
+                   for number, content in split_clauses(text)]
+        timings["chunk_sec"] = time.perf_counter() - stage_start
+
+        stage_start = self._step(job, 2, "retrieve")
+        if self.retriever is not None:
+            for clause, related in zip(clauses, self.retriever(clauses)):
+                clause["related"] = related
+        timings["retrieve_sec"] = time.perf_counter() - stage_start
+
+        stage_start = self._step(job, 3, "validate")
+        validation = self.validator.validate(text, contract_id=job["filename"])
+        columns = self.term_extractor.extract_batch([text])
+        compliance = compliance_records(columns, check_compliance(columns), [job["filename"]])[0]
+        timings["validate_sec"] = time.perf_counter() - stage_start
+        timings["total_sec"] = time.perf_counter() - start
+
+        return {
+            "filename": job["filename"],
+            "text_length": len(text),
+            "clauses": clauses,
+            "validation": validation,
+            "terms": compliance["terms"],
+            "violations": compliance["violations"],
+            "timings": timings,
+        }
+
+    @staticmethod
+    def _read_text(path: Path) -> str:
+        """이미 추출된 JSON/텍스트는 그대로 읽음"""
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix.lower() == ".json":
+                return json.load(f).get("text", "")
+            return f.read()
+
+
+def print_jobs(jobs: List[Dict], counts: Dict[str, int]):
+    print(f"작업 현황: " + ", ".join(f"{status} {count}개" for status, count in sorted(counts.items())))
+    print(f"{'id':>5}  {'상태':<8}{'단계':<10}{'진행률':>7}  {'크기':>10}  파일")
+    for job in jobs:
+        print(f"{job['id']:>5}  {job['status']:<8}{job['stage'] or '-':<10}{job['progress']:>7.0%}  "
+              f"{job['size_bytes']:>10,}  {job['filename']}")
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="계약서 분석 작업 큐")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="작업 큐 SQLite 파일")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="계약서 파일을 작업으로 등록")
+    submit_parser.add_argument("files", type=Path, nargs="+")
+
+    work_parser = subparsers.add_parser("work", help="워커 풀 실행")
+    work_parser.add_argument("--workers", type=int, default=2)
+    work_parser.add_argument("--fields", type=Path, default=None, help="필수 필드 체크리스트")
+    work_parser.add_argument("--embeddings-dir", type=Path, default=None,
+                             help="관련 규정 검색용 임베딩 디렉토리 (없으면 검색 단계 생략)")
+    work_parser.add_argument("--ocr-workers", type=int, default=1,
+                             help="스캔 페이지 OCR 동시 실행 수 (0이면 OCR 끔)")
+    work_parser.add_argument("--until-empty", action="store_true", help="대기열이 비면 종료")
+
+    status_parser = subparsers.add_parser("status", help="작업 상태 조회")
+    status_parser.add_argument("job_id", type=int, nargs="?")
+    status_parser.add_argument("--status", default=None, help="상태 필터 (queued, running, done, failed)")
+
+    args = parser.parse_args()
+    job_queue = JobQueue(args.db)
+
+    if args.command == "submit":
+        for path in args.files:
+            job_id, created = job_queue.submit(path)
+            print(f"{path.name}: 작업 {job_id} {'등록' if created else '(같은 내용의 작업이 이미 있음)'}")
+
+    elif args.command == "work":
+        validator = ContractValidator(fields_file=args.fields) if args.fields else None
+        retriever = None
+        if args.embeddings_dir:
+            from test_embeddings import EmbeddingTester
+            retriever = EmbeddingRetriever(EmbeddingTester(str(args.embeddings_dir)))
+
+        ocr = OCRPool(workers=args.ocr_workers)
+        pool = AnalysisWorkerPool(job_queue, workers=args.workers, validator=validator, retriever=retriever,
+                                  ocr=ocr)
+        if args.until_empty:
+            pool.run_until_empty()
+        else:
+            pool.start()
+            print(f"워커 {args.workers}개 실행 중 (Ctrl+C로 종료)")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pool.stop()
+        ocr.shutdown()
+        print_jobs(job_queue.list_jobs(limit=20), job_queue.counts())
+
+    else:
+        if args.job_id is not None:
+            job = job_queue.status(args.job_id)
+            print(json.dumps(job, ensure_ascii=False, indent=2) if job else f"작업 {args.job_id} 없음")
+        else:
+            print_jobs(job_queue.list_jobs(status=args.status), job_queue.counts())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+법률 문서(판례, 법령해석례 등) 청킹
+
+국가법령정보 Open API 본문 조회(lawService.do) 결과를 섹션 단위로 분할합니다.
+- 판례: 판시사항 / 판결요지 / 이유 (판례내용에서 【이유】 이후만 사용)
+- 법령해석례: 질의요지 / 회답 / 이유
+- 고용노동부 법령해설: 질의 / 회시
+- 노동위원회 판정례: 판정사항 / 판정요지 / 이유
+
+섹션이 길면 문단 경계에서 max_chars 이하로 나눕니다 (임베딩 모델 최대 512 토큰).
+"""
+
+import re
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from chunker import DocumentChunker
+from metrics import timed
+
+
+# 대상별 문서 정의
+#   doc_type: 청크 doc_type, title/number/date: 메타데이터 필드
+#   sections: (본문 필드, 섹션 이름, 섹션 시작 표시 정규식) 목록
+LEGAL_DOC_SPECS = {
+    "prec": {
+        "doc_type": "precedent",
+        "id_field": "판례일련번호",
+        "title": "사건명",
+        "number": "사건번호",
+        "date": "선고일자",
+        "sections": [
+            ("판시사항", "판시사항", None),
+            ("판결요지", "판결요지", None),
+            ("판례내용", "이유", r"【\s*이\s*유\s*】"),
+        ],
+    },
+    "expc": {
+        "doc_type": "interpretation",
+        "id_field": "법령해석례일련번호",
+        "title": "안건명",
+        "number": "안건번호",
+        "date": "회신일자",
+        "sections": [
+            ("질의요지", "질의요지", None),
+            ("회답", "회답", None),
+            ("이유", "이유", None),
+        ],
+    },
+    "moel": {
+        "doc_type": "labor_ministry",
+        "id_field": "해설일련번호",
+        "title": "제목",
+        "number": None,
+        "date": "등록일자",
+        "sections": [
+            ("질의", "질의", None),
+            ("회시", "회시", None),
+        ],
+    },
+    "lwrc": {
+        "doc_type": "labor_commission",
+        "id_field": "판정례일련번호",
+        "title": "사건명",
+        "number": "사건번호",
+        "date": "판정일자",
+        "sections": [
+            ("판정사항", "판정사항", None),
+            ("판정요지", "판정요지", None),
+            ("이유", "이유", r"【\s*이\s*유\s*】"),
+        ],
+    },
+}
+
+
+class LegalDocumentChunker(DocumentChunker):
+    """법률 문서 섹션 단위 청커
+
+    키워드 추출과 카테고리 분류는 DocumentChunker 규칙을 그대로 사용해
+    기존 청크와 같은 category/keywords 필터로 검색할 수 있습니다.
+    """
+
+    def __init__(self, max_chars: int = 1000, min_chars: int = 20):
+        """
+        Args:
+            max_chars: 청크 최대 글자 수 (넘으면 문단 경계에서 분할)
+            min_chars: 이보다 짧은 섹션은 버림 (빈 섹션, "없음" 등)
+        """
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+
+    @staticmethod
+    def document_key(target: str, detail: Dict, listing: Optional[Dict] = None) -> Tuple[str, str]:
+        """청크의 (doc_type, doc_id) (청크가 하나도 없는 문서도 저장소에서 찾을 수 있도록)"""
+        spec = LEGAL_DOC_SPECS[target]
+        name = spec["id_field"]
+        doc_id = str(detail.get(name) or (listing or {}).get(name) or "").strip()
+        return spec["doc_type"], doc_id
+
+    @timed(count_items=True)
+    def chunk_document(self, target: str, detail: Dict, listing: Optional[Dict] = None) -> List[Dict]:
+        """본문 조회 결과 하나를 청크 목록으로 변환
+
+        Args:
+            target: API 대상 (prec, expc, moel, lwrc)
+            detail: lawService.do 본문 (예: PrecService 내부 객체)
+            listing: 목록 검색 레코드 (본문에 없는 메타데이터, 검색키워드 보완용)
+        """
+        spec = LEGAL_DOC_SPECS[target]
+        listing = listing or {}
+
+        def field(name):
+            if not name:
+                return ""
+            return str(detail.get(name) or listing.get(name) or "").strip()
+
+        doc_id = self.document_key(target, detail, listing)[1]
+        title = field(spec["title"])
+        number = field(spec["number"])
+
+        chunks = []
+        for source_field, section, marker in spec["sections"]:
+            text = self._clean_text(detail.get(source_field) or "")
+            if marker:
+                match = re.search(marker, text)
+                if match:
+                    text = text[match.end():].strip()
+
+            if len(text) < self.min_chars:
+                continue
+
+            parts = self._split_text(text)
+            for part_index, part in enumerate(parts):
+                chunks.append({
+                    "chunk_id": str(uuid.uuid5(uuid.NAMESPACE_URL,
+                                               f"{target}:{doc_id}:{section}:{part_index}")),
+                    "doc_type": spec["doc_type"],
+                    "doc_id": doc_id,
+                    "title": title,
+                    "case_number": number,
+                    "date": field(spec["date"]),
+                    "section": section,
+                    "part": part_index + 1,
+                    "total_parts": len(parts),
+                    "content": part,
+                    "source": f"{title} ({number})" if number else title,
+                    "category": self._categorize_employment_rule(title, part),
+                    "keywords": self._extract_keywords(part),
+                    "search_keywords": listing.get("검색키워드", []),
+                })
+
+        return chunks
+
+    def _clean_text(self, text: str) -> str:
+        """API 본문의 <br/> 등 HTML 태그 제거, 공백 정리"""
+        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+        text = re.sub(r'<[^>]+>', '', text)
+        text = re.sub(r'[ \t　]+', ' ', text)
+        text = re.sub(r'\n\s*\n+', '\n', text)
+        return text.strip()
+
+    def _split_text(self, text: str) -> List[str]:
+        """문단(줄) 경계에서 max_chars 이하로 묶기, 한 문단이 너무 길면 글자 수로 자름"""
+        if len(text) <= self.max_chars:
+            return [text]
+
+        parts = []
+        current = ""
+        for line in text.split('\n'):
+            while len(line) > self.max_chars:
+                if current:
+                    parts.append(current)
+                    current = ""
+                parts.append(line[:self.max_chars])
+                line = line[self.max_chars:]
+
+            if current and len(current) + 1 + len(line) > self.max_chars:
+                parts.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+
+        if current.strip():
+            parts.append(current)
+        return [part.strip() for part in parts if part.strip()]
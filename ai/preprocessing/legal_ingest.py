@@ -0,0 +1,557 @@
+"""
+법률 문서 본문 수집 → 청킹 → 임베딩 스트리밍 파이프라인
+
+collect_legal_data.py가 저장한 검색 목록(JSONL)의 문서 일련번호로 본문(lawService.do)을 받아
+LegalDocumentChunker로 섹션 단위 청크를 만들고 DocumentEmbedder로 임베딩합니다.
+세 단계를 순서대로 돌리는 대신 생산자-소비자 구조로 겹쳐 실행합니다:
+
+    본문 요청 (api-fetch 스레드 풀, 전역 속도 제한)
+        → 청킹 (메인 스레드, 요청 순서대로)
+        → 유사 중복 제거 (MinHash + LSH, 선택)
+        → 제한된 크기의 큐
+        → 임베딩 (임베딩 스레드, 배치 단위)
+        → legal_chunks.jsonl + legal_embeddings.npy (--store를 주면 증분 저장소에 upsert)
+
+동시에 대기 중인 본문 요청 수(max_inflight)와 큐 크기(queue_size)를 제한하므로
+문서 수와 관계없이 메모리 사용량이 일정합니다.
+
+증분 모드(--store)에서는 chunk_id(대상:문서:섹션:순번)가 같은 청크를 갱신하고, 내용이 그대로인 청크는
+임베딩하지 않으며(메타데이터만 바뀌면 저장된 임베딩으로 갱신), 다시 받은 문서에서 사라졌거나 유사 중복이 된
+이전 청크는 삭제합니다. 나머지 색인은 그대로 둡니다.
+
+사용법:
+    python legal_ingest.py --run-id 20251027
+    python legal_ingest.py --run-id 20251027 --targets prec --limit 100
+    python legal_ingest.py --run-id 20251028 --store ../data/processed/legal_store   # 일일 증분 갱신
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from tqdm import tqdm
+
+from api_fetcher import ConcurrentFetcher
+from collect_legal_data import TARGET_SPECS
+from embedder import DocumentEmbedder
+from legal_chunker import LegalDocumentChunker
+from near_dedup import NearDuplicateIndex
+from sharded_store import open_store
+from vector_store import VectorStore
+
+
+DEFAULT_DETAIL_URL = "http://www.law.go.kr/DRF/lawService.do"
+
+
+def iter_listing(path: Path, limit: Optional[int] = None) -> Iterator[Dict]:
+    """검색 목록 JSONL을 한 줄씩 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            if limit is not None and i >= limit:
+                return
+            if line.strip():
+                yield json.loads(line)
+
+
+class EmbeddingStoreWriter:
+    """청크(JSONL)와 임베딩을 같은 순서로 스트리밍 저장
+
+    임베딩은 float32 원시 파일에 이어 쓰고, finalize()에서 전체 크기를 알게 된 뒤
+    블록 단위로 복사해 .npy로 만듭니다 (전체 행렬을 메모리에 올리지 않음).
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.chunks_file = self.output_dir / "legal_chunks.jsonl"
+        self.embeddings_file = self.output_dir / "legal_embeddings.npy"
+        self._raw_file = self.output_dir / "legal_embeddings.f32.tmp"
+
+        self._chunks = open(self.chunks_file, 'w', encoding='utf-8')
+        self._raw = open(self._raw_file, 'wb')
+        self.count = 0
+        self.dim = None
+
+    def write(self, chunks: List[Dict], embeddings: np.ndarray):
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+
+        for chunk in chunks:
+            self._chunks.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        self._raw.write(embeddings.tobytes())
+        self.count += len(chunks)
+
+    def finalize(self, block_rows: int = 4096) -> Path:
+        """원시 임베딩 파일을 .npy로 변환"""
+        self._chunks.close()
+        self._raw.close()
+
+        dim = self.dim or 0
+        out = np.lib.format.open_memmap(self.embeddings_file, mode='w+',
+                                        dtype=np.float32, shape=(self.count, dim))
+        if self.count:
+            src = np.memmap(self._raw_file, dtype=np.float32, mode='r', shape=(self.count, dim))
+            for start in range(0, self.count, block_rows):
+                out[start:start + block_rows] = src[start:start + block_rows]
+            del src
+        out.flush()
+        del out
+
+        self._raw_file.unlink()
+        return self.embeddings_file
+
+    @property
+    def outputs(self) -> List[Path]:
+        return [self.chunks_file, self.embeddings_file]
+
+
+class VectorStoreWriter:
+    """증분 모드: 청크를 VectorStore에 chunk_id 기준으로 upsert (finalize에서 커밋)"""
+
+    def __init__(self, store: VectorStore):
+        self.store = store
+        self.count = 0
+        self.dim = store.dim
+
+    def write(self, chunks: List[Dict], embeddings: np.ndarray):
+        self.store.upsert(chunks, embeddings)
+        self.count += len(chunks)
+        self.dim = embeddings.shape[1]
+
+    def finalize(self) -> Path:
+        self.store.commit()
+        return self.store.manifest_file
+
+    @property
+    def outputs(self) -> List[Path]:
+        return [self.store.store_dir]
+
+
+class LegalIngestPipeline:
+    """본문 수집 → 청킹 → 임베딩 스트리밍 파이프라인"""
+
+    def __init__(self, user_id: str, output_dir: Path,
+                 embedder: Optional[DocumentEmbedder] = None,
+                 chunker: Optional[LegalDocumentChunker] = None,
+                 dedup: Optional[NearDuplicateIndex] = None,
+                 store: Optional[VectorStore] = None,
+                 detail_url: str = DEFAULT_DETAIL_URL,
+                 rate_per_sec: float = 3.0, max_concurrency: int = 4,
+                 max_inflight: int = 32, queue_size: int = 256):
+        """
+        Args:
+            user_id: Open API 사용자 ID
+            output_dir: 청크/임베딩 저장 디렉토리
+            embedder: 임베딩 생성기 (기본: KURE-v1)
+            chunker: 법률 문서 청커
+            dedup: 유사 중복 인덱스. 지정하면 기존 청크와 거의 같은 청크는 임베딩하지 않고
+                   legal_duplicate_chunks.jsonl에 대표 chunk_id(duplicate_of)와 함께 기록
+            store: 증분 저장소 (VectorStore 또는 ShardedVectorStore). 지정하면 새 파일을 쓰지 않고
+                   바뀐 청크만 임베딩해 upsert
+            detail_url: 본문 조회 API 주소 (테스트 시 로컬 stub 서버 주소)
+            rate_per_sec: 초당 최대 요청 수
+            max_concurrency: 동시 요청 수
+            max_inflight: 청킹을 기다리는 본문 요청 최대 수
+            queue_size: 임베딩을 기다리는 청크 최대 수
+        """
+        self.user_id = user_id
+        self.output_dir = Path(output_dir)
+        self.embedder = embedder or DocumentEmbedder()
+        self.chunker = chunker or LegalDocumentChunker()
+        self.dedup = dedup
+        self.store = store
+        self.detail_url = detail_url
+        self.fetcher = ConcurrentFetcher(rate_per_sec=rate_per_sec, max_concurrency=max_concurrency)
+        self.max_inflight = max_inflight
+        self.queue_size = queue_size
+
+        self.stats = {}
+
+    def _detail_params(self, target: str, doc_id: str) -> Dict:
+        return {
+            "OC": self.user_id,
+            "target": target,
+            "ID": doc_id,
+            "type": "JSON",
+        }
+
+    def _extract_detail(self, target: str, data: Optional[Dict]) -> Optional[Dict]:
+        """본문 조회 응답에서 본문 객체 추출"""
+        if not data:
+            return None
+        detail = data.get(TARGET_SPECS[target]["detail_key"], data)
+        return detail if isinstance(detail, dict) else None
+
+    def run(self, listings: Dict[str, Path], limit: Optional[int] = None) -> Dict:
+        """파이프라인 실행
+
+        Args:
+            listings: 대상 → 검색 목록 JSONL 경로 (예: {"prec": ".../precedents_20251027.jsonl"})
+            limit: 대상별 최대 문서 수 (테스트용)
+
+        Returns:
+            단계별 통계
+        """
+        stats = {
+            "documents": 0,
+            "failed_documents": 0,
+            "chunks": 0,
+            "fetch_wait_sec": 0.0,
+            "chunk_sec": 0.0,
+            "queue_wait_sec": 0.0,
+            "embed_sec": 0.0,
+            "embed_batches": 0,
+            "duplicates": 0,
+            "duplicate_chars": 0,
+            "dedup_sec": 0.0,
+            "dedup_seeded": 0,
+            "unchanged": 0,
+            "metadata_updated": 0,
+            "deleted": 0,
+        }
+        self.stats = stats
+
+        writer = VectorStoreWriter(self.store) if self.store is not None else EmbeddingStoreWriter(self.output_dir)
+        if self.dedup is not None and self.store is not None:
+            self._seed_dedup(stats)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        duplicates_file = self.output_dir / "legal_duplicate_chunks.jsonl"
+        self._duplicates_out = open(duplicates_file, 'w', encoding='utf-8') if self.dedup is not None else None
+        self._clusters: Dict[str, List[str]] = {}
+        chunk_queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=self.queue_size)
+        embed_error: List[BaseException] = []
+
+        embed_thread = threading.Thread(
+            target=self._embed_worker, args=(chunk_queue, writer, stats, embed_error),
+            name="legal-embed", daemon=True
+        )
+
+        total = sum(sum(1 for _ in iter_listing(path, limit)) for path in listings.values())
+        print(f"\n본문 수집 → 청킹 → 임베딩 시작: 문서 {total}건 "
+              f"(동시 요청 {self.fetcher.max_concurrency}, 임베딩 배치 {self.embedder.batch_size})")
+
+        start = time.perf_counter()
+        embed_thread.start()
+        try:
+            inflight = deque()
+            with tqdm(total=total, desc="  문서", unit="건") as progress:
+                for target, path in listings.items():
+                    for record in iter_listing(path, limit):
+                        doc_id = record.get(TARGET_SPECS[target]["id_field"])
+                        if not doc_id:
+                            stats["failed_documents"] += 1
+                            progress.update(1)
+                            continue
+
+                        future = self.fetcher.submit(self.detail_url, self._detail_params(target, doc_id))
+                        inflight.append((target, record, future))
+
+                        if len(inflight) >= self.max_inflight:
+                            self._chunk_next(inflight, chunk_queue, stats, embed_error)
+                            progress.update(1)
+
+                while inflight:
+                    self._chunk_next(inflight, chunk_queue, stats, embed_error)
+                    progress.update(1)
+        finally:
+            self._put(chunk_queue, None, stats, embed_error, force=True)
+            embed_thread.join()
+            if self._duplicates_out:
+                self._duplicates_out.close()
+
+        if embed_error:
+            raise embed_error[0]
+
+        writer.finalize()
+        stats["elapsed_sec"] = time.perf_counter() - start
+
+        self._save_metadata(writer, stats)
+        self._print_summary(writer, stats)
+        return stats
+
+    def _chunk_next(self, inflight: deque, chunk_queue: queue.Queue,
+                    stats: Dict, embed_error: List[BaseException]):
+        """가장 먼저 요청한 본문을 기다려 청킹 후 임베딩 큐에 넣기"""
+        target, record, future = inflight.popleft()
+
+        wait_start = time.perf_counter()
+        detail = self._extract_detail(target, future.result())
+        stats["fetch_wait_sec"] += time.perf_counter() - wait_start
+
+        if detail is None:
+            stats["failed_documents"] += 1
+            return
+
+        chunk_start = time.perf_counter()
+        chunks = self.chunker.chunk_document(target, detail, record)
+        stats["chunk_sec"] += time.perf_counter() - chunk_start
+        stats["documents"] += 1
+
+        if self.store is not None:
+            doc_type, doc_id = self.chunker.document_key(target, detail, record)
+            chunks = self._refresh_document(doc_type, doc_id, chunks, stats)
+
+        for chunk in chunks:
+            # 저장된 임베딩을 재사용하는 청크는 본문이 그대로이므로 중복 검사 생략
+            if self.dedup is not None and "embedding" not in chunk and self._is_duplicate(chunk, stats):
+                if self.store is not None:
+                    # 바뀐 청크가 유사 중복이 되면 이전 행이 검색에 남지 않도록 삭제
+                    stats["deleted"] += self.store.delete([chunk["chunk_id"]])
+                continue
+            self._put(chunk_queue, chunk, stats, embed_error)
+
+    def _seed_dedup(self, stats: Dict):
+        """증분 모드: 저장소의 청크로 유사 중복 인덱스 채우기
+
+        저장소에 이미 있는 내용과 거의 같은 새 청크, 이전 실행에서 중복으로 건너뛴 청크가
+        다시 임베딩되지 않도록 합니다.
+        """
+        seed_start = time.perf_counter()
+        for chunk in self.store.live_chunks():
+            self.dedup.add(chunk["chunk_id"], chunk["content"])
+        stats["dedup_sec"] += time.perf_counter() - seed_start
+        stats["dedup_seeded"] = len(self.dedup)
+        print(f"유사 중복 인덱스: 저장소 청크 {stats['dedup_seeded']}개로 시작 "
+              f"({time.perf_counter() - seed_start:.2f}초)")
+
+    def _refresh_document(self, doc_type: str, doc_id: str, chunks: List[Dict], stats: Dict) -> List[Dict]:
+        """증분 모드: 문서에서 사라진 이전 청크는 삭제하고 갱신할 청크만 반환
+
+        청크가 하나도 나오지 않게 된 문서는 이전 청크를 모두 삭제합니다.
+
+        임베딩 입력(build_text)이 그대로이고 목록에서 온 메타데이터(search_keywords 등)만 바뀐
+        청크는 저장된 임베딩을 "embedding"에 담아 반환합니다 (임베딩 스레드가 다시 임베딩하지 않음).
+        """
+        previous = self.store.ids({"doc_type": doc_type, "doc_id": doc_id}) if doc_id else set()
+        stats["deleted"] += self.store.delete(previous - {chunk["chunk_id"] for chunk in chunks})
+
+        refreshed = []
+        for chunk in chunks:
+            stored = self.store.get(chunk["chunk_id"])
+            if stored == chunk:
+                stats["unchanged"] += 1
+            elif stored is not None and self.embedder.build_text(stored) == self.embedder.build_text(chunk):
+                refreshed.append({**chunk, "embedding": self.store.vector(chunk["chunk_id"])})
+                stats["metadata_updated"] += 1
+            else:
+                refreshed.append(chunk)
+                continue
+            # 저장소에 남는 청크는 이후 청크의 중복 비교 대상 (보통 시작 시 이미 색인됨)
+            if self.dedup is not None and chunk["chunk_id"] not in self.dedup:
+                self.dedup.add(chunk["chunk_id"], chunk["content"])
+        return refreshed
+
+    def _is_duplicate(self, chunk: Dict, stats: Dict) -> bool:
+        """이미 임베딩 대기열에 넣은 청크와 유사 중복이면 기록만 하고 True"""
+        dedup_start = time.perf_counter()
+        match = self.dedup.add(chunk["chunk_id"], chunk["content"])
+        stats["dedup_sec"] += time.perf_counter() - dedup_start
+
+        if match is None:
+            return False
+
+        rep_id, similarity = match
+        self._clusters.setdefault(rep_id, []).append(chunk["chunk_id"])
+        record = {**chunk, "duplicate_of": rep_id, "duplicate_similarity": round(similarity, 3)}
+        self._duplicates_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stats["duplicates"] += 1
+        stats["duplicate_chars"] += len(chunk["content"])
+        return True
+
+    def _put(self, chunk_queue: queue.Queue, item: Optional[Dict], stats: Dict,
+             embed_error: List[BaseException], force: bool = False):
+        """큐가 가득 차면 대기 (임베딩 스레드가 실패했으면 중단)"""
+        wait_start = time.perf_counter()
+        while True:
+            if embed_error and not force:
+                raise RuntimeError("임베딩 단계 실패로 파이프라인을 중단합니다") from embed_error[0]
+            try:
+                chunk_queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                if embed_error:
+                    # 임베딩 스레드가 이미 종료되어 큐를 비울 수 없음
+                    return
+        stats["queue_wait_sec"] += time.perf_counter() - wait_start
+
+    def _embed_worker(self, chunk_queue: queue.Queue, writer: EmbeddingStoreWriter,
+                      stats: Dict, embed_error: List[BaseException]):
+        """임베딩 스레드: 큐에서 청크를 모아 배치 단위로 임베딩 후 저장"""
+        batch: List[Dict] = []
+        try:
+            while True:
+                chunk = chunk_queue.get()
+                if chunk is not None:
+                    batch.append(chunk)
+
+                if batch and (chunk is None or len(batch) >= self.embedder.batch_size):
+                    encode = [c for c in batch if "embedding" not in c]
+                    reuse = [c for c in batch if "embedding" in c]
+                    if encode:
+                        embed_start = time.perf_counter()
+                        embeddings = self.embedder.encode_texts(
+                            [self.embedder.build_text(c) for c in encode]
+                        )
+                        stats["embed_sec"] += time.perf_counter() - embed_start
+                        stats["embed_batches"] += 1
+                        writer.write(encode, embeddings)
+                    if reuse:
+                        # 증분 모드에서 메타데이터만 바뀐 청크 (저장된 임베딩 재사용)
+                        writer.write(reuse, np.stack([c["embedding"] for c in reuse]))
+                    stats["chunks"] += len(batch)
+                    batch = []
+
+                if chunk is None:
+                    return
+        except BaseException as e:
+            embed_error.append(e)
+            # 생산자가 큐에서 막히지 않도록 남은 항목 비우기
+            while True:
+                try:
+                    if chunk_queue.get_nowait() is None:
+                        return
+                except queue.Empty:
+                    return
+
+    def _save_metadata(self, writer, stats: Dict):
+        metadata = {
+            "total_chunks": writer.count,
+            "embedding_dim": writer.dim,
+            "model_name": self.embedder.model_name,
+            "batch_size": self.embedder.batch_size,
+            "documents": stats["documents"],
+            "failed_documents": stats["failed_documents"],
+            "duplicate_chunks": stats["duplicates"],
+        }
+        if self.store is not None:
+            metadata.update({
+                "store_dir": str(self.store.store_dir),
+                "store_chunks": len(self.store),
+                "unchanged_chunks": stats["unchanged"],
+                "metadata_updated_chunks": stats["metadata_updated"],
+                "dedup_seeded_chunks": stats["dedup_seeded"],
+                "deleted_chunks": stats["deleted"],
+            })
+        if self.dedup is not None:
+            # 대표 chunk_id → 임베딩을 생략한 유사 중복 chunk_id 목록
+            clusters_file = self.output_dir / "legal_duplicate_clusters.json"
+            with open(clusters_file, 'w', encoding='utf-8') as f:
+                json.dump(self._clusters, f, ensure_ascii=False, indent=2)
+            metadata["dedup_threshold"] = self.dedup.threshold
+
+        metadata_file = self.output_dir / "legal_embedding_metadata.json"
+        with open(metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+    def _print_summary(self, writer, stats: Dict):
+        serial = stats["fetch_wait_sec"] + stats["chunk_sec"] + stats["embed_sec"]
+
+        print("\n" + "="*60)
+        print("본문 수집 · 청킹 · 임베딩 완료")
+        print("="*60)
+        print(f"문서: {stats['documents']}건 (실패 {stats['failed_documents']}건)")
+        print(f"청크: {writer.count}개 (임베딩 차원 {writer.dim})")
+        print(f"본문 대기:   {stats['fetch_wait_sec']:>8.2f}초")
+        print(f"청킹:        {stats['chunk_sec']:>8.2f}초")
+        print(f"임베딩:      {stats['embed_sec']:>8.2f}초 ({stats['embed_batches']}배치)")
+        if self.dedup is not None:
+            total = writer.count + stats["duplicates"]
+            per_chunk = stats["embed_sec"] / writer.count if writer.count else 0.0
+            print(f"유사 중복:   {stats['dedup_sec']:>8.2f}초 - {stats['duplicates']}개 청크 임베딩 생략 "
+                  f"({stats['duplicates'] / total if total else 0:.1%}, "
+                  f"{stats['duplicate_chars']:,}자, 약 {per_chunk * stats['duplicates']:.1f}초 절감)")
+        if self.store is not None:
+            print(f"증분 갱신:   갱신 {writer.count}개 (메타데이터만 {stats['metadata_updated']}개), "
+                  f"변경 없음 {stats['unchanged']}개, "
+                  f"삭제 {stats['deleted']}개 (저장소 전체 {len(self.store)}개)")
+        print(f"큐 대기:     {stats['queue_wait_sec']:>8.2f}초 (임베딩이 병목일 때 증가)")
+        print(f"전체 소요:   {stats['elapsed_sec']:>8.2f}초 (단계별 합 {serial:.2f}초)")
+        fetch_stats = self.fetcher.stats
+        print(f"API 요청: {fetch_stats['requests']}회 (재시도 {fetch_stats['retries']}회, "
+              f"실패 {fetch_stats['failures']}회)")
+        print(f"저장: {', '.join(str(path) for path in writer.outputs)}")
+        print("="*60)
+
+    def close(self):
+        self.fetcher.close()
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+    import os
+    from dotenv import load_dotenv
+
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description="법률 문서 본문 수집 → 청킹 → 임베딩")
+    parser.add_argument("--run-id", required=True,
+                        help="검색 목록 실행 ID (<name>_<run_id>.jsonl)")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGET_SPECS), default=None,
+                        help="처리할 대상 (기본: 목록 파일이 있는 전체 대상)")
+    parser.add_argument("--api-dir", type=Path, default=project_root / "data" / "raw" / "api",
+                        help="검색 목록 JSONL 디렉토리")
+    parser.add_argument("--output-dir", type=Path,
+                        default=project_root / "data" / "processed" / "legal")
+    parser.add_argument("--detail-url", default=DEFAULT_DETAIL_URL,
+                        help="본문 조회 API 주소 (로컬 stub 서버 테스트용)")
+    parser.add_argument("--rate", type=float, default=3.0, help="초당 최대 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--batch-size", type=int, default=8, help="임베딩 배치 크기")
+    parser.add_argument("--limit", type=int, default=None, help="대상별 최대 문서 수")
+    parser.add_argument("--dedup-threshold", type=float, default=0.8,
+                        help="유사 중복 기준 Jaccard 유사도 (MinHash 추정)")
+    parser.add_argument("--no-dedup", action="store_true", help="유사 중복 제거 없이 모두 임베딩")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="증분 저장소 디렉토리 (지정하면 바뀐 청크만 chunk_id 기준 upsert)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    user_id = os.getenv('LEGAL_API_USER_ID')
+    if not user_id:
+        print("오류: LEGAL_API_USER_ID 환경 변수를 설정해주세요.")
+        return
+
+    listings = {}
+    for target in args.targets or list(TARGET_SPECS):
+        path = args.api_dir / f"{TARGET_SPECS[target]['name']}_{args.run_id}.jsonl"
+        if path.exists():
+            listings[target] = path
+        else:
+            print(f"목록 파일 없음: {path}")
+
+    if not listings:
+        print("처리할 검색 목록이 없습니다. collect_legal_data.py를 먼저 실행하세요.")
+        return
+
+    embedder = DocumentEmbedder(batch_size=args.batch_size)
+    store = None
+    if args.store:
+        # 기존 샤드 저장소(sharded_store.py)면 샤드별로 upsert, 없으면 단일 저장소 생성
+        store = open_store(args.store, model_name=embedder.cache_key) or VectorStore(args.store, model_name=embedder.cache_key)
+    pipeline = LegalIngestPipeline(
+        user_id, args.output_dir,
+        embedder=embedder,
+        dedup=None if args.no_dedup else NearDuplicateIndex(threshold=args.dedup_threshold),
+        store=store,
+        detail_url=args.detail_url,
+        rate_per_sec=args.rate,
+        max_concurrency=args.concurrency,
+    )
+    try:
+        pipeline.run(listings, limit=args.limit)
+    finally:
+        pipeline.close()
+        if store is not None:
+            store.wait_compaction()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+전처리 단계 계측 (타이머, 카운터, cProfile)
+
+단계와 자주 호출되는 함수(extract_text, chunk_*, encode, search 등)에 @timed를 붙이면
+호출 수, 누적/최대 시간, 지연 시간 히스토그램을 모으고, count()로 처리량 카운터
+(추출 글자 수, 청크 수 등)를 더합니다. 수집 결과는 JSON 또는 Prometheus 텍스트 형식으로
+내보냅니다.
+
+계측은 기본적으로 꺼져 있고, 꺼져 있을 때 @timed는 플래그 하나만 확인하고 원래 함수를 호출합니다.
+
+켜는 방법:
+    - 코드: metrics.enable() ... metrics.write("metrics.json")
+    - 환경 변수 (스크립트 수정 없이):
+        PREPROCESS_METRICS=metrics.prom python pipeline.py     # 종료 시 저장 (.prom이면 Prometheus 형식)
+        PREPROCESS_PROFILE=profile.pstats python pipeline.py   # 전체 실행 cProfile
+
+py-spy 같은 외부 샘플링 프로파일러는 코드 수정 없이 붙일 수 있습니다 (py-spy record -- python pipeline.py).
+계측 이름이 함수 이름과 같으므로 플레임 그래프와 이 모듈의 결과를 바로 대조할 수 있습니다.
+"""
+
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+# 지연 시간 히스토그램 구간 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+PROMETHEUS_PREFIX = "preprocessing"
+
+
+class MetricsRegistry:
+    """타이머/카운터 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._timers: Dict[str, Dict] = {}
+        self._counters: Dict[str, float] = {}
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = {"count": 0, "sum": 0.0, "max": 0.0,
+                                              "buckets": [0] * (len(BUCKETS) + 1)}
+            timer["count"] += 1
+            timer["sum"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    timer["buckets"][i] += 1
+                    break
+            else:
+                timer["buckets"][-1] += 1
+
+    def add(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """{"timers": {이름: {count, sum_sec, mean_ms, max_ms}}, "counters": {이름: 값}}"""
+        with self._lock:
+            timers = {
+                name: {
+                    "count": t["count"],
+                    "sum_sec": t["sum"],
+                    "mean_ms": t["sum"] / t["count"] * 1000 if t["count"] else 0.0,
+                    "max_ms": t["max"] * 1000,
+                    "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], t["buckets"])),
+                }
+                for name, t in sorted(self._timers.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+        return {"timers": timers, "counters": counters}
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_duration_seconds 전처리 함수/단계 실행 시간",
+            f"# TYPE {PROMETHEUS_PREFIX}_duration_seconds histogram",
+        ]
+        for name, timer in snapshot["timers"].items():
+            cumulative = 0
+            for bound, count in timer["buckets"].items():
+                cumulative += count
+                lines.append(f'{PROMETHEUS_PREFIX}_duration_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PROMETHEUS_PREFIX}_duration_seconds_sum{{name="{name}"}} {timer["sum_sec"]}')
+            lines.append(f'{PROMETHEUS_PREFIX}_duration_seconds_count{{name="{name}"}} {timer["count"]}')
+
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_items_total 전처리 처리량 카운터")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_items_total counter")
+        for name, value in snapshot["counters"].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_items_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path):
+        """파일로 저장 (.prom/.txt면 Prometheus 형식, 그 외 JSON)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if path.suffix in (".prom", ".txt"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+METRICS = MetricsRegistry()
+
+
+def enable():
+    METRICS.enabled = True
+
+
+def disable():
+    METRICS.enabled = False
+
+
+def count(name: str, value: float = 1):
+    """카운터 증가 (계측이 꺼져 있으면 무시)"""
+    if METRICS.enabled:
+        METRICS.add(name, value)
+
+
+def timed(name: Optional[str] = None, count_items: bool = False) -> Callable:
+    """함수 실행 시간 계측 데코레이터
+
+    Args:
+        name: 계측 이름 (기본: 함수 이름)
+        count_items: 반환값 길이를 "<이름>_items" 카운터에 더함 (청크 목록, 임베딩 배열 등)
+    """
+    def decorator(fn):
+        metric = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                METRICS.observe(metric, time.perf_counter() - start)
+            if count_items and result is not None:
+                METRICS.add(f"{metric}_items", len(result))
+            return result
+
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timer(name: str):
+    """with 블록 실행 시간 계측"""
+    if not METRICS.enabled:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(name, time.perf_counter() - start)
+
+
+@contextmanager
+def profile(path: Optional[Path]):
+    """with 블록을 cProfile로 실행하고 pstats 파일로 저장 (path가 없으면 아무것도 안 함)"""
+    if not path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        print(f"프로파일 저장: {path} (python -m pstats {path})")
+
+
+def print_summary(top: int = 20):
+    """누적 시간 순 타이머 요약과 카운터 출력"""
+    snapshot = METRICS.snapshot()
+    if not snapshot["timers"] and not snapshot["counters"]:
+        return
+
+    print("\n" + "="*72)
+    print("계측 결과")
+    print("="*72)
+    print(f"{'이름':<32}{'호출':>8}{'누적(초)':>11}{'평균(ms)':>11}{'최대(ms)':>11}")
+    print("-"*72)
+    timers = sorted(snapshot["timers"].items(), key=lambda item: item[1]["sum_sec"], reverse=True)
+    for name, t in timers[:top]:
+        print(f"{name:<32}{t['count']:>8}{t['sum_sec']:>11.3f}{t['mean_ms']:>11.2f}{t['max_ms']:>11.2f}")
+    if snapshot["counters"]:
+        print("-"*72)
+        for name, value in snapshot["counters"].items():
+            print(f"{name:<32}{value:>12,.0f}")
+    print("="*72)
+
+
+def _configure_from_env():
+    """PREPROCESS_METRICS / PREPROCESS_PROFILE 환경 변수로 계측 활성화"""
+    metrics_path = os.environ.get("PREPROCESS_METRICS")
+    if metrics_path:
+        enable()
+        atexit.register(METRICS.write, Path(metrics_path))
+
+    profile_path = os.environ.get("PREPROCESS_PROFILE")
+    if profile_path:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump():
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+
+        atexit.register(dump)
+
+
+_configure_from_env()
@@ -0,0 +1,258 @@
+"""
+문장/윈도 단위 자식 벡터와 부모 청크 풀링 (멀티 벡터 검색)
+
+청크당 벡터 하나만 두면 512 토큰을 넘는 긴 매뉴얼 섹션은 뒷부분이 잘려, 섹션 후반부와 맞는
+쿼리를 놓칩니다. 청크 content를 문장 단위로 나눠 window_chars 이하의 윈도로 묶고, 윈도마다
+임베딩한 자식 벡터를 부모 청크 인덱스와 함께 저장합니다. 검색은 자식 점수를 부모별로
+max 또는 sum 풀링한 뒤 기존 청크 검색과 같은 상위 k 선택을 거칩니다.
+
+- 자식 벡터는 L2 정규화 후 벡터별 스케일로 int8 양자화 (float32 대비 약 1/4 크기)
+- 점수 계산은 블록 단위로 float32 변환 (메모리 상한 = 블록 크기 × 차원)
+- 필터가 있으면 해당 부모의 자식만 계산
+
+저장 파일 (임베딩 디렉토리):
+    child_vectors.npy   int8  [자식 수, 차원]
+    child_scales.npy    float32 [자식 수]
+    child_parents.npy   int32 [자식 수] (chunks_with_embeddings.json의 청크 인덱스)
+    multivector_metadata.json  (부모 chunk_id 목록 해시, 모델, 백엔드 포함. 쿼리 쪽과 다르면 로드 거부)
+
+사용법:
+    python multivector.py build --embeddings-dir ../data/processed/embeddings --window-chars 300
+    python multivector.py build --backend onnx-int8   # 쿼리도 같은 백엔드로 (EmbeddingTester(backend=...))
+    python test_embeddings.py 근로시간   # EmbeddingTester(..., multivector="max")로 사용
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from metrics import timed
+
+
+DEFAULT_WINDOW_CHARS = 300
+# 점수 계산 시 한 번에 float32로 바꾸는 자식 벡터 수
+SCORE_BLOCK_ROWS = 65536
+POOLING_METHODS = ("max", "sum")
+
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.?!。])\s+|\n+')
+
+FILES = {
+    "vectors": "child_vectors.npy",
+    "scales": "child_scales.npy",
+    "parents": "child_parents.npy",
+    "metadata": "multivector_metadata.json",
+}
+
+
+def split_windows(text: str, window_chars: int = DEFAULT_WINDOW_CHARS) -> List[str]:
+    """문장 단위로 나눈 뒤 window_chars 이하 윈도로 묶기 (이웃 윈도는 문장 하나가 겹침)"""
+    sentences = []
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        sentence = sentence.strip()
+        # 문장 하나가 윈도보다 길면 글자 수로 자름
+        while len(sentence) > window_chars:
+            sentences.append(sentence[:window_chars])
+            sentence = sentence[window_chars:]
+        if sentence:
+            sentences.append(sentence)
+
+    if not sentences:
+        return []
+
+    windows = []
+    start = 0
+    while start < len(sentences):
+        end, length = start, 0
+        while end < len(sentences) and (end == start or length + len(sentences[end]) + 1 <= window_chars):
+            length += len(sentences[end]) + 1
+            end += 1
+        windows.append(" ".join(sentences[start:end]))
+        if end >= len(sentences):
+            break
+        start = max(end - 1, start + 1)
+    return windows
+
+
+def parent_ids_hash(chunk_ids: List[str]) -> str:
+    """부모 chunk_id 목록(순서 포함) 해시"""
+    return hashlib.sha256("\n".join(chunk_ids).encode("utf-8")).hexdigest()
+
+
+def build_child_texts(chunks: List[Dict], window_chars: int = DEFAULT_WINDOW_CHARS) -> Tuple[List[str], np.ndarray]:
+    """청크 → (자식 윈도 텍스트 목록, 부모 청크 인덱스 배열)
+
+    윈도 앞에 카테고리를 붙여 DocumentEmbedder.build_text와 같은 형식을 유지합니다.
+    """
+    texts, parents = [], []
+    for i, chunk in enumerate(chunks):
+        prefix = f"[{chunk['category']}] " if chunk.get('category') else ""
+        windows = split_windows(chunk.get('content', ''), window_chars) or [chunk.get('content', '')]
+        for window in windows:
+            texts.append(prefix + window)
+            parents.append(i)
+    return texts, np.asarray(parents, dtype=np.int32)
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """L2 정규화 후 벡터별 대칭 int8 양자화 → (int8 벡터, 스케일)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+    quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+@timed()
+def build_child_index(chunks: List[Dict], embedder, output_dir: Path,
+                      window_chars: int = DEFAULT_WINDOW_CHARS) -> Dict:
+    """자식 윈도를 배치 임베딩해 양자화 저장
+
+    Args:
+        chunks: chunks_with_embeddings.json과 같은 순서의 청크 목록
+        embedder: DocumentEmbedder (encode_texts 사용, backend_name을 메타데이터에 기록)
+        output_dir: 임베딩 디렉토리
+        window_chars: 윈도 최대 글자 수
+
+    Returns:
+        메타데이터
+    """
+    texts, parents = build_child_texts(chunks, window_chars)
+    print(f"자식 윈도 {len(texts)}개 임베딩 (청크 {len(chunks)}개, 윈도 {window_chars}자)")
+    vectors, scales = quantize(embedder.encode_texts(texts, show_progress_bar=True))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    np.save(output_dir / FILES["vectors"], vectors)
+    np.save(output_dir / FILES["scales"], scales)
+    np.save(output_dir / FILES["parents"], parents)
+
+    metadata = {
+        "total_chunks": len(chunks),
+        "total_children": len(texts),
+        "parent_ids_hash": parent_ids_hash([chunk["chunk_id"] for chunk in chunks]),
+        "embedding_dim": int(vectors.shape[1]) if len(texts) else 0,
+        "window_chars": window_chars,
+        "model_name": embedder.model_name,
+        "backend": getattr(embedder, "backend_name", "torch"),
+        "dtype": "int8",
+    }
+    with open(output_dir / FILES["metadata"], 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+    print(f"자식 벡터 저장: {vectors.nbytes / 1024 / 1024:.1f}MB (float32 대비 {vectors.nbytes / max(vectors.size * 4, 1):.0%})")
+    return metadata
+
+
+class MultiVectorIndex:
+    """양자화된 자식 벡터에서 부모 청크 점수 계산"""
+
+    def __init__(self, embeddings_dir: Path, parent_ids: List[str], pooling: str = "max",
+                 model_name: Optional[str] = None, backend: Optional[str] = None):
+        """
+        Args:
+            embeddings_dir: 자식 벡터 파일이 있는 임베딩 디렉토리
+            parent_ids: 부모 chunk_id 목록 (chunks_with_embeddings.json 순서)
+            pooling: "max" (가장 잘 맞는 윈도) 또는 "sum" (맞는 윈도가 많을수록 높음)
+            model_name: 쿼리 임베딩 모델 (지정하면 자식 벡터 모델과 같아야 함)
+            backend: 쿼리 임베딩 백엔드 (지정하면 자식 벡터 백엔드와 같아야 함)
+        """
+        if pooling not in POOLING_METHODS:
+            raise ValueError(f"지원하지 않는 풀링: {pooling} ({', '.join(POOLING_METHODS)})")
+
+        embeddings_dir = Path(embeddings_dir)
+        # 청크 수가 같아도 순서나 chunk_id가 바뀌면 자식의 부모 인덱스가 어긋나므로 목록 해시로 확인
+        metadata_file = embeddings_dir / FILES["metadata"]
+        metadata = {}
+        if metadata_file.exists():
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        if (metadata.get("total_chunks") != len(parent_ids)
+                or metadata.get("parent_ids_hash") != parent_ids_hash(parent_ids)):
+            raise ValueError("자식 벡터가 현재 청크 목록과 맞지 않습니다 (multivector.py build 다시 실행)")
+        # 모델이나 백엔드가 다르면 쿼리와 자식 벡터의 임베딩 공간이 달라 점수가 의미 없음
+        built = {"model_name": metadata.get("model_name"), "backend": metadata.get("backend", "torch")}
+        for key, expected in (("model_name", model_name), ("backend", backend)):
+            if expected is not None and built[key] != expected:
+                raise ValueError(f"자식 벡터의 {key}({built[key]})가 쿼리 쪽({expected})과 다릅니다 "
+                                 f"(multivector.py build --model/--backend로 다시 생성)")
+
+        self.pooling = pooling
+        self.num_parents = len(parent_ids)
+        # int8 벡터는 메모리 매핑으로 열어 필요한 블록만 읽음
+        self.vectors = np.load(embeddings_dir / FILES["vectors"], mmap_mode='r')
+        self.scales = np.load(embeddings_dir / FILES["scales"])
+        self.parents = np.load(embeddings_dir / FILES["parents"])
+
+    @classmethod
+    def exists(cls, embeddings_dir: Path) -> bool:
+        return all((Path(embeddings_dir) / FILES[key]).exists() for key in ("vectors", "scales", "parents"))
+
+    def child_scores(self, query_embedding: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """자식 코사인 유사도 (rows가 있으면 그 자식만)"""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        total = len(self.parents) if rows is None else len(rows)
+        scores = np.empty(total, dtype=np.float32)
+        for start in range(0, total, SCORE_BLOCK_ROWS):
+            end = min(start + SCORE_BLOCK_ROWS, total)
+            index = slice(start, end) if rows is None else rows[start:end]
+            block = np.asarray(self.vectors[index], dtype=np.float32)
+            scores[start:end] = (block @ query) * self.scales[index]
+        return scores
+
+    def parent_scores(self, query_embedding: np.ndarray,
+                      parent_indices: Optional[List[int]] = None) -> np.ndarray:
+        """부모 청크 점수 (parent_indices가 있으면 그 순서대로, 없으면 전체 부모 순서)
+
+        자식이 없는 부모는 -inf.
+        """
+        if parent_indices is None:
+            rows, child_parents = None, self.parents
+        else:
+            rows = np.flatnonzero(np.isin(self.parents, parent_indices))
+            child_parents = self.parents[rows]
+
+        scores = self.child_scores(query_embedding, rows)
+        if self.pooling == "max":
+            pooled = np.full(self.num_parents, -np.inf, dtype=np.float32)
+            np.maximum.at(pooled, child_parents, scores)
+        else:
+            pooled = np.bincount(child_parents, weights=scores, minlength=self.num_parents).astype(np.float32)
+            pooled[np.bincount(child_parents, minlength=self.num_parents) == 0] = -np.inf
+
+        return pooled if parent_indices is None else pooled[parent_indices]
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    from embedding_backend import BACKENDS
+
+    parser = argparse.ArgumentParser(description="멀티 벡터(자식 윈도) 인덱스")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="자식 벡터 생성")
+    build_parser.add_argument("--embeddings-dir", type=Path,
+                              default=Path(__file__).parent.parent / "data" / "processed" / "embeddings")
+    build_parser.add_argument("--window-chars", type=int, default=DEFAULT_WINDOW_CHARS)
+    build_parser.add_argument("--model", default="nlpai-lab/KURE-v1")
+    build_parser.add_argument("--batch-size", type=int, default=8)
+    build_parser.add_argument("--backend", choices=list(BACKENDS), default="torch",
+                              help="자식 벡터 임베딩 백엔드 (검색 시 쿼리 백엔드와 같아야 함)")
+    args = parser.parse_args()
+
+    from embedder import DocumentEmbedder
+
+    with open(args.embeddings_dir / "chunks_with_embeddings.json", 'r', encoding='utf-8') as f:
+        chunks = json.load(f)
+    embedder = DocumentEmbedder(model_name=args.model, batch_size=args.batch_size, backend=args.backend)
+    metadata = build_child_index(chunks, embedder, args.embeddings_dir, args.window_chars)
+    print(f"완료: 청크 {metadata['total_chunks']}개 → 자식 {metadata['total_children']}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+MinHash + LSH 기반 유사 중복 청크 탐지
+
+노동위원회 판정례, 고용노동부 해설, 판례는 서로를 거의 그대로 인용하는 경우가 많아
+같은 내용을 여러 번 임베딩하고 검색 결과에도 중복으로 나옵니다. 청크 텍스트의 글자
+n-gram 집합으로 MinHash 서명을 만들고 LSH 밴드 버킷으로 후보만 비교하므로, 전체 쌍을
+비교하지 않고 청크 수에 거의 선형인 시간으로 유사 중복을 묶습니다.
+
+각 묶음(cluster)은 처음 등장한 청크를 대표로 남기고 나머지는 대표 chunk_id를 가리킵니다.
+임베딩 전에 적용하면 대표 청크만 임베딩하면 됩니다.
+
+사용법:
+    python near_dedup.py --input ../data/processed/chunks/all_chunks.json
+    python near_dedup.py --input legal_chunks.jsonl --output legal_chunks.dedup.jsonl --threshold 0.85
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+_SHINGLE_BASE = np.uint64(1000003)
+_SHINGLE_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class MinHasher:
+    """글자 n-gram MinHash 서명 생성기"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        Args:
+            num_perm: 서명 길이 (해시 함수 수)
+            shingle_size: 글자 n-gram 길이 (공백/문장부호 제거 후)
+            seed: 해시 계수 난수 시드 (같은 시드끼리만 서명 비교 가능)
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        # multiply-shift 해시: h(x) = ((a * x + b) mod 2^64) >> 32, a는 홀수
+        rng = np.random.RandomState(seed)
+        self._a = (rng.randint(0, 2**32, size=num_perm, dtype=np.uint64) << np.uint64(32)) \
+            | rng.randint(0, 2**32, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 2**32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """정규화한 텍스트의 n-gram 해시 (중복 제거)
+
+        글자 코드 배열에 다항식 롤링 해시를 벡터 연산으로 적용해 n-gram마다
+        파이썬 루프를 돌지 않습니다.
+        """
+        normalized = re.sub(r'[\s\W_]+', '', text)
+        codes = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        k = min(self.shingle_size, len(codes))
+        if k == 0:
+            return np.zeros(1, dtype=np.uint64)
+
+        count = len(codes) - k + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for j in range(k):
+                hashes = hashes * _SHINGLE_BASE + codes[j:j + count]
+            # 하위 비트 섞기 후 32비트로 축소 (multiply-shift 해시 입력)
+            hashes = (hashes * _SHINGLE_MIX) >> np.uint64(32)
+        return np.unique(hashes)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash 서명 (num_perm개의 uint32)"""
+        hashes = self.shingles(text)
+        values = np.empty((self.num_perm, len(hashes)), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            np.multiply(self._a[:, None], hashes[None, :], out=values)
+            values += self._b[:, None]
+        # 상위 32비트만 쓰므로 최솟값을 구한 뒤 시프트해도 결과가 같음
+        return (values.min(axis=1) >> np.uint64(32)).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """LSH 밴드 인덱스 (온라인 추가, 대표 청크만 색인)"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 5, max_candidates: int = 50):
+        """
+        Args:
+            threshold: 유사 중복으로 볼 추정 Jaccard 유사도
+            num_perm: MinHash 서명 길이
+            bands: LSH 밴드 수 (num_perm의 약수). 밴드가 많을수록 후보가 늘어남
+            shingle_size: 글자 n-gram 길이
+            max_candidates: 청크당 비교할 최대 후보 수 (흔한 상투 문구 버킷에서 비교 폭증 방지)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})의 배수여야 합니다")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_candidates = max_candidates
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self.comparisons = 0
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def add(self, key: str, text: str) -> Optional[Tuple[str, float]]:
+        """청크 추가 (이미 색인된 key면 자기 자신과는 비교하지 않고 서명을 교체)
+
+        Returns:
+            유사 중복이면 (대표 key, 추정 유사도), 새 대표로 색인했으면 None
+        """
+        signature = self.hasher.signature(text)
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes()
+                     for i in range(self.bands)]
+
+        seen = set()
+        best = None
+        for band, band_key in enumerate(band_keys):
+            for candidate in self._buckets[band].get(band_key, ()):
+                if candidate in seen or candidate == key:
+                    continue
+                seen.add(candidate)
+                self.comparisons += 1
+
+                similarity = float(np.mean(self._signatures[candidate] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+
+                if len(seen) >= self.max_candidates:
+                    break
+            if len(seen) >= self.max_candidates:
+                break
+
+        if best:
+            return best
+
+        self._signatures[key] = signature
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band].setdefault(band_key, []).append(key)
+        return None
+
+
+def deduplicate_chunks(chunks: List[Dict], index: Optional[NearDuplicateIndex] = None,
+                       text_field: str = "content") -> Tuple[List[Dict], List[Dict], Dict]:
+    """청크 목록의 유사 중복 묶기
+
+    대표 청크에는 duplicate_chunk_ids, 중복 청크에는 duplicate_of/duplicate_similarity를 추가합니다.
+
+    Returns:
+        (대표 청크 목록, 중복 청크 목록, 리포트)
+    """
+    index = index if index is not None else NearDuplicateIndex()
+    start = time.perf_counter()
+
+    representatives = {}
+    duplicates = []
+    for chunk in chunks:
+        match = index.add(chunk["chunk_id"], chunk.get(text_field) or "")
+        if match is None:
+            representatives[chunk["chunk_id"]] = chunk
+            continue
+
+        rep_id, similarity = match
+        duplicates.append({**chunk, "duplicate_of": rep_id,
+                           "duplicate_similarity": round(similarity, 3)})
+        representatives[rep_id].setdefault("duplicate_chunk_ids", []).append(chunk["chunk_id"])
+
+    report = dedup_report(list(representatives.values()), duplicates, text_field)
+    report["comparisons"] = index.comparisons
+    report["elapsed_sec"] = time.perf_counter() - start
+    return list(representatives.values()), duplicates, report
+
+
+def dedup_report(representatives: List[Dict], duplicates: List[Dict],
+                 text_field: str = "content") -> Dict:
+    """임베딩 절감량 리포트 (청크 수, 글자 수 기준)"""
+    kept_chars = sum(len(c.get(text_field) or "") for c in representatives)
+    saved_chars = sum(len(c.get(text_field) or "") for c in duplicates)
+    total = len(representatives) + len(duplicates)
+
+    return {
+        "total_chunks": total,
+        "representatives": len(representatives),
+        "duplicates": len(duplicates),
+        "clusters_with_duplicates": sum(1 for c in representatives if c.get("duplicate_chunk_ids")),
+        "saved_chunk_ratio": len(duplicates) / total if total else 0.0,
+        "saved_chars": saved_chars,
+        "saved_char_ratio": saved_chars / (kept_chars + saved_chars) if kept_chars + saved_chars else 0.0,
+    }
+
+
+def print_report(report: Dict):
+    print("\n" + "="*60)
+    print("유사 중복 제거 결과")
+    print("="*60)
+    print(f"전체 청크:     {report['total_chunks']:>8}개")
+    print(f"대표 청크:     {report['representatives']:>8}개")
+    print(f"중복 청크:     {report['duplicates']:>8}개 "
+          f"(중복이 있는 묶음 {report['clusters_with_duplicates']}개)")
+    print(f"임베딩 절감:   청크 {report['saved_chunk_ratio']:.1%}, "
+          f"글자 {report['saved_chars']:,}자 ({report['saved_char_ratio']:.1%})")
+    if "elapsed_sec" in report:
+        print(f"소요 시간:     {report['elapsed_sec']:.2f}초 (후보 비교 {report['comparisons']:,}회)")
+    print("="*60)
+
+
+def load_chunks(path: Path) -> List[Dict]:
+    """all_chunks.json (JSON 배열) 또는 JSONL 청크 파일 로딩"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MinHash + LSH 유사 중복 청크 탐지")
+    parser.add_argument("--input", type=Path, required=True, help="청크 파일 (.json 또는 .jsonl)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="대표 청크 저장 경로 (중복 청크는 <output>.duplicates.jsonl)")
+    parser.add_argument("--threshold", type=float, default=0.8, help="유사 중복 기준 Jaccard 유사도")
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--shingle-size", type=int, default=5)
+    args = parser.parse_args()
+
+    chunks = load_chunks(args.input)
+    print(f"청크 로딩: {args.input} ({len(chunks)}개)")
+
+    index = NearDuplicateIndex(threshold=args.threshold, num_perm=args.num_perm,
+                               bands=args.bands, shingle_size=args.shingle_size)
+    representatives, duplicates, report = deduplicate_chunks(chunks, index)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            if args.output.suffix == ".jsonl":
+                for chunk in representatives:
+                    f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            else:
+                json.dump(representatives, f, ensure_ascii=False, indent=2)
+
+        duplicates_file = args.output.with_suffix(".duplicates.jsonl")
+        with open(duplicates_file, 'w', encoding='utf-8') as f:
+            for chunk in duplicates:
+                f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        print(f"저장: {args.output}, {duplicates_file}")
+
+
+if __name__ == "__main__":
+    main()
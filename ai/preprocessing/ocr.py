@@ -0,0 +1,144 @@
+"""
+스캔 페이지 판별과 로컬 OCR 처리
+
+PDF 페이지마다 글자 수와 이미지 면적 비율로 텍스트 페이지/스캔 페이지를 구분하고,
+스캔 페이지만 별도 OCR 풀에서 로컬 Tesseract(kor)로 인식합니다.
+
+- 텍스트 페이지는 기존 pdfplumber 경로 그대로 처리 (OCR 풀을 거치지 않음)
+- OCR 작업은 (PDF 경로, 페이지 번호)만 넘기고 렌더링은 작업자 안에서 하므로
+  제출은 막히지 않고, 메모리와 CPU 사용은 작업자 수로 제한됨
+- 렌더링(pypdfium2)은 스레드 안전하지 않아 모듈 잠금으로 한 번에 한 페이지만, Tesseract만 병렬 실행
+- Tesseract가 없으면 풀이 비활성화되고 스캔 페이지는 기존처럼 빈 페이지로 남음
+
+필요 프로그램 (pip 패키지가 아닌 시스템 바이너리):
+    apt install tesseract-ocr tesseract-ocr-kor
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from metrics import count, timed
+
+
+PAGE_TEXT = "text"
+PAGE_SCANNED = "scanned"
+PAGE_EMPTY = "empty"
+
+# 이보다 글자가 적고 이미지가 페이지의 MIN_IMAGE_COVERAGE 이상을 덮으면 스캔 페이지
+MIN_TEXT_CHARS = 20
+MIN_IMAGE_COVERAGE = 0.3
+
+# PDFium은 스레드 안전하지 않고 pypdfium2/pdfplumber도 잠그지 않으므로 페이지 렌더링은 직렬화
+_RENDER_LOCK = threading.Lock()
+
+
+def image_coverage(page) -> float:
+    """페이지 면적 대비 이미지 면적 비율 (겹침은 무시, 최대 1.0)"""
+    page_area = float(page.width * page.height)
+    if not page_area:
+        return 0.0
+
+    covered = 0.0
+    for image in page.images:
+        width = min(image["x1"], page.width) - max(image["x0"], 0)
+        height = min(image["bottom"], page.height) - max(image["top"], 0)
+        if width > 0 and height > 0:
+            covered += width * height
+    return min(covered / page_area, 1.0)
+
+
+def classify_page(page, min_chars: int = MIN_TEXT_CHARS, min_coverage: float = MIN_IMAGE_COVERAGE) -> str:
+    """pdfplumber 페이지 → PAGE_TEXT / PAGE_SCANNED / PAGE_EMPTY
+
+    글자 객체 수만 세고 텍스트 배치는 하지 않으므로 extract_text보다 훨씬 가볍습니다.
+    """
+    chars = len(page.chars)
+    if chars >= min_chars:
+        return PAGE_TEXT
+    if image_coverage(page) >= min_coverage:
+        return PAGE_SCANNED
+    return PAGE_TEXT if chars else PAGE_EMPTY
+
+
+class OCRPool:
+    """스캔 페이지 전용 OCR 작업자 풀 (Tesseract CLI)"""
+
+    def __init__(self, workers: int = 2, lang: str = "kor", resolution: int = 300,
+                 timeout: float = 120.0, tesseract_cmd: str = "tesseract"):
+        """
+        Args:
+            workers: 동시에 실행할 Tesseract 프로세스 수
+            lang: Tesseract 언어 (kor, kor+eng 등)
+            resolution: 페이지 렌더링 해상도 (DPI)
+            timeout: 페이지당 OCR 제한 시간 (초)
+            tesseract_cmd: Tesseract 실행 파일
+        """
+        self.workers = workers
+        self.lang = lang
+        self.resolution = resolution
+        self.timeout = timeout
+        self.tesseract_cmd = tesseract_cmd
+        self.available = self._check()
+        self._executor = (ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+                          if self.available else None)
+
+    def _check(self) -> bool:
+        if self.workers <= 0:
+            return False
+        if shutil.which(self.tesseract_cmd) is None:
+            print(f"Warning: {self.tesseract_cmd} not found, OCR disabled (apt install tesseract-ocr tesseract-ocr-kor)")
+            return False
+
+        result = subprocess.run([self.tesseract_cmd, "--list-langs"], capture_output=True, text=True)
+        installed = set(result.stdout.split())
+        missing = [lang for lang in self.lang.split("+") if lang not in installed]
+        if missing:
+            print(f"Warning: Tesseract language pack missing ({', '.join(missing)}), OCR disabled")
+            return False
+        return True
+
+    def submit(self, pdf_path: Path, page_number: int) -> Optional[Future]:
+        """페이지 OCR 작업 등록 (풀이 비활성화되어 있으면 None)"""
+        if not self.available:
+            return None
+        return self._executor.submit(self.ocr_page, Path(pdf_path), page_number)
+
+    @timed("ocr_page")
+    def ocr_page(self, pdf_path: Path, page_number: int) -> str:
+        """PDF 한 페이지를 렌더링해 OCR (page_number는 1부터)"""
+        import pdfplumber
+
+        with _RENDER_LOCK:
+            with pdfplumber.open(pdf_path) as pdf:
+                image = pdf.pages[page_number - 1].to_image(resolution=self.resolution).original
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        del image
+
+        # 작업자 수만큼 프로세스를 띄우므로 Tesseract 내부 스레드는 1개로 제한 (과다 구독 방지)
+        env = dict(os.environ, OMP_THREAD_LIMIT="1")
+        result = subprocess.run(
+            [self.tesseract_cmd, "stdin", "stdout", "-l", self.lang],
+            input=buffer.getvalue(), capture_output=True, timeout=self.timeout, env=env, check=True,
+        )
+        text = result.stdout.decode("utf-8", errors="replace").strip()
+        count("ocr_pages")
+        count("ocr_chars", len(text))
+        return text
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -1,46 +1,102 @@
-import pdfplumber
 from pathlib import Path
 import json
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from metrics import count, timed
+from ocr import PAGE_SCANNED, OCRPool, classify_page
 
 
 class PDFExtractor:
     """PDF 파일에서 텍스트를 추출하는 클래스"""
 
-    def __init__(self, input_dir: str, output_dir: str):
+    def __init__(self, input_dir: str, output_dir: str, ocr: Optional[OCRPool] = None):
         """
         Args:
             input_dir: PDF 파일이 있는 디렉토리
             output_dir: 추출된 텍스트를 저장할 디렉토리
+            ocr: 스캔 페이지 OCR 풀 (없으면 스캔 페이지는 건너뜀)
         """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
+        self.ocr = ocr
 
         # 출력 디렉토리 생성
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def extract_text(self, pdf_path: Path) -> str:
-        """PDF 파일에서 텍스트 추출
+    def extract_pages(self, pdf_path: Path) -> Tuple[List[str], List[int]]:
+        """페이지별 텍스트 추출 (스캔 페이지는 빈 문자열로 두고 번호만 반환)
 
         Args:
             pdf_path: PDF 파일 경로
 
         Returns:
-            추출된 텍스트
+            (페이지별 텍스트, 스캔 페이지 번호 목록)
         """
-        text = ''
+        import pdfplumber
+
+        pages, scanned = [], []
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 for page_num, page in enumerate(pdf.pages, start=1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += f"\n--- Page {page_num} ---\n"
-                        text += page_text
+                    count("extract_pages")
+                    if classify_page(page) == PAGE_SCANNED:
+                        scanned.append(page_num)
+                        pages.append('')
+                        continue
+                    pages.append(page.extract_text() or '')
         except Exception as e:
             print(f"Error extracting text from {pdf_path.name}: {e}")
+            count("extract_errors")
+
+        count("extract_scanned_pages", len(scanned))
+        return pages, scanned
+
+    def submit_ocr(self, pdf_path: Path, scanned: List[int]) -> Dict[int, Future]:
+        """스캔 페이지를 OCR 풀에 등록 (OCR 풀이 없으면 빈 딕셔너리)"""
+        if self.ocr is None or not self.ocr.available:
+            return {}
+        return {page_num: self.ocr.submit(pdf_path, page_num) for page_num in scanned}
+
+    def collect_ocr(self, pdf_path: Path, pages: List[str], futures: Dict[int, Future]) -> List[int]:
+        """OCR 결과를 페이지 목록에 채우고 인식에 성공한 페이지 번호 반환"""
+        recognized = []
+        for page_num, future in sorted(futures.items()):
+            try:
+                pages[page_num - 1] = future.result()
+            except Exception as e:
+                print(f"Error running OCR on {pdf_path.name} page {page_num}: {e}")
+                count("ocr_errors")
+                continue
+            recognized.append(page_num)
+        return recognized
+
+    @staticmethod
+    def join_pages(pages: List[str]) -> str:
+        """페이지 텍스트를 "--- Page N ---" 구분자로 합침 (빈 페이지 제외)"""
+        text = ''
+        for page_num, page_text in enumerate(pages, start=1):
+            if page_text:
+                text += f"\n--- Page {page_num} ---\n"
+                text += page_text
+        text = text.strip()
+        count("extract_chars", len(text))
+        return text
+
+    @timed()
+    def extract_text(self, pdf_path: Path) -> str:
+        """PDF 파일에서 텍스트 추출 (스캔 페이지는 OCR 풀이 있으면 인식 결과를 기다림)
 
-        return text.strip()
+        Args:
+            pdf_path: PDF 파일 경로
+
+        Returns:
+            추출된 텍스트
+        """
+        pages, scanned = self.extract_pages(pdf_path)
+        self.collect_ocr(pdf_path, pages, self.submit_ocr(pdf_path, scanned))
+        return self.join_pages(pages)
 
     def get_page_count(self, pdf_path: Path) -> int:
         """PDF 페이지 수 반환
@@ -51,6 +107,8 @@ class PDFExtractor:
         Returns:
             페이지 수
         """
+        import pdfplumber
+
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 return len(pdf.pages)
@@ -58,6 +116,7 @@ class PDFExtractor:
             print(f"Error getting page count from {pdf_path.name}: {e}")
             return 0
 
+    @timed()
     def process_pdf(self, pdf_path: Path) -> Optional[Dict]:
         """PDF 파일 처리하고 JSON으로 저장
 
@@ -69,11 +128,32 @@ class PDFExtractor:
         """
         print(f"Processing: {pdf_path.name}")
 
-        # 텍스트 추출
-        text = self.extract_text(pdf_path)
+        # 텍스트 추출 (스캔 페이지는 OCR 완료까지 대기)
+        pages, scanned = self.extract_pages(pdf_path)
+        ocr_pages = self.collect_ocr(pdf_path, pages, self.submit_ocr(pdf_path, scanned))
+        return self.save(pdf_path, pages, scanned, ocr_pages)
+
+    def save(self, pdf_path: Path, pages: List[str], scanned: List[int],
+             ocr_pages: List[int]) -> Optional[Dict]:
+        """추출된 페이지를 JSON으로 저장
+
+        Args:
+            pdf_path: PDF 파일 경로
+            pages: 페이지별 텍스트
+            scanned: 스캔 페이지 번호
+            ocr_pages: OCR로 인식한 페이지 번호
+
+        Returns:
+            처리 결과 딕셔너리
+        """
+        text = self.join_pages(pages)
 
         if not text:
-            print(f"Warning: No text extracted from {pdf_path.name}")
+            if scanned and not ocr_pages:
+                print(f"Warning: No text extracted from {pdf_path.name} "
+                      f"({len(scanned)} scanned pages, OCR unavailable)")
+            else:
+                print(f"Warning: No text extracted from {pdf_path.name}")
             return None
 
         # 메타데이터 생성
@@ -81,7 +161,9 @@ class PDFExtractor:
             'source': str(pdf_path),
             'filename': pdf_path.name,
             'extracted_at': datetime.now().isoformat(),
-            'page_count': self.get_page_count(pdf_path),
+            'page_count': len(pages),
+            'scanned_pages': scanned,
+            'ocr_pages': ocr_pages,
             'text_length': len(text),
             'text': text
         }
@@ -113,9 +195,27 @@ class PDFExtractor:
         print(f"Found {len(pdf_files)} PDF files")
         print("-" * 50)
 
+        # 텍스트 PDF는 바로 저장하고, 스캔 페이지가 있는 PDF는 OCR을 등록만 해 두고 나중에 저장
+        # (OCR이 텍스트 PDF 처리를 막지 않음)
         results = []
+        pending = []
         for pdf_file in pdf_files:
-            result = self.process_pdf(pdf_file)
+            print(f"Processing: {pdf_file.name}")
+            pages, scanned = self.extract_pages(pdf_file)
+            futures = self.submit_ocr(pdf_file, scanned)
+            if futures:
+                pending.append((pdf_file, pages, scanned, futures))
+                continue
+            result = self.save(pdf_file, pages, scanned, [])
+            if result:
+                results.append(result)
+
+        if pending:
+            print(f"Waiting for OCR: {len(pending)} files, "
+                  f"{sum(len(futures) for _, _, _, futures in pending)} pages")
+        for pdf_file, pages, scanned, futures in pending:
+            ocr_pages = self.collect_ocr(pdf_file, pages, futures)
+            result = self.save(pdf_file, pages, scanned, ocr_pages)
             if result:
                 results.append(result)
 
@@ -132,19 +232,22 @@ def main():
     input_dir = base_dir / 'data' / 'raw' / 'documents' / 'standard_contracts'
     output_dir = base_dir / 'data' / 'processed' / 'documents' / 'standard_contracts'
 
-    # PDF 추출 실행
-    extractor = PDFExtractor(
-        input_dir=str(input_dir),
-        output_dir=str(output_dir)
-    )
+    # PDF 추출 실행 (스캔 페이지는 Tesseract가 설치되어 있으면 OCR)
+    with OCRPool(workers=2) as ocr:
+        extractor = PDFExtractor(
+            input_dir=str(input_dir),
+            output_dir=str(output_dir),
+            ocr=ocr
+        )
 
-    results = extractor.process_all()
+        results = extractor.process_all()
 
     # 요약 출력
     if results:
         print("\n=== Extraction Summary ===")
         for result in results:
-            print(f"- {result['filename']}: {result['page_count']} pages, {result['text_length']} characters")
+            ocr_note = f", {len(result['ocr_pages'])} OCR pages" if result['ocr_pages'] else ""
+            print(f"- {result['filename']}: {result['page_count']} pages, {result['text_length']} characters{ocr_note}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,549 @@
+"""
+전처리 파이프라인 실행기 (증분 실행)
+
+pdf_extractor.py → text_normalizer.py → chunker.py → embedder.py / extract_contract_fields.py
+다섯 단계를 의존성 그래프(DAG)로 묶어 실행합니다.
+
+    extract ──▶ normalize ──▶ chunk ──┬──▶ embed
+                                      └──▶ fields
+
+- 각 단계의 입력/출력을 내용 해시(sha256)로 기록해, 입력과 코드가 그대로인 단계는 건너뜀
+- 단계 안에서도 바뀐 항목만 다시 처리
+    extract:   PDF 파일별
+    normalize: 추출 문서별 (문서 해시 + text_normalizer.py 코드 해시)
+    chunk:     정규화 문서별 (문서 해시 + chunker.py 코드 해시)
+    embed:     청크별 (임베딩 입력 텍스트 + 모델 이름), 새 청크만 인코딩
+    fields:    표준근로계약서 청크 내용 (chunk_id 제외)
+- 선행 단계가 끝난 단계는 동시에 실행 (embed와 fields)
+- 실행 후 단계별 소요 시간, 실행/캐시 항목 수 리포트 출력
+
+상태 파일: ai/data/processed/.pipeline/state.json
+
+사용법:
+    python pipeline.py                   # 바뀐 부분만 실행
+    python pipeline.py --stages fields   # fields와 선행 단계만
+    python pipeline.py --force chunk     # chunk 단계 캐시 무시 (이후 단계는 출력이 바뀐 경우만)
+    python pipeline.py --metrics metrics.json --profile pipeline.pstats   # 계측/프로파일 저장
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from chunker import DocumentChunker
+from embedder import DocumentEmbedder
+from embedding_backend import BACKENDS
+import metrics
+from extract_contract_fields import build_contract_requirements, extract_fields_from_chunks
+from ocr import OCRPool
+from pdf_extractor import PDFExtractor
+from text_normalizer import normalize_document
+
+
+# 단계 정의
+#   deps: 선행 단계, code: 결과에 영향을 주는 코드 파일 (바뀌면 단계 재실행)
+STAGES = {
+    "extract": {"deps": [], "code": ["pdf_extractor.py", "ocr.py"], "label": "PDF 텍스트 추출"},
+    "normalize": {"deps": ["extract"], "code": ["text_normalizer.py", "boilerplate.py"], "label": "텍스트 정규화"},
+    "chunk": {"deps": ["normalize"], "code": ["chunker.py"], "label": "청킹"},
+    "embed": {"deps": ["chunk"], "code": ["embedder.py", "embedding_backend.py"], "label": "임베딩"},
+    "fields": {"deps": ["chunk"], "code": ["extract_contract_fields.py"], "label": "필수 필드 추출"},
+}
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_json(obj) -> str:
+    return sha256_bytes(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+
+def write_json(path: Path, data, indent: Optional[int] = 2):
+    """tmp 파일에 쓴 뒤 교체 (중단되어도 이전 파일 유지)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+class PipelineState:
+    """단계별 입력/출력 해시 기록
+
+    파일 해시는 (크기, 수정 시각)이 같으면 이전 값을 재사용해 큰 파일을 매번 읽지 않습니다.
+    """
+
+    def __init__(self, state_file: Path):
+        self.state_file = Path(state_file)
+        self.state = {"files": {}, "stages": {}}
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: Path) -> Optional[str]:
+        """파일 내용 해시 (파일이 없으면 None)"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = str(path)
+        with self._lock:
+            cached = self.state["files"].get(key)
+            if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+                return cached["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+
+        with self._lock:
+            self.state["files"][key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest.hexdigest(),
+            }
+        return digest.hexdigest()
+
+    def stage(self, name: str) -> Dict:
+        """단계 상태 사본 (단계 스레드는 사본을 고치고, 메인 스레드가 set_stage로 반영)"""
+        with self._lock:
+            return copy.deepcopy(self.state["stages"].get(name, {}))
+
+    def set_stage(self, name: str, stage_state: Dict):
+        with self._lock:
+            self.state["stages"][name] = stage_state
+
+    def save(self):
+        with self._lock:
+            write_json(self.state_file, self.state)
+
+
+class PreprocessingPipeline:
+    """extract → chunk → embed / fields 증분 실행기"""
+
+    def __init__(self, base_dir: Path, model_name: str = "nlpai-lab/KURE-v1", batch_size: int = 8,
+                 ocr_workers: int = 2, backend: str = "torch"):
+        """
+        Args:
+            base_dir: ai/ 디렉토리
+            model_name: 임베딩 모델 (바뀌면 embed 단계 재실행)
+            batch_size: 임베딩 배치 크기
+            ocr_workers: 스캔 페이지 OCR 동시 실행 수 (0이면 OCR 끔)
+            backend: 임베딩 추론 백엔드 (torch 외 백엔드는 캐시를 따로 씀)
+        """
+        self.base_dir = Path(base_dir)
+        self.raw_dir = self.base_dir / "data" / "raw" / "documents" / "standard_contracts"
+        self.documents_dir = self.base_dir / "data" / "processed" / "documents" / "standard_contracts"
+        self.normalized_dir = self.base_dir / "data" / "processed" / "normalized" / "standard_contracts"
+        self.chunks_dir = self.base_dir / "data" / "processed" / "chunks"
+        self.embeddings_dir = self.base_dir / "data" / "processed" / "embeddings"
+        self.fields_file = self.base_dir / "data" / "processed" / "required_contract_fields.json"
+        self.cache_dir = self.base_dir / "data" / "processed" / ".pipeline"
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.ocr_workers = ocr_workers
+        self.backend = backend
+
+        self.code_dir = Path(__file__).parent
+        self.state = PipelineState(self.cache_dir / "state.json")
+        self.report: Dict[str, Dict] = {}
+
+    # ------------------------------------------------------------------
+    # 실행기
+    # ------------------------------------------------------------------
+
+    def run(self, stages: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> Dict[str, Dict]:
+        """파이프라인 실행
+
+        Args:
+            stages: 실행할 단계 (선행 단계 포함, 기본: 전체)
+            force: 캐시를 무시하고 다시 실행할 단계
+
+        Returns:
+            단계별 리포트
+        """
+        selected = self._with_dependencies(stages or list(STAGES))
+        force = set(force)
+        self.report = {}
+
+        print(f"\n전처리 파이프라인 시작: {' → '.join(selected)}")
+        start = time.perf_counter()
+
+        pending = list(selected)
+        running = {}
+        with ThreadPoolExecutor(max_workers=len(selected), thread_name_prefix="pipeline") as executor:
+            while pending or running:
+                for name in list(pending):
+                    deps = [d for d in STAGES[name]["deps"] if d in selected]
+                    if any(self.report.get(d, {}).get("status") in ("failed", "skipped") for d in deps):
+                        pending.remove(name)
+                        self.report[name] = {"status": "skipped", "seconds": 0.0,
+                                             "items_run": 0, "items_cached": 0}
+                    elif all(d in self.report for d in deps):
+                        pending.remove(name)
+                        running[executor.submit(self._run_stage, name, name in force)] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    # 단계 상태는 메인 스레드에서만 반영 (save가 직렬화하는 중에 바뀌지 않도록)
+                    self.report[name], stage_state = future.result()
+                    self.state.set_stage(name, stage_state)
+                    self.state.save()
+
+        self._print_report(selected, time.perf_counter() - start)
+        return self.report
+
+    def _with_dependencies(self, stages: Iterable[str]) -> List[str]:
+        """선행 단계를 포함해 위상 정렬된 단계 목록"""
+        needed = set()
+
+        def visit(name):
+            if name not in needed:
+                needed.add(name)
+                for dep in STAGES[name]["deps"]:
+                    visit(dep)
+
+        for name in stages:
+            visit(name)
+        return [name for name in STAGES if name in needed]
+
+    def _run_stage(self, name: str, force: bool) -> Tuple[Dict, Dict]:
+        """단계 하나 실행 (입력 지문과 출력 해시가 그대로면 건너뜀)
+
+        Returns:
+            (단계 리포트, 갱신된 단계 상태 사본)
+        """
+        stage_state = self.state.stage(name)
+        fingerprint = self._fingerprint(name)
+        start = time.perf_counter()
+
+        if not force and stage_state.get("fingerprint") == fingerprint and self._outputs_intact(stage_state):
+            return {"status": "cached", "seconds": time.perf_counter() - start,
+                    "items_run": 0, "items_cached": stage_state.get("item_count", 0)}, stage_state
+
+        try:
+            with metrics.timer(f"stage_{name}"):
+                result = getattr(self, f"_run_{name}")(stage_state, force)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            # 실패 전까지 처리한 항목 기록은 유지 (지문은 그대로라 다음 실행에서 재시도)
+            return {"status": "failed", "seconds": time.perf_counter() - start,
+                    "items_run": 0, "items_cached": 0, "error": str(e)}, stage_state
+
+        outputs = {str(path): self.state.file_hash(path) for path in result.pop("outputs")}
+        stage_state.update({
+            "fingerprint": fingerprint,
+            "outputs": outputs,
+            "output_hash": sha256_json(outputs),
+            "item_count": result["items_run"] + result["items_cached"],
+        })
+        return {"status": "run", "seconds": time.perf_counter() - start, **result}, stage_state
+
+    def _fingerprint(self, name: str) -> str:
+        """단계 입력 지문: 코드 해시 + 설정 + 선행 단계 출력 해시 (+ extract는 원본 PDF 해시)"""
+        spec = STAGES[name]
+        inputs = {
+            "code": {f: self.state.file_hash(self.code_dir / f) for f in spec["code"]},
+            "deps": {d: self.state.stage(d).get("output_hash") for d in spec["deps"]},
+        }
+        if name == "extract":
+            inputs["pdfs"] = {str(p.relative_to(self.raw_dir)): self.state.file_hash(p)
+                              for p in sorted(self.raw_dir.glob('**/*.pdf'))}
+        if name == "normalize":
+            inputs["documents"] = {p.name: self.state.file_hash(p) for p in sorted(self.documents_dir.glob('*.json'))}
+        if name == "chunk":
+            # 추출 결과를 직접 수정하거나 추가한 경우도 반영
+            chunker = DocumentChunker(str(self.normalized_dir), str(self.chunks_dir))
+            inputs["documents"] = {f: self.state.file_hash(self.normalized_dir / f)
+                                   for f in chunker.chunk_functions(include_standard_contract=True)}
+        if name == "embed":
+            inputs["model"] = self.model_name
+            if self.backend != "torch":
+                inputs["backend"] = self.backend
+        return sha256_json(inputs)
+
+    def _outputs_intact(self, stage_state: Dict) -> bool:
+        """기록된 출력 파일이 모두 있고 내용이 그대로인지"""
+        outputs = stage_state.get("outputs")
+        if outputs is None:
+            return False
+        return all(self.state.file_hash(Path(path)) == digest for path, digest in outputs.items())
+
+    def _print_report(self, stages: List[str], elapsed: float):
+        labels = {"run": "실행", "cached": "캐시", "failed": "실패", "skipped": "건너뜀"}
+
+        print("\n" + "="*60)
+        print("전처리 파이프라인 리포트")
+        print("="*60)
+        print(f"{'단계':<10}{'상태':<8}{'실행':>8}{'캐시':>8}{'시간(초)':>12}")
+        print("-"*60)
+        for name in stages:
+            r = self.report[name]
+            print(f"{name:<10}{labels[r['status']]:<8}{r['items_run']:>8}{r['items_cached']:>8}"
+                  f"{r['seconds']:>12.2f}")
+            if r.get("error"):
+                print(f"  오류: {r['error']}")
+        print("-"*60)
+        print(f"전체 소요: {elapsed:.2f}초 (embed와 fields는 동시 실행)")
+        print("="*60)
+
+    # ------------------------------------------------------------------
+    # 단계
+    # ------------------------------------------------------------------
+
+    def _run_extract(self, stage_state: Dict, force: bool) -> Dict:
+        """PDF별 텍스트 추출 (PDF 해시가 바뀐 파일만)
+
+        스캔 페이지가 있는 PDF는 OCR을 등록만 해 두고 텍스트 PDF를 먼저 끝낸 뒤 저장합니다.
+        """
+        items = stage_state.setdefault("items", {})
+
+        pdfs = {str(p.relative_to(self.raw_dir)): p for p in sorted(self.raw_dir.glob('**/*.pdf'))}
+        run = cached = 0
+
+        def record(key: str, pdf_path: Path, input_hash: str, result: Optional[Dict]):
+            nonlocal run
+            if result is None:
+                items.pop(key, None)
+                return
+            output_file = self.documents_dir / f"{pdf_path.stem}.json"
+            items[key] = {"input": input_hash, "output": self.state.file_hash(output_file)}
+            run += 1
+
+        with OCRPool(workers=self.ocr_workers) as ocr:
+            extractor = PDFExtractor(str(self.raw_dir), str(self.documents_dir), ocr=ocr)
+            pending = []
+            for key, pdf_path in pdfs.items():
+                output_file = self.documents_dir / f"{pdf_path.stem}.json"
+                input_hash = self.state.file_hash(pdf_path)
+                previous = items.get(key)
+
+                if (not force and previous and previous["input"] == input_hash
+                        and self.state.file_hash(output_file) == previous["output"]):
+                    cached += 1
+                    continue
+
+                pages, scanned = extractor.extract_pages(pdf_path)
+                futures = extractor.submit_ocr(pdf_path, scanned)
+                if futures:
+                    pending.append((key, pdf_path, input_hash, pages, scanned, futures))
+                    continue
+                record(key, pdf_path, input_hash, extractor.save(pdf_path, pages, scanned, []))
+
+            for key, pdf_path, input_hash, pages, scanned, futures in pending:
+                ocr_pages = extractor.collect_ocr(pdf_path, pages, futures)
+                record(key, pdf_path, input_hash, extractor.save(pdf_path, pages, scanned, ocr_pages))
+
+        # 원본 PDF가 삭제된 문서는 추출 결과도 제거
+        for key in set(items) - set(pdfs):
+            (self.documents_dir / f"{Path(key).stem}.json").unlink(missing_ok=True)
+            del items[key]
+
+        outputs = [self.documents_dir / f"{Path(key).stem}.json" for key in sorted(items)]
+        return {"items_run": run, "items_cached": cached, "outputs": outputs}
+
+    def _run_normalize(self, stage_state: Dict, force: bool) -> Dict:
+        """추출 문서별 텍스트 정규화 (문서 또는 text_normalizer.py/boilerplate.py가 바뀐 문서만)"""
+        code_hash = sha256_json([self.state.file_hash(self.code_dir / f) for f in STAGES["normalize"]["code"]])
+        items = stage_state.setdefault("items", {})
+
+        documents = {p.name: p for p in sorted(self.documents_dir.glob('*.json'))}
+        run = cached = 0
+        chars_before = chars_after = 0
+        for filename, document_path in documents.items():
+            output_file = self.normalized_dir / filename
+            input_hash = sha256_json([self.state.file_hash(document_path), code_hash])
+            previous = items.get(filename)
+
+            if (not force and previous and previous["input"] == input_hash
+                    and self.state.file_hash(output_file) == previous["output"]):
+                cached += 1
+                continue
+
+            with open(document_path, 'r', encoding='utf-8') as f:
+                document = normalize_document(json.load(f))
+            write_json(output_file, document)
+            items[filename] = {"input": input_hash, "output": self.state.file_hash(output_file)}
+            chars_before += document["normalization"]["chars_before"]
+            chars_after += document["normalization"]["chars_after"]
+            run += 1
+
+        # 추출 문서가 삭제된 경우 정규화 결과도 제거
+        for filename in set(items) - set(documents):
+            (self.normalized_dir / filename).unlink(missing_ok=True)
+            del items[filename]
+
+        if run:
+            print(f"정규화: {run}개 문서, {chars_before:,} → {chars_after:,}자")
+        outputs = [self.normalized_dir / filename for filename in sorted(items)]
+        return {"items_run": run, "items_cached": cached, "outputs": outputs}
+
+    def _run_chunk(self, stage_state: Dict, force: bool) -> Dict:
+        """문서별 청킹 (문서 또는 chunker.py가 바뀐 문서만), 결과를 all_chunks.json으로 합침"""
+        chunker = DocumentChunker(str(self.normalized_dir), str(self.chunks_dir))
+        code_hash = self.state.file_hash(self.code_dir / "chunker.py")
+        items = stage_state.setdefault("items", {})
+        chunk_cache_dir = self.cache_dir / "chunks"
+
+        all_chunks, contract_chunks = [], []
+        run = cached = 0
+        for filename, chunk_func in chunker.chunk_functions(include_standard_contract=True).items():
+            filepath = self.normalized_dir / filename
+            document_hash = self.state.file_hash(filepath)
+            if document_hash is None:
+                print(f"파일 없음: {filename}")
+                items.pop(filename, None)
+                continue
+
+            input_hash = sha256_json([document_hash, code_hash])
+            cache_file = chunk_cache_dir / f"{filepath.stem}.json"
+            previous = items.get(filename)
+
+            if (not force and previous and previous["input"] == input_hash
+                    and self.state.file_hash(cache_file) == previous["output"]):
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    chunks = json.load(f)
+                cached += 1
+            else:
+                print(f"청킹: {filename}")
+                chunks = chunk_func(filepath)
+                write_json(cache_file, chunks, indent=None)
+                items[filename] = {"input": input_hash, "output": self.state.file_hash(cache_file)}
+                run += 1
+
+            if filename == chunker.STANDARD_CONTRACT_FILE:
+                contract_chunks.extend(chunks)
+            else:
+                all_chunks.extend(chunks)
+
+        all_chunks_file = self.chunks_dir / "all_chunks.json"
+        contract_chunks_file = self.cache_dir / "standard_contract_chunks.json"
+        write_json(all_chunks_file, all_chunks)
+        write_json(contract_chunks_file, contract_chunks)
+        chunker._save_metadata(all_chunks)
+        print(f"총 {len(all_chunks)}개 청크 (표준근로계약서 {len(contract_chunks)}개 별도)")
+
+        return {"items_run": run, "items_cached": cached,
+                "outputs": [all_chunks_file, contract_chunks_file]}
+
+    def _run_embed(self, stage_state: Dict, force: bool) -> Dict:
+        """청크별 임베딩 (입력 텍스트 + 모델 + 코드 해시 캐시에 없는 청크만 인코딩)"""
+        with open(self.chunks_dir / "all_chunks.json", 'r', encoding='utf-8') as f:
+            chunks = json.load(f)
+
+        embedder = DocumentEmbedder(model_name=self.model_name, batch_size=self.batch_size, backend=self.backend)
+        texts = [embedder.build_text(chunk) for chunk in chunks]
+        # 백엔드 코드(풀링, 정규화, 양자화)가 바뀌면 캐시된 벡터도 다시 만듦
+        code_hash = sha256_json([self.state.file_hash(self.code_dir / f) for f in STAGES["embed"]["code"]])
+        keys = [sha256_bytes(f"{embedder.cache_key}\n{code_hash}\n{text}".encode("utf-8")) for text in texts]
+
+        cache_keys_file = self.cache_dir / "embeddings" / "keys.json"
+        cache_vectors_file = self.cache_dir / "embeddings" / "vectors.npy"
+        cache = {}
+        if not force and cache_keys_file.exists() and cache_vectors_file.exists():
+            with open(cache_keys_file, 'r', encoding='utf-8') as f:
+                cached_keys = json.load(f)
+            vectors = np.load(cache_vectors_file)
+            cache = {key: vectors[i] for i, key in enumerate(cached_keys)}
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cache and key not in missing:
+                missing[key] = text
+
+        if missing:
+            print(f"임베딩 생성: {len(missing)}개 (캐시 {len(chunks) - sum(k in missing for k in keys)}개)")
+            vectors = embedder.encode_texts(list(missing.values()), show_progress_bar=True)
+            cache.update(zip(missing, vectors))
+
+        embeddings = np.stack([cache[key] for key in keys]) if chunks else np.zeros((0, 0), dtype=np.float32)
+        embedder.save_embeddings(chunks, embeddings, self.embeddings_dir)
+
+        # 현재 청크에 해당하는 벡터만 남겨 캐시 크기 유지
+        current = list(dict.fromkeys(keys))
+        write_json(cache_keys_file, current, indent=None)
+        np.save(cache_vectors_file, np.stack([cache[key] for key in current]) if current else embeddings)
+
+        items_run = sum(key in missing for key in keys)
+        return {"items_run": items_run, "items_cached": len(chunks) - items_run,
+                "outputs": [self.embeddings_dir / "chunks_with_embeddings.json",
+                            self.embeddings_dir / "embeddings.npy"]}
+
+    def _run_fields(self, stage_state: Dict, force: bool) -> Dict:
+        """표준근로계약서 청크 → 계약 유형별 필수 필드 (청크 내용이 바뀐 경우만)"""
+        with open(self.cache_dir / "standard_contract_chunks.json", 'r', encoding='utf-8') as f:
+            chunks = json.load(f)
+
+        # chunk_id는 청킹할 때마다 새로 만들어지므로 내용만 비교
+        input_hash = sha256_json({
+            "chunks": [{k: v for k, v in chunk.items() if k != "chunk_id"} for chunk in chunks],
+            "code": self.state.file_hash(self.code_dir / "extract_contract_fields.py"),
+        })
+        previous = stage_state.get("items", {}).get("fields")
+        if (not force and previous and previous["input"] == input_hash
+                and self.state.file_hash(self.fields_file) == previous["output"]):
+            return {"items_run": 0, "items_cached": 1, "outputs": [self.fields_file]}
+
+        fields_by_type = extract_fields_from_chunks(chunks)
+        write_json(self.fields_file, build_contract_requirements(fields_by_type))
+        stage_state["items"] = {"fields": {"input": input_hash, "output": self.state.file_hash(self.fields_file)}}
+        return {"items_run": 1, "items_cached": 0, "outputs": [self.fields_file]}
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="전처리 파이프라인 증분 실행")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=None,
+                        help="실행할 단계 (선행 단계 포함, 기본: 전체)")
+    parser.add_argument("--force", nargs="+", choices=list(STAGES) + ["all"], default=[],
+                        help="캐시를 무시하고 다시 실행할 단계")
+    parser.add_argument("--model", default="nlpai-lab/KURE-v1", help="임베딩 모델")
+    parser.add_argument("--batch-size", type=int, default=8, help="임베딩 배치 크기")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="torch", help="임베딩 추론 백엔드")
+    parser.add_argument("--ocr-workers", type=int, default=2, help="스캔 페이지 OCR 동시 실행 수 (0이면 OCR 끔)")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="단계/함수별 계측 결과 저장 경로 (.json 또는 .prom)")
+    parser.add_argument("--profile", type=Path, default=None, help="cProfile 결과(pstats) 저장 경로")
+    args = parser.parse_args()
+
+    force = list(STAGES) if "all" in args.force else args.force
+    if args.metrics:
+        metrics.enable()
+
+    pipeline = PreprocessingPipeline(Path(__file__).parent.parent,
+                                     model_name=args.model, batch_size=args.batch_size,
+                                     ocr_workers=args.ocr_workers, backend=args.backend)
+    with metrics.profile(args.profile):
+        report = pipeline.run(stages=args.stages, force=force)
+
+    if args.metrics:
+        metrics.print_summary()
+        metrics.METRICS.write(args.metrics)
+        print(f"계측 결과 저장: {args.metrics}")
+
+    if any(r["status"] == "failed" for r in report.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
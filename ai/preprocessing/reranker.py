@@ -0,0 +1,205 @@
+"""
+Cross-encoder 재순위화
+
+bi-encoder(KURE) 검색으로 뽑은 상위 N개 후보만 cross-encoder로 다시 점수화합니다.
+- 비용 상한: 후보 수 N(max_candidates)과 지연 예산(latency_budget_ms)
+- 후보는 batch_size 단위로 묶어 predict 호출
+- 예산을 넘길 것으로 예상되면 남은 후보는 bi-encoder 순서 그대로 뒤에 붙임
+- top_k가 N보다 크면 N개 밖의 결과도 bi-encoder 순서 그대로 뒤에 붙여 top_k개를 반환
+
+사용법:
+    python reranker.py                  # 사전 정의 쿼리로 precision@k / 지연 시간 비교
+    python reranker.py --candidates 30 --budget-ms 200
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+
+class CrossEncoderReranker:
+    """로컬 cross-encoder 기반 재순위화기"""
+
+    def __init__(self, model_name: str = "Dongjin-kr/ko-reranker", max_candidates: int = 30,
+                 batch_size: int = 16, latency_budget_ms: float = 300.0, max_length: int = 512):
+        """
+        Args:
+            model_name: cross-encoder 모델 (로컬 캐시 또는 HF 모델명)
+            max_candidates: 재순위화할 최대 후보 수 (N)
+            batch_size: predict 배치 크기
+            latency_budget_ms: 재순위화 지연 예산 (ms)
+            max_length: (query, passage) 쌍 최대 토큰 길이
+        """
+        self.model_name = model_name
+        self.max_candidates = max_candidates
+        self.batch_size = batch_size
+        self.latency_budget_ms = latency_budget_ms
+        self.max_length = max_length
+        self._model = None
+
+        self.last_stats: Dict = {}
+
+    @property
+    def model(self):
+        """cross-encoder 모델 (첫 사용 시 로딩)"""
+        if self._model is None:
+            from sentence_transformers import CrossEncoder
+
+            print(f"Cross-encoder 로딩 중: {self.model_name}")
+            self._model = CrossEncoder(self.model_name, max_length=self.max_length)
+        return self._model
+
+    def rerank(self, query: str, results: List[Dict], top_k: int = 5) -> List[Dict]:
+        """
+        검색 결과 재순위화
+
+        Args:
+            query: 검색 쿼리
+            results: EmbeddingTester.search_by_embedding 결과 (similarity 내림차순)
+            top_k: 반환할 결과 수
+
+        Returns:
+            rerank_score가 추가된 결과 (rank 재부여). 예산 초과로 점수화하지 못한
+            후보와 max_candidates 밖의 결과(top_k > max_candidates일 때)는
+            rerank_score=None으로 점수화된 후보 뒤에 원래 순서대로 붙음
+        """
+        candidates = results[:self.max_candidates]
+        started = time.perf_counter()
+
+        scores = []
+        batch_times = []
+        for start in range(0, len(candidates), self.batch_size):
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            expected_ms = max(batch_times) if batch_times else 0.0
+            if batch_times and elapsed_ms + expected_ms > self.latency_budget_ms:
+                break
+
+            batch = candidates[start:start + self.batch_size]
+            batch_started = time.perf_counter()
+            pairs = [(query, result["chunk"]["content"]) for result in batch]
+            scores.extend(self.model.predict(pairs, batch_size=self.batch_size).tolist())
+            batch_times.append((time.perf_counter() - batch_started) * 1000)
+
+        scored = candidates[:len(scores)]
+        order = np.argsort(scores)[::-1] if scores else []
+
+        reranked = []
+        for idx in order:
+            reranked.append({**scored[idx], "rerank_score": float(scores[idx])})
+        for result in results[len(scores):max(top_k, len(candidates))]:
+            reranked.append({**result, "rerank_score": None})
+
+        reranked = reranked[:top_k]
+        for rank, result in enumerate(reranked, 1):
+            result["dense_rank"] = result["rank"]
+            result["rank"] = rank
+
+        self.last_stats = {
+            "candidates": len(candidates),
+            "scored": len(scores),
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "budget_exhausted": len(scores) < len(candidates),
+        }
+        return reranked
+
+
+def precision_at_k(results: List[Dict], relevant_categories: List[str], k: int) -> float:
+    """상위 k개 중 정답 카테고리 비율"""
+    if k == 0:
+        return 0.0
+    hits = sum(1 for result in results[:k]
+               if result["chunk"].get("category") in relevant_categories)
+    return hits / k
+
+
+def evaluate(tester, reranker: CrossEncoderReranker, test_cases: List[Dict], k: int = 3) -> Dict:
+    """사전 정의 쿼리로 dense vs dense+rerank 비교"""
+    rows = []
+
+    for test in test_cases:
+        filters = test.get("filters")
+
+        started = time.perf_counter()
+        query_embedding = tester.encode_queries([test["query"]])[0]
+        candidates = tester.search_by_embedding(
+            query_embedding, top_k=reranker.max_candidates, filters=filters
+        )
+        dense_ms = (time.perf_counter() - started) * 1000
+
+        reranked = reranker.rerank(test["query"], candidates, top_k=k)
+        rerank_ms = reranker.last_stats["elapsed_ms"]
+
+        rows.append({
+            "query": test["query"],
+            "dense_p": precision_at_k(candidates, test["relevant_categories"], k),
+            "rerank_p": precision_at_k(reranked, test["relevant_categories"], k),
+            "dense_ms": dense_ms,
+            "rerank_ms": rerank_ms,
+            "scored": reranker.last_stats["scored"],
+            "candidates": reranker.last_stats["candidates"],
+        })
+
+    print("\n" + "=" * 90)
+    print(f"재순위화 평가 (precision@{k}, 후보 N={reranker.max_candidates}, "
+          f"예산={reranker.latency_budget_ms:.0f}ms)")
+    print("=" * 90)
+    print(f"{'쿼리':<30}{'dense P':>9}{'rerank P':>10}{'dense ms':>10}{'rerank ms':>11}{'점수화':>9}")
+    print("-" * 90)
+    for row in rows:
+        print(f"{row['query'][:28]:<30}{row['dense_p']:>9.2f}{row['rerank_p']:>10.2f}"
+              f"{row['dense_ms']:>10.1f}{row['rerank_ms']:>11.1f}"
+              f"{row['scored']:>5}/{row['candidates']:<3}")
+
+    summary = {
+        "dense_precision": float(np.mean([r["dense_p"] for r in rows])),
+        "rerank_precision": float(np.mean([r["rerank_p"] for r in rows])),
+        "dense_ms_mean": float(np.mean([r["dense_ms"] for r in rows])),
+        "rerank_ms_mean": float(np.mean([r["rerank_ms"] for r in rows])),
+        "rerank_ms_max": float(np.max([r["rerank_ms"] for r in rows])),
+    }
+    print("-" * 90)
+    print(f"{'평균':<30}{summary['dense_precision']:>9.2f}{summary['rerank_precision']:>10.2f}"
+          f"{summary['dense_ms_mean']:>10.1f}{summary['rerank_ms_mean']:>11.1f}")
+    print(f"재순위화 최대 지연: {summary['rerank_ms_max']:.1f}ms")
+    print("=" * 90)
+
+    return {"rows": rows, "summary": summary}
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    from test_embeddings import EmbeddingTester, PRESET_TEST_CASES
+
+    project_root = Path(__file__).parent.parent.parent
+    default_embeddings_dir = project_root / "ai/data/processed/embeddings"
+
+    parser = argparse.ArgumentParser(description="Cross-encoder 재순위화 평가")
+    parser.add_argument("--embeddings-dir", default=str(default_embeddings_dir))
+    parser.add_argument("--model", default="Dongjin-kr/ko-reranker")
+    parser.add_argument("--candidates", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    tester = EmbeddingTester(args.embeddings_dir)
+    reranker = CrossEncoderReranker(
+        model_name=args.model,
+        max_candidates=args.candidates,
+        batch_size=args.batch_size,
+        latency_budget_ms=args.budget_ms
+    )
+
+    # 모델 로딩 시간이 측정에 섞이지 않도록 예열
+    tester.encode_queries(["warmup"])
+    reranker.model.predict([("warmup", "warmup")])
+
+    evaluate(tester, reranker, PRESET_TEST_CASES, k=args.k)
+
+
+if __name__ == "__main__":
+    main()
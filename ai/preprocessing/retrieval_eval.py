@@ -0,0 +1,245 @@
+"""
+검색 품질/지연 평가 (정답 쿼리 세트, 비대화형)
+
+정답이 표시된 쿼리 세트를 여러 검색 구성(config)에 돌려
+recall@k, MRR, nDCG@k와 쿼리 지연 p50/p99, 처리량(쿼리/초)을 한 표로 비교합니다.
+양자화, 근사 검색, 캐시 같은 속도 최적화가 검색 품질을 떨어뜨리는지 확인하는 용도입니다.
+
+정답 쿼리 파일 (.json 배열 또는 .jsonl):
+    {"query": "...", "filters": {...},
+     "relevant_chunk_ids": [...], "relevant_sources": [...], "relevant_categories": [...]}
+    세 기준 중 하나라도 맞으면 정답으로 봅니다. 파일을 주지 않으면 PRESET_TEST_CASES를 사용합니다.
+
+검색 구성은 "이름:엔진[@임베딩 백엔드][:임베딩 디렉토리]" 형식이며 엔진은 ENGINES에 등록된 것을 씁니다.
+
+사용법:
+    python retrieval_eval.py
+    python retrieval_eval.py --queries golden_queries.jsonl --k 5 --config base:dense --config rr:rerank
+    python retrieval_eval.py --config old:dense:../data/processed/embeddings_v1 --config new:dense --output eval.json
+    python retrieval_eval.py --config fp32:dense --config int8:dense@onnx-int8
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+DEFAULT_EMBEDDINGS_DIR = Path(__file__).parent.parent / "data" / "processed" / "embeddings"
+
+
+def build_dense(embeddings_dir: Path, args) -> Callable:
+    from test_embeddings import EmbeddingTester
+
+    tester = EmbeddingTester(str(embeddings_dir), model_name=args.model, backend=args.backend)
+    return _TesterEngine(tester, rerank=False)
+
+
+def build_multivector(embeddings_dir: Path, args) -> Callable:
+    from test_embeddings import EmbeddingTester
+
+    tester = EmbeddingTester(str(embeddings_dir), model_name=args.model, multivector=args.pooling,
+                             backend=args.backend)
+    return _TesterEngine(tester, rerank=False)
+
+
+def build_rerank(embeddings_dir: Path, args) -> Callable:
+    from reranker import CrossEncoderReranker
+    from test_embeddings import EmbeddingTester
+
+    reranker = CrossEncoderReranker(model_name=args.reranker_model)
+    tester = EmbeddingTester(str(embeddings_dir), model_name=args.model, reranker=reranker, backend=args.backend)
+    return _TesterEngine(tester, rerank=True)
+
+
+# 엔진 이름 → 생성 함수 (임베딩 디렉토리, CLI 인자) → engine(query, top_k, filters) -> 결과 목록
+ENGINES: Dict[str, Callable] = {
+    "dense": build_dense,
+    "rerank": build_rerank,
+    "multivector": build_multivector,
+}
+
+
+class _TesterEngine:
+    """EmbeddingTester.search를 평가용 엔진으로 감싸기"""
+
+    def __init__(self, tester, rerank: bool):
+        self.tester = tester
+        self.rerank = rerank
+        self.chunks = tester.chunks
+
+    def __call__(self, query: str, top_k: int, filters: Optional[dict]) -> List[Dict]:
+        return self.tester.search(query, top_k=top_k, filters=filters, verbose=False, rerank=self.rerank)
+
+
+def load_queries(path: Optional[Path]) -> List[Dict]:
+    """정답 쿼리 세트 로딩 (없으면 PRESET_TEST_CASES)"""
+    if path is None:
+        from test_embeddings import PRESET_TEST_CASES
+        return PRESET_TEST_CASES
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if Path(path).suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def is_relevant(chunk: Dict, case: Dict) -> bool:
+    if chunk.get("chunk_id") in case.get("relevant_chunk_ids", ()):
+        return True
+    if chunk.get("source") in case.get("relevant_sources", ()):
+        return True
+    return chunk.get("category") in case.get("relevant_categories", ())
+
+
+def count_relevant(chunks: List[Dict], case: Dict) -> int:
+    """인덱스 전체에서 (필터 적용 후) 정답 청크 수"""
+    filters = case.get("filters") or {}
+    return sum(1 for chunk in chunks
+               if all(chunk.get(key) == value for key, value in filters.items()) and is_relevant(chunk, case))
+
+
+def score_ranking(relevance: List[bool], total_relevant: int, k: int) -> Dict[str, float]:
+    """한 쿼리의 recall@k, reciprocal rank, nDCG@k (이진 정답)
+
+    recall@k는 min(k, 전체 정답 수)로 나눕니다. 카테고리 단위 정답은 전체 정답이 수백 개일 수 있어
+    그대로 나누면 상위 k개가 모두 정답이어도 값이 작게 나오기 때문입니다.
+    """
+    top = relevance[:k]
+    ideal = min(k, total_relevant)
+    hits = sum(top)
+
+    reciprocal_rank = 0.0
+    for rank, relevant in enumerate(relevance, 1):
+        if relevant:
+            reciprocal_rank = 1.0 / rank
+            break
+
+    dcg = sum(1.0 / math.log2(rank + 1) for rank, relevant in enumerate(top, 1) if relevant)
+    idcg = sum(1.0 / math.log2(rank + 1) for rank in range(1, ideal + 1))
+
+    return {
+        "recall": hits / ideal if ideal else 0.0,
+        "rr": reciprocal_rank,
+        "ndcg": dcg / idcg if idcg else 0.0,
+    }
+
+
+def evaluate_engine(engine: Callable, cases: List[Dict], k: int, chunks: Optional[List[Dict]] = None,
+                    warmup: int = 1) -> Dict:
+    """쿼리 세트를 순서대로 실행해 품질 지표와 지연 시간 측정
+
+    Args:
+        engine: (query, top_k, filters) -> [{"chunk": {...}, ...}, ...]
+        chunks: 전체 정답 수 계산용 인덱스 청크 (없으면 engine.chunks)
+        warmup: 측정 전에 실행할 쿼리 수 (모델 로딩/캐시 예열)
+    """
+    chunks = chunks if chunks is not None else getattr(engine, "chunks", [])
+    for case in cases[:warmup]:
+        engine(case["query"], k, case.get("filters"))
+
+    rows = []
+    started = time.perf_counter()
+    for case in cases:
+        query_started = time.perf_counter()
+        results = engine(case["query"], k, case.get("filters"))
+        latency_ms = (time.perf_counter() - query_started) * 1000
+
+        relevance = [is_relevant(result["chunk"], case) for result in results]
+        scores = score_ranking(relevance, count_relevant(chunks, case), k)
+        rows.append({"query": case["query"], "latency_ms": latency_ms, **scores})
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([row["latency_ms"] for row in rows]) if rows else np.zeros(1)
+    return {
+        "rows": rows,
+        "summary": {
+            "queries": len(rows),
+            f"recall@{k}": float(np.mean([row["recall"] for row in rows])) if rows else 0.0,
+            "mrr": float(np.mean([row["rr"] for row in rows])) if rows else 0.0,
+            f"ndcg@{k}": float(np.mean([row["ndcg"] for row in rows])) if rows else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "qps": len(rows) / elapsed if elapsed > 0 else 0.0,
+        },
+    }
+
+
+def print_comparison(results: Dict[str, Dict], k: int):
+    print("\n" + "=" * 86)
+    print(f"검색 평가 (k={k})")
+    print("=" * 86)
+    print(f"{'구성':<20}{'쿼리':>6}{f'recall@{k}':>11}{'MRR':>8}{f'nDCG@{k}':>10}"
+          f"{'p50(ms)':>10}{'p99(ms)':>10}{'쿼리/초':>10}")
+    print("-" * 86)
+    for name, result in results.items():
+        s = result["summary"]
+        print(f"{name:<20}{s['queries']:>6}{s[f'recall@{k}']:>11.3f}{s['mrr']:>8.3f}{s[f'ndcg@{k}']:>10.3f}"
+              f"{s['p50_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['qps']:>10.1f}")
+    print("=" * 86)
+
+
+def parse_config(spec: str) -> Dict:
+    """"이름:엔진[@백엔드][:임베딩 디렉토리]" → {"name", "engine", "backend", "embeddings_dir"}"""
+    from embedding_backend import BACKENDS
+
+    parts = spec.split(":", 2)
+    engine, _, backend = parts[1].partition("@") if len(parts) >= 2 else ("", "", "")
+    if engine not in ENGINES or (backend and backend not in BACKENDS):
+        raise ValueError(f"잘못된 구성: {spec} (형식: 이름:엔진[@백엔드][:임베딩 디렉토리], "
+                         f"엔진: {', '.join(ENGINES)}, 백엔드: {', '.join(BACKENDS)})")
+    return {
+        "name": parts[0],
+        "engine": engine,
+        "backend": backend or None,
+        "embeddings_dir": Path(parts[2]) if len(parts) == 3 else None,
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="검색 품질/지연 평가")
+    parser.add_argument("--queries", type=Path, default=None, help="정답 쿼리 파일 (.json 또는 .jsonl)")
+    parser.add_argument("--config", action="append", default=None,
+                        help="검색 구성 '이름:엔진[:임베딩 디렉토리]' (여러 번 지정 가능, 기본: dense:dense)")
+    parser.add_argument("--embeddings-dir", type=Path, default=DEFAULT_EMBEDDINGS_DIR,
+                        help="구성에 디렉토리가 없을 때 쓸 임베딩 디렉토리")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--model", default="nlpai-lab/KURE-v1", help="쿼리 임베딩 모델")
+    parser.add_argument("--backend", default="torch", help="구성에 백엔드가 없을 때 쓸 쿼리 임베딩 백엔드")
+    parser.add_argument("--reranker-model", default="Dongjin-kr/ko-reranker")
+    parser.add_argument("--pooling", choices=["max", "sum"], default="max", help="multivector 엔진 풀링 방식")
+    parser.add_argument("--output", type=Path, default=None, help="쿼리별 결과 포함 JSON 저장 경로")
+    args = parser.parse_args()
+
+    try:
+        configs = [parse_config(spec) for spec in (args.config or ["dense:dense"])]
+    except ValueError as e:
+        parser.error(str(e))
+
+    cases = load_queries(args.queries)
+    print(f"정답 쿼리: {len(cases)}개")
+
+    results = {}
+    for config in configs:
+        print(f"\n[{config['name']}] 엔진 준비: {config['engine']}")
+        engine_args = argparse.Namespace(**{**vars(args), "backend": config["backend"] or args.backend})
+        engine = ENGINES[config["engine"]](config["embeddings_dir"] or args.embeddings_dir, engine_args)
+        results[config["name"]] = evaluate_engine(engine, cases, args.k)
+
+    print_comparison(results, args.k)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"k": args.k, "configs": configs, "results": results},
+                      f, ensure_ascii=False, indent=2, default=str)
+        print(f"저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+임베딩 검색 서버
+
+EmbeddingTester의 검색 로직을 상주 프로세스로 띄워 로컬 HTTP(또는 Unix 소켓)로 제공합니다.
+- 모델과 인덱스는 서버 시작 시 한 번만 로딩
+- 동시에 들어온 쿼리는 마이크로 배치로 묶어 한 번의 모델 호출로 임베딩
+- 요청별 지연 시간(대기/임베딩/검색) 보고
+
+API:
+    POST /search  {"query": "...", "top_k": 5, "filters": {"category": "임금"}, "rerank": false}
+    GET  /health
+    GET  /stats
+    GET  /metrics  (Prometheus 텍스트 형식, 함수별 계측 포함)
+"""
+
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import metrics
+from embedding_backend import BACKENDS
+from test_embeddings import EmbeddingTester
+
+
+class QueryBatcher:
+    """동시 요청을 모아 한 번의 encode 호출로 처리하는 마이크로 배처"""
+
+    def __init__(self, encode_fn, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """
+        Args:
+            encode_fn: 쿼리 리스트를 받아 (N, dim) 배열을 반환하는 함수
+            max_batch_size: 한 번에 임베딩할 최대 쿼리 수
+            max_wait_ms: 첫 요청 이후 배치를 채우기 위해 기다리는 최대 시간
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, query: str) -> Future:
+        """쿼리를 큐에 넣고 임베딩 결과 Future 반환"""
+        future = Future()
+        self._queue.put((query, future, time.perf_counter()))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # 현재 배치 처리 후 종료
+                    break
+                batch.append(item)
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[tuple]):
+        queries = [query for query, _, _ in batch]
+        started = time.perf_counter()
+        try:
+            embeddings = self.encode_fn(queries)
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        encode_ms = (time.perf_counter() - started) * 1000
+
+        for i, (_, future, enqueued) in enumerate(batch):
+            future.set_result({
+                "embedding": embeddings[i],
+                "queue_wait_ms": (started - enqueued) * 1000,
+                "encode_ms": encode_ms,
+                "batch_size": len(batch),
+            })
+
+
+class SearchService:
+    """모델/인덱스를 한 번 로딩하고 동시 검색 요청을 처리하는 서비스"""
+
+    def __init__(self, tester: EmbeddingTester, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, latency_window: int = 1000):
+        """
+        Args:
+            tester: 로딩 완료된 EmbeddingTester
+            max_batch_size: 마이크로 배치 최대 크기
+            max_wait_ms: 마이크로 배치 대기 시간
+            latency_window: 통계에 사용할 최근 요청 수
+        """
+        self.tester = tester
+        self.batcher = QueryBatcher(tester.encode_queries, max_batch_size, max_wait_ms)
+        self.latency_window = latency_window
+
+        self._lock = threading.Lock()
+        self._rerank_lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._batch_sizes: List[int] = []
+        self._total_requests = 0
+        self._started_at = time.time()
+
+    def search(self, query: str, top_k: int = 5, filters: Optional[dict] = None,
+               rerank: bool = False) -> Dict:
+        """단일 쿼리 검색 (배처를 통해 다른 요청과 함께 임베딩)"""
+        started = time.perf_counter()
+        encoded = self.batcher.submit(query).result()
+
+        search_started = time.perf_counter()
+        reranker = self.tester.reranker if rerank else None
+        if reranker is not None:
+            candidates = self.tester.search_by_embedding(
+                encoded["embedding"], top_k=max(top_k, reranker.max_candidates), filters=filters
+            )
+            with self._rerank_lock:
+                results = reranker.rerank(query, candidates, top_k=top_k)
+        else:
+            results = self.tester.search_by_embedding(encoded["embedding"], top_k=top_k, filters=filters)
+        search_ms = (time.perf_counter() - search_started) * 1000
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        self._record(latency_ms, encoded["batch_size"])
+
+        return {
+            "query": query,
+            "top_k": top_k,
+            "filters": filters,
+            "reranked": reranker is not None,
+            "results": results,
+            "latency": {
+                "total_ms": round(latency_ms, 2),
+                "queue_wait_ms": round(encoded["queue_wait_ms"], 2),
+                "encode_ms": round(encoded["encode_ms"], 2),
+                "search_ms": round(search_ms, 2),
+                "batch_size": encoded["batch_size"],
+            },
+        }
+
+    def _record(self, latency_ms: float, batch_size: int):
+        with self._lock:
+            self._total_requests += 1
+            self._latencies.append(latency_ms)
+            self._batch_sizes.append(batch_size)
+            if len(self._latencies) > self.latency_window:
+                del self._latencies[:-self.latency_window]
+                del self._batch_sizes[:-self.latency_window]
+
+    def stats(self) -> Dict:
+        """최근 요청 기준 지연 시간 통계"""
+        with self._lock:
+            latencies = np.array(self._latencies)
+            batch_sizes = np.array(self._batch_sizes)
+            total = self._total_requests
+
+        stats = {
+            "total_requests": total,
+            "uptime_sec": round(time.time() - self._started_at, 1),
+            "num_chunks": len(self.tester.chunks),
+        }
+        if len(latencies):
+            stats.update({
+                "latency_p50_ms": round(float(np.percentile(latencies, 50)), 2),
+                "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+                "latency_p99_ms": round(float(np.percentile(latencies, 99)), 2),
+                "avg_batch_size": round(float(batch_sizes.mean()), 2),
+            })
+        return stats
+
+    def close(self):
+        self.batcher.close()
+
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    """검색 API 요청 핸들러"""
+
+    server_version = "DocScannerSearch/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix 소켓은 client_address가 빈 문자열
+        return self.client_address[0] if self.client_address else "unix"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.service.stats())
+        elif self.path == "/metrics":
+            data = metrics.METRICS.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json(404, {"error": f"not found: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/search":
+            self._send_json(404, {"error": f"not found: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            query = body["query"].strip()
+            top_k = int(body.get("top_k", 5))
+            filters = body.get("filters") or None
+            rerank = bool(body.get("rerank", False))
+        except (ValueError, KeyError, AttributeError) as e:
+            self._send_json(400, {"error": f"잘못된 요청: {e}"})
+            return
+
+        if not query:
+            self._send_json(400, {"error": "query가 비어 있습니다."})
+            return
+        if top_k < 1:
+            self._send_json(400, {"error": f"top_k는 1 이상이어야 합니다: {top_k}"})
+            return
+
+        try:
+            response = self.server.service.search(query, top_k=top_k, filters=filters,
+                                                  rerank=rerank)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, response)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class UnixSocketHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix 도메인 소켓 기반 HTTP 서버"""
+
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ""
+
+
+def create_server(service: SearchService, host: str = "127.0.0.1", port: int = 8765,
+                  socket_path: Optional[str] = None, quiet: bool = False):
+    """HTTP 또는 Unix 소켓 서버 생성"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixSocketHTTPServer(socket_path, SearchRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), SearchRequestHandler)
+        server.daemon_threads = True
+
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    project_root = Path(__file__).parent.parent.parent
+    default_embeddings_dir = project_root / "ai/data/processed/embeddings"
+
+    parser = argparse.ArgumentParser(description="임베딩 검색 서버")
+    parser.add_argument("--embeddings-dir", default=str(default_embeddings_dir))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", dest="socket_path", default=None,
+                        help="지정 시 TCP 대신 Unix 소켓으로 서비스")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--quiet", action="store_true", help="요청 로그 출력 안 함")
+    parser.add_argument("--reranker", default=None,
+                        help="cross-encoder 모델 지정 시 rerank 요청 지원")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="torch",
+                        help="쿼리 임베딩 백엔드 (색인과 같은 모델)")
+    parser.add_argument("--multivector", choices=["max", "sum"], default=None,
+                        help="자식 윈도 벡터 풀링으로 검색 (multivector.py build 필요)")
+    args = parser.parse_args()
+
+    # /metrics 엔드포인트용 계측 (encode_queries, search)
+    metrics.enable()
+
+    reranker = None
+    if args.reranker:
+        from reranker import CrossEncoderReranker
+        reranker = CrossEncoderReranker(model_name=args.reranker)
+
+    tester = EmbeddingTester(args.embeddings_dir, reranker=reranker, multivector=args.multivector,
+                             backend=args.backend)
+    tester.encode_queries(["warmup"])  # 첫 요청 지연을 피하기 위해 모델 미리 로딩
+    if reranker is not None:
+        reranker.model.predict([("warmup", "warmup")])
+    service = SearchService(tester, args.max_batch_size, args.max_wait_ms)
+    server = create_server(service, args.host, args.port, args.socket_path, args.quiet)
+
+    address = args.socket_path or f"http://{args.host}:{args.port}"
+    print(f"검색 서버 시작: {address}")
+    print(f"마이크로 배치: 최대 {args.max_batch_size}개 / {args.max_wait_ms}ms")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다.")
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket_path and os.path.exists(args.socket_path):
+            os.unlink(args.socket_path)
+
+
+if __name__ == "__main__":
+    main()
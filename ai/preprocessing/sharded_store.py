@@ -0,0 +1,313 @@
+"""
+샤드 분할 벡터 저장소와 병렬 scatter-gather 검색
+
+법률 데이터까지 임베딩하면 한 프로세스의 단일 행렬 검색이 지연과 메모리의 병목이 됩니다.
+ShardedVectorStore는 청크를 doc_type 또는 chunk_id 해시로 나눠 샤드마다 VectorStore를 두고,
+검색은 샤드별로 작업 스레드에서 동시에 실행한 뒤 각 샤드의 상위 k를 힙으로 병합합니다.
+
+- 샤드 벡터는 메모리 매핑이라 샤드를 늘려도 프로세스 메모리가 한 번에 커지지 않음
+- 행렬 곱은 numpy가 GIL을 놓고 실행하므로 스레드만으로 샤드 검색이 병렬로 진행됨
+- 필터 가지치기: doc_type 샤딩에서 doc_type 필터는 해당 샤드만 검색하고, 그 밖에도
+  샤드 메타데이터 색인에 필터 값(doc_type, category, doc_id)이 없는 샤드는 건너뜀
+- 추가/갱신/삭제/컴팩션은 샤드의 VectorStore가 그대로 처리 (doc_type이 바뀐 청크는 이전 샤드에서 삭제)
+
+저장 구조:
+    <root>/shards.json          샤딩 방식, 샤드 목록
+    <root>/<샤드>/manifest.json  샤드별 VectorStore (vector_store.py)
+
+사용법:
+    python sharded_store.py build --embeddings-dir ../data/processed/legal --root ../data/processed/legal_shards
+    python sharded_store.py build --root ../data/processed/shards --shard-by hash --num-shards 4
+    python sharded_store.py bench --root ../data/processed/legal_shards --queries 200
+    python search_server.py --embeddings-dir ../data/processed/legal_shards   # shards.json이 있으면 샤드 검색
+"""
+
+import heapq
+import json
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from metrics import count, timed
+from vector_store import VectorStore, replace_json
+
+
+SHARD_MANIFEST = "shards.json"
+SHARD_METHODS = ("doc_type", "hash")
+DEFAULT_NUM_SHARDS = 4
+
+
+class ShardedVectorStore:
+    """샤드별 VectorStore + 병렬 scatter-gather 검색"""
+
+    def __init__(self, root: Path, shard_by: str = "doc_type", num_shards: int = DEFAULT_NUM_SHARDS,
+                 model_name: Optional[str] = None, workers: Optional[int] = None, **store_kwargs):
+        """
+        Args:
+            root: 샤드 루트 디렉토리 (기존 shards.json이 있으면 그 샤딩 방식을 따름)
+            shard_by: "doc_type" (문서 유형별 샤드) 또는 "hash" (chunk_id 해시로 균등 분할)
+            num_shards: hash 샤딩의 샤드 수
+            model_name: 임베딩 모델 (샤드 저장소와 다르면 ValueError)
+            workers: 샤드 검색 스레드 수 (기본: CPU 수)
+            store_kwargs: 샤드 VectorStore 옵션 (segment_rows, max_dead_ratio 등)
+        """
+        self.root = Path(root)
+        self.store_dir = self.root
+        self.manifest_file = self.root / SHARD_MANIFEST
+        self.model_name = model_name
+        self.store_kwargs = store_kwargs
+
+        names: List[str] = []
+        if self.manifest_file.exists():
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            shard_by = manifest["shard_by"]
+            num_shards = manifest.get("num_shards", num_shards)
+            names = manifest["shards"]
+            self.model_name = model_name or manifest.get("model_name")
+        if shard_by not in SHARD_METHODS:
+            raise ValueError(f"지원하지 않는 샤딩 방식: {shard_by} ({', '.join(SHARD_METHODS)})")
+
+        self.shard_by = shard_by
+        self.num_shards = num_shards
+        self.shards: Dict[str, VectorStore] = {name: self._open_shard(name) for name in names}
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard")
+
+    @classmethod
+    def exists(cls, root: Path) -> bool:
+        return (Path(root) / SHARD_MANIFEST).exists()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards.values())
+
+    @property
+    def dim(self) -> Optional[int]:
+        return next((shard.dim for shard in self.shards.values() if shard.dim is not None), None)
+
+    def _open_shard(self, name: str) -> VectorStore:
+        return VectorStore(self.root / name, model_name=self.model_name, **self.store_kwargs)
+
+    def shard_name(self, chunk: Dict) -> str:
+        """청크가 들어갈 샤드 이름"""
+        if self.shard_by == "hash":
+            return f"hash-{zlib.crc32(chunk['chunk_id'].encode('utf-8')) % self.num_shards:02d}"
+        return re.sub(r'[^\w-]', '_', str(chunk.get("doc_type") or "unknown"))
+
+    def _route(self, filters: Optional[Dict]) -> List[VectorStore]:
+        """필터에 맞을 수 있는 샤드만 (가지치기)"""
+        if not filters:
+            return list(self.shards.values())
+
+        if self.shard_by == "doc_type" and "doc_type" in filters:
+            name = self.shard_name({"doc_type": filters["doc_type"]})
+            candidates = [self.shards[name]] if name in self.shards else []
+        else:
+            candidates = list(self.shards.values())
+        return [shard for shard in candidates if shard.may_match(filters)]
+
+    # ---- 변경 ----
+
+    def upsert(self, chunks: List[Dict], embeddings: np.ndarray):
+        """샤드별로 나눠 upsert (다른 샤드에 남은 같은 chunk_id는 삭제)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        groups: Dict[str, List[int]] = {}
+        for i, chunk in enumerate(chunks):
+            groups.setdefault(self.shard_name(chunk), []).append(i)
+
+        for name, indices in groups.items():
+            if name not in self.shards:
+                self.shards[name] = self._open_shard(name)
+            ids = [chunks[i]["chunk_id"] for i in indices]
+            # doc_type이 바뀐 청크는 샤드가 달라짐
+            if self.shard_by == "doc_type":
+                for other, shard in self.shards.items():
+                    if other != name:
+                        shard.delete(ids)
+            self.shards[name].upsert([chunks[i] for i in indices], embeddings[indices])
+
+    def delete(self, chunk_ids) -> int:
+        chunk_ids = list(chunk_ids)
+        return sum(shard.delete(chunk_ids) for shard in self.shards.values())
+
+    def commit(self, compact: bool = True):
+        for shard in self.shards.values():
+            shard.commit(compact=compact)
+        self.root.mkdir(parents=True, exist_ok=True)
+        replace_json(self.manifest_file, {
+            "shard_by": self.shard_by,
+            "num_shards": self.num_shards,
+            "model_name": self.model_name or next((s.model_name for s in self.shards.values() if s.model_name), None),
+            "shards": sorted(self.shards),
+        })
+
+    def wait_compaction(self):
+        for shard in self.shards.values():
+            shard.wait_compaction()
+
+    def close(self):
+        """대기 행 커밋, 컴팩션 완료 대기, 검색 스레드 종료"""
+        self.commit()
+        self.wait_compaction()
+        self._executor.shutdown()
+
+    # ---- 조회/검색 ----
+
+    def get(self, chunk_id: str) -> Optional[Dict]:
+        for shard in self.shards.values():
+            chunk = shard.get(chunk_id)
+            if chunk is not None:
+                return chunk
+        return None
+
+    def vector(self, chunk_id: str) -> Optional[np.ndarray]:
+        for shard in self.shards.values():
+            vector = shard.vector(chunk_id)
+            if vector is not None:
+                return vector
+        return None
+
+    def ids(self, filters: Optional[Dict] = None) -> Set[str]:
+        ids: Set[str] = set()
+        for shard in self._route(filters):
+            ids |= shard.ids(filters)
+        return ids
+
+    def live_chunks(self) -> List[Dict]:
+        return [chunk for name in sorted(self.shards) for chunk in self.shards[name].live_chunks()]
+
+    @timed("sharded_search")
+    def search(self, query_embedding: np.ndarray, top_k: int = 5, filters: Optional[Dict] = None) -> List[Dict]:
+        """가지치기한 샤드를 병렬 검색하고 샤드별 상위 k를 힙으로 병합"""
+        shards = self._route(filters)
+        count("shards_searched", len(shards))
+        count("shards_pruned", len(self.shards) - len(shards))
+
+        if len(shards) <= 1:
+            partials = [shard.search(query_embedding, top_k, filters) for shard in shards]
+        else:
+            futures = [self._executor.submit(shard.search, query_embedding, top_k, filters) for shard in shards]
+            partials = [future.result() for future in futures]
+
+        # 샤드 결과는 이미 유사도 내림차순이므로 k-way 병합 후 앞에서 k개
+        merged = heapq.merge(*partials, key=lambda result: -result["similarity"])
+        return [{**result, "rank": rank} for rank, result in enumerate(islice(merged, top_k), 1)]
+
+    def stats(self) -> Dict:
+        shards = {name: shard.stats() for name, shard in sorted(self.shards.items())}
+        return {
+            "shard_by": self.shard_by,
+            "live_chunks": sum(s["live_chunks"] for s in shards.values()),
+            "shards": shards,
+        }
+
+
+def open_store(path: Path, model_name: Optional[str] = None):
+    """디렉토리에 맞는 저장소 열기 (shards.json → ShardedVectorStore, manifest.json → VectorStore, 없으면 None)"""
+    if ShardedVectorStore.exists(path):
+        return ShardedVectorStore(path, model_name=model_name)
+    if VectorStore.exists(path):
+        return VectorStore(path, model_name=model_name)
+    return None
+
+
+def benchmark(store: ShardedVectorStore, queries: np.ndarray, top_k: int,
+              filters: Optional[Dict] = None) -> Dict:
+    """쿼리별 검색 지연 (ms)"""
+    import time
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        store.search(query, top_k=top_k, filters=filters)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies = np.array(latencies)
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "qps": len(latencies) / (latencies.sum() / 1000),
+        "shards": len(store._route(filters)),
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    from vector_store import find_embedding_files, iter_embedding_batches
+
+    parser = argparse.ArgumentParser(description="샤드 분할 벡터 저장소")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="기존 임베딩 디렉토리를 샤드로 나눠 저장")
+    build_parser.add_argument("--embeddings-dir", type=Path,
+                              default=Path(__file__).parent.parent / "data" / "processed" / "embeddings")
+    build_parser.add_argument("--shard-by", choices=SHARD_METHODS, default="doc_type")
+    build_parser.add_argument("--num-shards", type=int, default=DEFAULT_NUM_SHARDS, help="hash 샤딩의 샤드 수")
+    build_parser.add_argument("--model", default="nlpai-lab/KURE-v1")
+
+    bench_parser = subparsers.add_parser("bench", help="샤드 순차 검색 대비 병렬 검색, 필터 가지치기 지연 비교")
+    bench_parser.add_argument("--queries", type=int, default=200, help="저장된 벡터에서 뽑을 쿼리 수")
+    bench_parser.add_argument("--top-k", type=int, default=5)
+    bench_parser.add_argument("--workers", type=int, default=None)
+
+    subparsers.add_parser("stats", help="샤드별 청크/세그먼트/툼스톤 현황")
+    for sub in subparsers.choices.values():
+        sub.add_argument("--root", type=Path, required=True, help="샤드 루트 디렉토리")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        chunks_file, embeddings_file = find_embedding_files(args.embeddings_dir)
+        if chunks_file is None or embeddings_file is None:
+            print(f"청크/임베딩 파일이 없습니다: {args.embeddings_dir}")
+            return
+        store = ShardedVectorStore(args.root, shard_by=args.shard_by, num_shards=args.num_shards,
+                                   model_name=args.model)
+        for chunks, embeddings in iter_embedding_batches(chunks_file, embeddings_file):
+            store.upsert(chunks, embeddings)
+        store.close()
+        print(f"샤드 저장: {args.root} ({store.shard_by}, 샤드 {len(store.shards)}개, 청크 {len(store)}개)")
+
+    elif args.command == "bench":
+        store = ShardedVectorStore(args.root, workers=args.workers)
+        rng = np.random.default_rng(0)
+        vectors = [shard.segments[0].vectors for shard in store.shards.values() if shard.segments]
+        pool = np.concatenate([v[rng.integers(0, len(v), args.queries)] for v in vectors if len(v)])
+        queries = pool[rng.permutation(len(pool))[:args.queries]]
+        largest = max(store.shards, key=lambda name: len(store.shards[name]))
+        doc_type = store.shards[largest].live_chunks()[0].get("doc_type")
+
+        sequential = ShardedVectorStore(args.root, workers=1)
+        rows = [
+            ("순차 (스레드 1개)", benchmark(sequential, queries, args.top_k)),
+            (f"병렬 (스레드 {store.workers}개)", benchmark(store, queries, args.top_k)),
+            (f"필터 doc_type={doc_type}", benchmark(store, queries, args.top_k, {"doc_type": doc_type})),
+        ]
+
+        print("\n" + "=" * 72)
+        print(f"샤드 검색 지연 ({store.shard_by}, 샤드 {len(store.shards)}개, 청크 {len(store):,}개, "
+              f"쿼리 {len(queries)}개, top-{args.top_k})")
+        print("=" * 72)
+        print(f"{'구성':<28}{'샤드':>6}{'p50(ms)':>11}{'p99(ms)':>11}{'쿼리/초':>11}")
+        print("-" * 72)
+        for name, r in rows:
+            print(f"{name:<28}{r['shards']:>6}{r['p50_ms']:>11.2f}{r['p99_ms']:>11.2f}{r['qps']:>11.1f}")
+        print("=" * 72)
+
+    else:
+        store = ShardedVectorStore(args.root)
+        stats = store.stats()
+        print(f"샤딩: {stats['shard_by']}, 청크 {stats['live_chunks']:,}개")
+        for name, shard in stats["shards"].items():
+            print(f"  {name:<24} 청크 {shard['live_chunks']:>8,}개, 세그먼트 {shard['segments']}개, "
+                  f"툼스톤 {shard['dead_rows']}행")
+
+
+if __name__ == "__main__":
+    main()
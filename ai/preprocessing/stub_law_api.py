@@ -0,0 +1,203 @@
+"""
+국가법령정보 Open API 로컬 stub 서버
+
+lawSearch.do의 JSON 응답 형태(totalCnt, page, <target> 목록)와 lawService.do 본문 조회
+응답(PrecService 등)을 흉내 내는 테스트용 서버입니다.
+검색어/대상별로 결정적인 가짜 데이터를 만들어 반환하며, 지연과 일시적 오류를 주입할 수 있어
+LegalDataCollector의 동시 요청, 속도 제한, 재시도 동작을 실제 API 없이 확인할 수 있습니다.
+
+사용법:
+    python stub_law_api.py --port 8900 --fail-rate 0.1 --latency-ms 200
+    # 다른 터미널에서
+    python collect_legal_data.py --base-url http://127.0.0.1:8900/DRF/lawSearch.do
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+
+# target별 일련번호/제목/일자 필드 (docs/legal-data-collection.md의 데이터 구조 기준)
+TARGET_FIELDS = {
+    "expc": {"id": "법령해석례일련번호", "title": "안건명", "date": "회신일자"},
+    "prec": {"id": "판례일련번호", "title": "사건명", "date": "선고일자"},
+    "moel": {"id": "해설일련번호", "title": "제목", "date": "등록일자"},
+    "lwrc": {"id": "판정례일련번호", "title": "사건명", "date": "판정일자"},
+}
+
+# 본문 조회 응답 키와 섹션 필드 (legal_chunker.LEGAL_DOC_SPECS 기준)
+DETAIL_FIELDS = {
+    "expc": {"service": "ExpcService", "sections": ["질의요지", "회답", "이유"]},
+    "prec": {"service": "PrecService", "sections": ["판시사항", "판결요지", "판례내용"]},
+    "moel": {"service": "MoelService", "sections": ["질의", "회시"]},
+    "lwrc": {"service": "LwrcService", "sections": ["판정사항", "판정요지", "이유"]},
+}
+
+DETAIL_SENTENCES = [
+    "사용자는 근로계약을 체결할 때에 근로자에게 임금, 소정근로시간, 휴일, 연차 유급휴가를 명시하여야 한다.",
+    "1주 간의 근로시간은 휴게시간을 제외하고 40시간을 초과할 수 없다.",
+    "사용자는 근로자에게 정당한 이유 없이 해고, 휴직, 정직, 전직, 감봉, 그 밖의 징벌을 하지 못한다.",
+    "최저임금의 적용을 받는 근로자와 사용자 사이의 근로계약으로 최저임금액에 미치지 못하는 금액을 임금으로 정한 부분은 무효로 한다.",
+    "기간제근로자에 대하여 차별적 처우를 하여서는 아니 된다.",
+    "연장근로에 대하여는 통상임금의 100분의 50 이상을 가산하여 근로자에게 지급하여야 한다.",
+]
+
+BASE_DATE = datetime(2010, 1, 1)
+
+
+def make_items(target: str, query: str, corpus_size: int) -> List[Dict]:
+    """검색어별 결정적 가짜 문서 목록 (최신 일자 순)
+
+    서로 다른 검색어도 같은 문서 풀에서 일부를 공유하도록 만들어
+    키워드 간 중복 결과를 재현합니다.
+    """
+    fields = TARGET_FIELDS[target]
+    rng = random.Random(zlib.crc32(f"{target}:{query}".encode("utf-8")))
+    total = rng.randint(corpus_size // 4, corpus_size)
+    doc_ids = sorted(rng.sample(range(1, corpus_size * 2), total), reverse=True)
+
+    # 일련번호가 클수록 최신 문서
+    return [
+        {
+            fields["id"]: str(100000 + doc_id),
+            fields["title"]: f"{query} 관련 {target} 문서 {doc_id}",
+            fields["date"]: (BASE_DATE + timedelta(days=doc_id * 3)).strftime("%Y%m%d"),
+        }
+        for doc_id in doc_ids
+    ]
+
+
+def make_detail(target: str, doc_id: str, paragraphs: int = 6) -> Dict:
+    """일련번호별 결정적 가짜 본문 (섹션마다 여러 문단, <br/> 줄바꿈 포함)"""
+    fields = TARGET_FIELDS[target]
+    rng = random.Random(zlib.crc32(f"{target}:{doc_id}".encode("utf-8")))
+    number = int(doc_id) - 100000 if doc_id.isdigit() else 0
+
+    detail = {
+        fields["id"]: doc_id,
+        fields["title"]: f"{target} 문서 {number}",
+        fields["date"]: (BASE_DATE + timedelta(days=number * 3)).strftime("%Y%m%d"),
+    }
+    for section in DETAIL_FIELDS[target]["sections"]:
+        lines = [" ".join(rng.choices(DETAIL_SENTENCES, k=rng.randint(2, 5)))
+                 for _ in range(rng.randint(1, paragraphs))]
+        if section == "판례내용":
+            lines = ["【주    문】", "상고를 기각한다.", "【이    유】"] + lines
+        detail[section] = "<br/>".join(lines)
+    return detail
+
+
+class StubLawAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        with server.lock:
+            server.request_count += 1
+            server.concurrent += 1
+            server.max_concurrent = max(server.max_concurrent, server.concurrent)
+
+        try:
+            if server.latency_ms:
+                time.sleep(server.latency_ms / 1000)
+
+            if server.fail_rate and random.random() < server.fail_rate:
+                self._send(random.choice([429, 503]), {"error": "stub transient error"})
+                return
+
+            target = params.get("target")
+            if url.path.endswith("lawService.do") and target in TARGET_FIELDS:
+                detail = make_detail(target, params.get("ID", ""))
+                self._send(200, {DETAIL_FIELDS[target]["service"]: detail})
+                return
+
+            if not url.path.endswith("lawSearch.do") or target not in TARGET_FIELDS:
+                self._send(404, {"error": "unknown target"})
+                return
+
+            items = make_items(target, params.get("query", ""), server.corpus_size)
+
+            # 판례 선고일자 범위 필터 (prncYd=YYYYMMDD~YYYYMMDD)
+            if target == "prec" and params.get("prncYd"):
+                start, _, end = params["prncYd"].partition("~")
+                items = [i for i in items if start <= i["선고일자"] <= (end or "99999999")]
+
+            display = int(params.get("display", 20))
+            page = int(params.get("page", 1))
+            page_items = items[(page - 1) * display:page * display]
+
+            payload = {
+                "target": target,
+                "키워드": params.get("query", ""),
+                "totalCnt": str(len(items)),
+                "page": str(page),
+            }
+            if page_items:
+                # 실제 API처럼 결과가 1건이면 리스트가 아닌 단일 객체
+                payload[target] = page_items if len(page_items) > 1 else page_items[0]
+            self._send(200, payload)
+        finally:
+            with server.lock:
+                server.concurrent -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: Dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_stub_server(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                       fail_rate: float = 0.0, corpus_size: int = 400) -> ThreadingHTTPServer:
+    """stub 서버 생성 (port=0이면 빈 포트 자동 할당)"""
+    server = ThreadingHTTPServer((host, port), StubLawAPIHandler)
+    server.daemon_threads = True
+    server.latency_ms = latency_ms
+    server.fail_rate = fail_rate
+    server.corpus_size = corpus_size
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.concurrent = 0
+    server.max_concurrent = 0
+    return server
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="lawSearch.do stub 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--corpus-size", type=int, default=400)
+    args = parser.parse_args()
+
+    server = create_stub_server(args.host, args.port, args.latency_ms,
+                                args.fail_rate, args.corpus_size)
+    print(f"stub 서버 시작: http://{args.host}:{server.server_address[1]}/DRF/lawSearch.do")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n종료합니다. (총 요청 {server.request_count}건, 최대 동시 {server.max_concurrent})")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
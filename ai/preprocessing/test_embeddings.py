@@ -1,27 +1,178 @@
 import json
 import numpy as np
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Optional
+
+from embedding_backend import create_backend
+from metrics import timed
+from sharded_store import open_store
+
+
+# 사전 정의 테스트 쿼리
+# relevant_categories: 정답으로 볼 청크 카테고리 (precision@k 등 평가용)
+PRESET_TEST_CASES = [
+    {
+        "query": "근로시간은 하루에 몇 시간까지 가능한가요?",
+        "filters": None,
+        "relevant_categories": ["근로시간"]
+    },
+    {
+        "query": "최저임금 2025년",
+        "filters": {"category": "임금"},
+        "relevant_categories": ["임금"]
+    },
+    {
+        "query": "연차 휴가 계산 방법",
+        "filters": None,
+        "relevant_categories": ["휴일휴가", "휴가"]
+    },
+    {
+        "query": "채용 시 개인정보 수집",
+        "filters": {"doc_type": "manual"},
+        "relevant_categories": ["채용절차"]
+    },
+    {
+        "query": "징계 절차",
+        "filters": {"category": "상벌"},
+        "relevant_categories": ["상벌"]
+    },
+    {
+        "query": "주 52시간",
+        "filters": {"doc_type": "employment_rules"},
+        "relevant_categories": ["근로시간"]
+    }
+]
 
 
 class EmbeddingTester:
-    def __init__(self, embeddings_dir: str):
+    def __init__(self, embeddings_dir: str, model_name: str = "nlpai-lab/KURE-v1", reranker=None,
+                 multivector: Optional[str] = None, backend: str = "torch"):
+        """
+        Args:
+            embeddings_dir: 임베딩 디렉토리 (manifest.json/shards.json이 있으면 증분/샤드 저장소)
+            model_name: 쿼리 임베딩 모델
+            reranker: 선택적 재순위화기 (CrossEncoderReranker)
+            multivector: 자식 윈도 벡터 풀링 방식 ("max"/"sum", 없으면 청크 벡터로 검색)
+            backend: 쿼리 임베딩 백엔드 (색인과 같은 모델, torch/torch-int8/onnx/onnx-int8)
+        """
         self.embeddings_dir = Path(embeddings_dir)
+        self.reranker = reranker
 
         # 데이터 로드
         print("데이터 로딩 중...")
-        with open(self.embeddings_dir / "chunks_with_embeddings.json", 'r', encoding='utf-8') as f:
-            self.chunks = json.load(f)
+        self.store = open_store(self.embeddings_dir)
+        if self.store is not None:
+            # 증분/샤드 저장소: 검색은 세그먼트, 툼스톤, 샤드를 아는 저장소에 맡김
+            if multivector:
+                raise ValueError("멀티 벡터 모드는 증분 저장소를 지원하지 않습니다")
+            self.chunks = self.store.live_chunks()
+            self.embeddings = self.embedding_norms = None
+        else:
+            with open(self.embeddings_dir / "chunks_with_embeddings.json", 'r', encoding='utf-8') as f:
+                self.chunks = json.load(f)
+
+            # 임베딩은 행렬로만 보관 (청크 dict에 중복 저장하지 않음)
+            embeddings = [chunk.pop('embedding', None) for chunk in self.chunks]
+            npy_file = self.embeddings_dir / "embeddings.npy"
+            if npy_file.exists():
+                self.embeddings = np.load(npy_file)
+            else:
+                self.embeddings = np.array(embeddings)
+            del embeddings
+            self.embedding_norms = np.linalg.norm(self.embeddings, axis=1)
+
+        # 멀티 벡터 모드: 자식 윈도 점수를 부모 청크별로 풀링 (multivector.py build로 생성)
+        self.multivector = None
+        if multivector:
+            from multivector import MultiVectorIndex
+
+            self.multivector = MultiVectorIndex(self.embeddings_dir, [c["chunk_id"] for c in self.chunks],
+                                                pooling=multivector, model_name=model_name, backend=backend)
+            print(f"멀티 벡터 모드: 자식 {len(self.multivector.parents)}개, {multivector} 풀링")
+
+        # 모델은 첫 쿼리 임베딩 시 로딩
+        self.model_name = model_name
+        self.backend = create_backend(backend, model_name)
+
+        print(f"로딩 완료: {len(self.chunks)}개 청크")
 
-        self.embeddings = np.array([chunk['embedding'] for chunk in self.chunks])
+    @timed(count_items=True)
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """여러 쿼리를 한 번의 모델 호출로 임베딩"""
+        return self.backend.encode(queries, batch_size=max(len(queries), 1))
+
+    def _filter_indices(self, filters: Optional[dict]) -> Optional[List[int]]:
+        """필터 조건에 맞는 청크 인덱스 (필터가 없으면 None)"""
+        if not filters:
+            return None
+
+        filtered_indices = []
+        for i, chunk in enumerate(self.chunks):
+            match = True
+            for key, value in filters.items():
+                if chunk.get(key) != value:
+                    match = False
+                    break
+            if match:
+                filtered_indices.append(i)
+        return filtered_indices
 
-        # 모델 로드
-        print("KURE 모델 로딩 중...")
-        self.model = SentenceTransformer("nlpai-lab/KURE-v1")
+    @timed("search")
+    def search_by_embedding(self, query_embedding: np.ndarray, top_k: int = 5,
+                            filters: dict = None) -> List[Dict]:
+        """
+        임베딩된 쿼리로 유사한 청크 검색 (출력 없음)
 
-        print(f"로딩 완료: {len(self.chunks)}개 청크")
+        Args:
+            query_embedding: 쿼리 임베딩 벡터
+            top_k: 상위 몇 개 결과 반환
+            filters: 필터 조건
+
+        Returns:
+            [{"rank", "similarity", "chunk"}, ...]
+        """
+        if self.store is not None:
+            return self.store.search(query_embedding, top_k=top_k, filters=filters)
+
+        filtered_indices = self._filter_indices(filters)
+
+        if filtered_indices is None:
+            filtered_chunks = self.chunks
+        elif len(filtered_indices) == 0:
+            return []
+        else:
+            filtered_chunks = [self.chunks[i] for i in filtered_indices]
+
+        if self.multivector is not None:
+            # 자식 윈도 유사도를 부모 청크별로 풀링
+            similarities = self.multivector.parent_scores(query_embedding, filtered_indices)
+        else:
+            if filtered_indices is None:
+                filtered_embeddings = self.embeddings
+                filtered_norms = self.embedding_norms
+            else:
+                filtered_embeddings = self.embeddings[filtered_indices]
+                filtered_norms = self.embedding_norms[filtered_indices]
+
+            # 코사인 유사도 계산
+            similarities = np.dot(filtered_embeddings, query_embedding) / (
+                filtered_norms * np.linalg.norm(query_embedding)
+            )
+
+        # 상위 k개 추출
+        top_indices = np.argsort(similarities)[::-1][:top_k]
 
-    def search(self, query: str, top_k: int = 5, filters: dict = None):
+        return [
+            {
+                "rank": rank,
+                "similarity": float(similarities[idx]),
+                "chunk": filtered_chunks[idx]
+            }
+            for rank, idx in enumerate(top_indices, 1)
+        ]
+
+    def search(self, query: str, top_k: int = 5, filters: dict = None, verbose: bool = True,
+               rerank: bool = False):
         """
         쿼리로 유사한 청크 검색
 
@@ -29,63 +180,47 @@ class EmbeddingTester:
             query: 검색 쿼리
             top_k: 상위 몇 개 결과 반환
             filters: 필터 조건 (예: {"category": "근로시간", "doc_type": "standard_contract"})
+            verbose: 검색 결과 출력 여부
+            rerank: reranker가 있으면 상위 후보를 cross-encoder로 재순위화
         """
-        print(f"\n{'='*80}")
-        print(f"🔍 쿼리: {query}")
-        print(f"{'='*80}")
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"🔍 쿼리: {query}")
+            print(f"{'='*80}")
 
         # 쿼리 임베딩
-        query_embedding = self.model.encode([query], convert_to_numpy=True)[0]
-
-        # 필터링
-        if filters:
-            filtered_indices = []
-            for i, chunk in enumerate(self.chunks):
-                match = True
-                for key, value in filters.items():
-                    if chunk.get(key) != value:
-                        match = False
-                        break
-                if match:
-                    filtered_indices.append(i)
-
-            print(f"📌 필터: {filters}")
-            print(f"   필터 적용 후: {len(filtered_indices)}개 청크")
-
-            if len(filtered_indices) == 0:
-                print("⚠️  필터 조건에 맞는 청크가 없습니다.")
-                return []
-
-            filtered_embeddings = self.embeddings[filtered_indices]
-            filtered_chunks = [self.chunks[i] for i in filtered_indices]
+        query_embedding = self.encode_queries([query])[0]
+        if rerank and self.reranker is not None:
+            candidates = self.search_by_embedding(
+                query_embedding, top_k=max(top_k, self.reranker.max_candidates), filters=filters
+            )
+            results = self.reranker.rerank(query, candidates, top_k=top_k)
         else:
-            filtered_embeddings = self.embeddings
-            filtered_chunks = self.chunks
+            results = self.search_by_embedding(query_embedding, top_k=top_k, filters=filters)
 
-        # 코사인 유사도 계산
-        similarities = np.dot(filtered_embeddings, query_embedding) / (
-            np.linalg.norm(filtered_embeddings, axis=1) * np.linalg.norm(query_embedding)
-        )
+        if verbose:
+            if filters:
+                print(f"📌 필터: {filters}")
+                print(f"   필터 적용 후: {len(self._filter_indices(filters))}개 청크")
+                if not results:
+                    print("⚠️  필터 조건에 맞는 청크가 없습니다.")
+            if results:
+                self._print_results(results, top_k)
 
-        # 상위 k개 추출
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        return results
 
-        results = []
+    def _print_results(self, results: List[Dict], top_k: int):
+        """검색 결과 출력"""
         print(f"\n📊 상위 {top_k}개 결과:\n")
 
-        for rank, idx in enumerate(top_indices, 1):
-            chunk = filtered_chunks[idx]
-            similarity = similarities[idx]
+        for result in results:
+            rank = result["rank"]
+            similarity = result["similarity"]
+            chunk = result["chunk"]
 
-            result = {
-                "rank": rank,
-                "similarity": float(similarity),
-                "chunk": chunk
-            }
-            results.append(result)
-
-            # 출력
             print(f"{rank}. 유사도: {similarity:.4f} {'🔥' if similarity > 0.7 else '✓' if similarity > 0.6 else ''}")
+            if result.get("rerank_score") is not None:
+                print(f"   🎯 재순위 점수: {result['rerank_score']:.4f} (dense 순위: {result['dense_rank']})")
             print(f"   📄 문서: {chunk.get('source', 'unknown')}")
             print(f"   🏷️  카테고리: {chunk.get('category', 'unknown')}")
 
@@ -101,8 +236,6 @@ class EmbeddingTester:
             print(f"   💬 내용: {content}...")
             print()
 
-        return results
-
     def interactive_mode(self):
         """대화형 검색 모드"""
         print("\n" + "="*80)
@@ -148,32 +281,7 @@ class EmbeddingTester:
 
     def run_preset_tests(self):
         """미리 정의된 테스트 쿼리 실행"""
-        test_cases = [
-            {
-                "query": "근로시간은 하루에 몇 시간까지 가능한가요?",
-                "filters": None
-            },
-            {
-                "query": "최저임금 2025년",
-                "filters": {"category": "임금"}
-            },
-            {
-                "query": "연차 휴가 계산 방법",
-                "filters": None
-            },
-            {
-                "query": "채용 시 개인정보 수집",
-                "filters": {"doc_type": "manual"}
-            },
-            {
-                "query": "징계 절차",
-                "filters": {"category": "상벌"}
-            },
-            {
-                "query": "주 52시간",
-                "filters": {"doc_type": "employment_rules"}
-            }
-        ]
+        test_cases = PRESET_TEST_CASES
 
         print("\n" + "="*80)
         print("🧪 사전 정의된 테스트 케이스 실행")
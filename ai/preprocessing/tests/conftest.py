@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 전처리 모듈은 패키지가 아닌 스크립트 모음이므로 상위 디렉토리를 import 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,166 @@
+"""
+증분 수집: 바뀐 문서를 다시 수집하면 바뀐 청크만 임베딩하고 사라진 청크는 삭제하는지 확인
+
+본문 조회는 로컬 stub 서버(detail_url)로, 임베딩은 텍스트 해시 기반 가짜 임베더로 대신합니다.
+"""
+
+import hashlib
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+from embedder import DocumentEmbedder
+from legal_ingest import LegalIngestPipeline
+from near_dedup import NearDuplicateIndex
+from vector_store import VectorStore
+
+
+class FakeEmbedder:
+    """텍스트마다 고정된 난수 벡터를 주고 인코딩한 텍스트를 기록"""
+
+    model_name = cache_key = "fake-model"
+    batch_size = 4
+    build_text = staticmethod(DocumentEmbedder.build_text)
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode_texts(self, texts, show_progress_bar=False):
+        self.encoded.extend(texts)
+        return np.stack([self.vector(text) for text in texts])
+
+    @staticmethod
+    def vector(text):
+        seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little')
+        return np.random.default_rng(seed).standard_normal(16).astype(np.float32)
+
+
+@pytest.fixture
+def detail_server():
+    """판례 본문 조회 stub: details[ID]를 {"PrecService": ...}로 응답"""
+    details = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            doc_id = parse_qs(urlparse(self.path).query).get("ID", [""])[0]
+            body = json.dumps({"PrecService": details.get(doc_id, {})}, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/lawService.do", details
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def text():
+    rng = random.Random(0)
+    return lambda: "".join(chr(0xAC00 + rng.randrange(2000)) for _ in range(200))
+
+
+def write_listing(path, keywords):
+    """판례 목록 JSONL (판례일련번호 → 검색키워드)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for doc_id, keyword in keywords.items():
+            f.write(json.dumps({"판례일련번호": doc_id, "사건명": f"사건 {doc_id}", "검색키워드": [keyword]},
+                               ensure_ascii=False) + "\n")
+    return path
+
+
+def ingest(tmp_path, url, store, embedder, keywords, dedup=None):
+    pipeline = LegalIngestPipeline("test", tmp_path / "out", embedder=embedder, store=store, dedup=dedup,
+                                   detail_url=url, rate_per_sec=1000.0)
+    listing = write_listing(tmp_path / "precedents.jsonl", keywords)
+    try:
+        return pipeline.run({"prec": listing})
+    finally:
+        pipeline.close()
+
+
+def sections(store, doc_id):
+    return {store.get(chunk_id)["section"]: store.get(chunk_id)["content"]
+            for chunk_id in store.ids({"doc_type": "precedent", "doc_id": doc_id})}
+
+
+def test_incremental_reingest_of_changed_document(tmp_path, detail_server, text):
+    url, details = detail_server
+    store = VectorStore(tmp_path / "store", model_name=FakeEmbedder.model_name)
+    embedder = FakeEmbedder()
+
+    summary, holding, reasons = text(), text(), text()
+    details["1"] = {"판례일련번호": "1", "판시사항": summary, "판결요지": holding,
+                    "판례내용": f"【주문】 상고를 기각한다.\n【이유】 {reasons}"}
+    details["2"] = {"판례일련번호": "2", "판시사항": text(), "판결요지": text()}
+    stats = ingest(tmp_path, url, store, embedder, {"1": "임금", "2": "해고"})
+    assert stats["documents"] == 2 and stats["chunks"] == 5
+    assert len(store) == 5 and len(embedder.encoded) == 5
+    assert sections(store, "1") == {"판시사항": summary, "판결요지": holding, "이유": reasons}
+
+    # 문서 1: 판결요지가 바뀌고 이유 섹션이 사라짐, 문서 2: 목록의 검색키워드만 바뀜
+    new_holding = text()
+    details["1"] = {"판례일련번호": "1", "판시사항": summary, "판결요지": new_holding}
+    kept = store.vector(next(iter(store.ids({"doc_id": "2"}))))
+    embedder.encoded.clear()
+    stats = ingest(tmp_path, url, store, embedder, {"1": "임금", "2": "부당해고"})
+
+    assert len(embedder.encoded) == 1 and new_holding in embedder.encoded[0]
+    assert stats["unchanged"] == 1
+    assert stats["metadata_updated"] == 2
+    assert stats["deleted"] == 1
+    assert sections(store, "1") == {"판시사항": summary, "판결요지": new_holding}
+    for chunk_id in store.ids({"doc_id": "2"}):
+        assert store.get(chunk_id)["search_keywords"] == ["부당해고"]
+    assert any(np.array_equal(store.vector(chunk_id), kept) for chunk_id in store.ids({"doc_id": "2"}))
+
+    # 바뀐 청크는 새 임베딩으로 검색되고 사라진 섹션은 검색되지 않음
+    query = FakeEmbedder.vector(embedder.encoded[0])
+    top = store.search(query, top_k=len(store))
+    assert top[0]["chunk"]["content"] == new_holding
+    assert reasons not in {result["chunk"]["content"] for result in top}
+
+    # 문서 1에서 청크가 하나도 나오지 않으면 이전 청크를 모두 삭제
+    details["1"] = {"판례일련번호": "1", "판시사항": "없음"}
+    embedder.encoded.clear()
+    stats = ingest(tmp_path, url, store, embedder, {"1": "임금", "2": "부당해고"})
+    assert embedder.encoded == []
+    assert stats["deleted"] == 2 and stats["unchanged"] == 2
+    assert sections(store, "1") == {}
+
+    # 다시 연 저장소도 같은 상태
+    reopened = VectorStore(tmp_path / "store", model_name=FakeEmbedder.model_name)
+    assert reopened.ids({}) == store.ids({}) and len(reopened) == 2
+
+
+def test_incremental_dedup_skips_stored_duplicates(tmp_path, detail_server, text):
+    url, details = detail_server
+    store = VectorStore(tmp_path / "store", model_name=FakeEmbedder.model_name)
+    embedder = FakeEmbedder()
+
+    summary = text()
+    details["1"] = {"판례일련번호": "1", "판시사항": summary, "판결요지": text()}
+    ingest(tmp_path, url, store, embedder, {"1": "임금"}, dedup=NearDuplicateIndex())
+    assert len(store) == 2
+
+    # 새 문서 3의 판시사항은 저장된 문서 1과 거의 같음 → 새 실행에서도 임베딩하지 않음
+    details["3"] = {"판례일련번호": "3", "판시사항": summary + "다", "판결요지": text()}
+    embedder.encoded.clear()
+    stats = ingest(tmp_path, url, store, embedder, {"1": "임금", "3": "임금"}, dedup=NearDuplicateIndex())
+
+    assert stats["dedup_seeded"] == 2
+    assert stats["duplicates"] == 1 and stats["unchanged"] == 2
+    assert len(embedder.encoded) == 1
+    assert set(sections(store, "3")) == {"판결요지"}
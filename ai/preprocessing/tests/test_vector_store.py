@@ -0,0 +1,124 @@
+"""
+증분 벡터 저장소: upsert → delete → compact 후에도 검색 결과가 전체 계산과 같은지 확인
+"""
+
+import numpy as np
+import pytest
+
+from sharded_store import ShardedVectorStore
+from vector_store import VectorStore
+
+
+DIM = 16
+DOC_TYPES = ("precedent", "interpretation", "labor_ministry")
+
+
+def make_chunks(rng, start, count):
+    return [{"chunk_id": f"c{i}", "doc_type": DOC_TYPES[i % len(DOC_TYPES)], "doc_id": str(i // 4),
+             "content": f"청크 {i}"} for i in range(start, start + count)], \
+        rng.standard_normal((count, DIM)).astype(np.float32)
+
+
+def brute_force(live, query, top_k, doc_type=None):
+    """살아 있는 (청크, 벡터) 전체 코사인 유사도 상위 k chunk_id"""
+    ids = [chunk_id for chunk_id, (chunk, _) in live.items()
+           if doc_type is None or chunk["doc_type"] == doc_type]
+    vectors = np.stack([live[chunk_id][1] for chunk_id in ids])
+    similarities = (vectors @ query) / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    return [ids[i] for i in np.argsort(-similarities)[:top_k]]
+
+
+def search_ids(store, query, top_k, doc_type=None):
+    filters = {"doc_type": doc_type} if doc_type else None
+    return [result["chunk"]["chunk_id"] for result in store.search(query, top_k=top_k, filters=filters)]
+
+
+def assert_matches(store, live, queries, top_k=5):
+    assert len(store) == len(live)
+    for query in queries:
+        assert search_ids(store, query, top_k) == brute_force(live, query, top_k)
+        assert search_ids(store, query, top_k, "interpretation") == brute_force(live, query, top_k, "interpretation")
+
+
+@pytest.fixture
+def mutated(tmp_path):
+    """여러 세그먼트에 걸친 upsert, 갱신, 삭제를 거친 저장소와 기대 상태"""
+    rng = np.random.default_rng(0)
+    # 자동 컴팩션이 끼어들지 않도록 기준을 높여 둠
+    store = VectorStore(tmp_path / "store", model_name="test-model", segment_rows=1000,
+                        max_dead_ratio=1.0, max_segments=100)
+    live = {}
+    for start in range(0, 120, 30):
+        chunks, vectors = make_chunks(rng, start, 30)
+        store.upsert(chunks, vectors)
+        store.commit(compact=False)
+        live.update({chunk["chunk_id"]: (chunk, vector) for chunk, vector in zip(chunks, vectors)})
+
+    # 이전 세그먼트의 행을 갱신 (툼스톤 + 새 행)
+    updated = [{**live[f"c{i}"][0], "content": f"갱신 {i}"} for i in range(0, 60, 3)]
+    vectors = rng.standard_normal((len(updated), DIM)).astype(np.float32)
+    store.upsert(updated, vectors)
+    live.update({chunk["chunk_id"]: (chunk, vector) for chunk, vector in zip(updated, vectors)})
+
+    deleted = [f"c{i}" for i in range(1, 120, 5)] + ["missing"]
+    assert store.delete(deleted) == len(deleted) - 1
+    for chunk_id in deleted:
+        live.pop(chunk_id, None)
+    store.commit(compact=False)
+
+    queries = rng.standard_normal((10, DIM)).astype(np.float32)
+    return store, live, queries
+
+
+def test_search_after_upsert_and_delete(mutated):
+    store, live, queries = mutated
+    assert store.stats()["segments"] == 5
+    assert_matches(store, live, queries)
+    assert store.get("c1") is None
+    assert store.get("c3")["content"] == "갱신 3"
+
+
+def test_compact_keeps_search_results(mutated):
+    store, live, queries = mutated
+    before = [search_ids(store, query, 5) for query in queries]
+
+    store.compact()
+    stats = store.stats()
+    assert stats["segments"] == 1
+    assert stats["total_rows"] == len(live)
+    assert [search_ids(store, query, 5) for query in queries] == before
+    assert_matches(store, live, queries)
+
+
+def test_reopen_restores_tombstones_and_updates(mutated, tmp_path):
+    store, live, queries = mutated
+    reopened = VectorStore(tmp_path / "store", model_name="test-model")
+    assert_matches(reopened, live, queries)
+    assert reopened.ids({"doc_type": "precedent"}) == store.ids({"doc_type": "precedent"})
+
+    with pytest.raises(ValueError):
+        VectorStore(tmp_path / "store", model_name="other-model")
+
+
+def test_sharded_store_matches_single_store(tmp_path):
+    rng = np.random.default_rng(1)
+    single = VectorStore(tmp_path / "single", model_name="test-model")
+    sharded = ShardedVectorStore(tmp_path / "sharded", model_name="test-model")
+    live = {}
+    for start in range(0, 90, 30):
+        chunks, vectors = make_chunks(rng, start, 30)
+        for store in (single, sharded):
+            store.upsert(chunks, vectors)
+        live.update({chunk["chunk_id"]: (chunk, vector) for chunk, vector in zip(chunks, vectors)})
+    deleted = [f"c{i}" for i in range(0, 90, 7)]
+    for store in (single, sharded):
+        store.delete(deleted)
+        store.commit()
+    for chunk_id in deleted:
+        del live[chunk_id]
+
+    queries = rng.standard_normal((5, DIM)).astype(np.float32)
+    assert_matches(sharded, live, queries)
+    for query in queries:
+        assert search_ids(sharded, query, 5) == search_ids(single, query, 5)
+    sharded.close()
@@ -0,0 +1,335 @@
+"""
+추출 텍스트 정규화 (추출과 청킹 사이 단계)
+
+pdfplumber 출력의 PDF 특유 잡음을 청킹 전에 한 번 정리합니다.
+
+- 유니코드 정규화 (기본 NFC) + 전각 ASCII/특수 공백/제로폭 문자/소프트 하이픈 정리
+  NFKC는 ①②(항 번호) 같은 문자를 숫자로 바꿔 조항 구조가 깨지므로 선택 사항으로만 둠
+- 줄 끝 하이픈으로 끊긴 영단어 연결 (inter-\\nview → interview)
+- 페이지 가장자리의 쪽 번호 줄("- 3 -", "3 / 10", "Page 3") 제거, 숫자만 있는 줄은 "--- Page N ---" 번호를 따라갈 때만
+- 대부분의 페이지에 반복되는 머리말/꼬리말 줄 제거 (boilerplate.py)
+- "제 3 조" → "제3조" (장/절/조/항/호), 연속 공백과 빈 줄 정리
+
+"--- Page N ---" 구분자와 줄바꿈은 유지하므로 chunker.py의 분할 규칙은 그대로 동작합니다.
+파이프라인에서는 normalize 단계가 문서 해시 + 이 파일의 코드 해시로 결과를 캐시합니다.
+
+사용법:
+    python text_normalizer.py                     # 추출 문서 → 정규화 문서 저장
+    python text_normalizer.py --measure           # 청킹 속도, 청크/토큰 수 비교 (원문 vs 정규화)
+    python text_normalizer.py --measure --tokenizer nlpai-lab/KURE-v1
+"""
+
+import json
+import re
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from boilerplate import BoilerplateDetector
+from metrics import count, timed
+
+
+PAGE_MARKER_RE = re.compile(r'^--- Page (\d+) ---$', re.MULTILINE)
+
+# 쪽 번호로 보는 줄 (페이지 가장자리 EDGE_LINES 줄에만 적용, 본문 표의 숫자 셀은 건드리지 않음)
+PAGE_NUMBER_RE = re.compile(
+    r'^(?:'
+    r'[-–—]\s*\d{1,4}\s*[-–—]'                            # - 3 -
+    r'|\d{1,4}\s*/\s*\d{1,4}'                             # 3 / 10
+    r'|(?:page|p\.)\s*\d{1,4}(?:\s*(?:of|/)\s*\d{1,4})?'  # Page 3, p. 3 of 10
+    r'|\d{1,4}\s*(?:쪽|페이지)'                            # 3쪽
+    r')$',
+    re.IGNORECASE,
+)
+
+# 숫자만 있는 줄은 본문 값(표 셀, "15" 일수 등)일 수 있으므로 "--- Page N ---" 번호를 따라갈 때만 쪽 번호
+#   (N과 같거나, 여러 페이지에서 N과의 차이가 일정할 때. 표지 때문에 인쇄 번호가 밀린 문서)
+BARE_NUMBER_RE = re.compile(r'^\d{1,4}$')
+
+ARTICLE_SPACING_RE = re.compile(r'제 ?(\d+) ?(장|절|조|항|호)')
+HYPHENATION_RE = re.compile(r'([A-Za-z])-\n([a-z])')
+SPACES_RE = re.compile(r' {2,}')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# 페이지 위/아래에서 쪽 번호를 찾을 줄 수
+EDGE_LINES = 2
+
+DEFAULT_DETECTOR = BoilerplateDetector(edge_lines=EDGE_LINES)
+TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+
+def _build_char_map() -> Dict[int, str]:
+    char_map = {code: chr(code - 0xFEE0) for code in range(0xFF01, 0xFF5F)}  # 전각 ASCII → ASCII
+    for code in (0x00A0, 0x3000, 0x0009, *range(0x2000, 0x200B), 0x202F, 0x205F):
+        char_map[code] = ' '
+    for code in (0x200B, 0x200C, 0x200D, 0x2060, 0xFEFF, 0x00AD):
+        char_map[code] = ''
+    for code in (0x2010, 0x2011, 0x2212):
+        char_map[code] = '-'
+    return char_map
+
+
+CHAR_MAP = _build_char_map()
+
+
+def split_pages(text: str) -> List[Tuple[Optional[int], str]]:
+    """"--- Page N ---" 구분자로 페이지 분할 (구분자가 없으면 전체를 한 페이지로)"""
+    parts = PAGE_MARKER_RE.split(text)
+    pages = [(None, parts[0])] if parts[0].strip() else []
+    pages.extend((int(parts[i]), parts[i + 1]) for i in range(1, len(parts), 2))
+    return pages
+
+
+def join_pages(pages: List[Tuple[Optional[int], str]]) -> str:
+    """split_pages의 역 (PDFExtractor.join_pages와 같은 형식, 빈 페이지 제외)"""
+    blocks = []
+    for page_num, body in pages:
+        body = body.strip()
+        if not body:
+            continue
+        blocks.append(body if page_num is None else f"--- Page {page_num} ---\n{body}")
+    return "\n".join(blocks)
+
+
+def _clean_lines(body: str) -> List[str]:
+    return [SPACES_RE.sub(' ', line).strip() for line in body.split('\n')]
+
+
+def _page_number_offset(pages: List[Tuple[Optional[int], str]], page_lines: List[List[str]],
+                        edge_lines: int) -> Optional[int]:
+    """가장자리 숫자 줄이 페이지 번호를 따라가는 차이 (두 페이지 이상에서 같아야 인정)"""
+    offsets = Counter()
+    for (page_num, _), lines in zip(pages, page_lines):
+        if page_num is None:
+            continue
+        offsets.update({int(lines[i]) - page_num for i in _edge_indices(lines, edge_lines)
+                        if BARE_NUMBER_RE.match(lines[i])})
+    if not offsets:
+        return None
+    offset, pages_with_offset = offsets.most_common(1)[0]
+    return offset if pages_with_offset >= 2 else None
+
+
+def _edge_indices(lines: List[str], edge_lines: int) -> List[int]:
+    """페이지 위/아래 가장자리의 비어 있지 않은 줄 인덱스"""
+    non_empty = [i for i, line in enumerate(lines) if line]
+    return sorted(set(non_empty[:edge_lines] + non_empty[-edge_lines:]))
+
+
+@timed()
+def normalize_with_report(text: str, form: str = "NFC", edge_lines: int = EDGE_LINES,
+                          detector: Optional[BoilerplateDetector] = DEFAULT_DETECTOR) -> Tuple[str, Dict]:
+    """추출 텍스트 정규화 + 제거한 줄 보고서
+
+    Args:
+        text: PDFExtractor 형식 텍스트 ("--- Page N ---" 구분자 포함 가능)
+        form: 유니코드 정규화 형식 (NFC 또는 NFKC)
+        edge_lines: 쪽 번호를 찾을 페이지 위아래 줄 수 (0이면 제거 안 함)
+        detector: 반복 머리말/꼬리말 탐지기 (None이면 제거 안 함)
+
+    Returns:
+        (정규화된 텍스트, {"page_number_lines", "boilerplate_lines", "boilerplate_patterns",
+                        "removed_chars", "removed_tokens"})
+    """
+    text = unicodedata.normalize(form, text).translate(CHAR_MAP)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = HYPHENATION_RE.sub(r'\1\2', text)
+
+    pages = split_pages(text)
+    page_lines = [_clean_lines(body) for _, body in pages]
+
+    removed_text = []
+    if edge_lines:
+        offset = _page_number_offset(pages, page_lines, edge_lines)
+        for (page_num, _), lines in zip(pages, page_lines):
+            for i in _edge_indices(lines, edge_lines):
+                bare_page_number = (page_num is not None and BARE_NUMBER_RE.match(lines[i])
+                                    and int(lines[i]) - page_num in (0, offset))
+                if PAGE_NUMBER_RE.match(lines[i]) or bare_page_number:
+                    removed_text.append(lines[i])
+                    lines[i] = ''
+    page_number_lines = len(removed_text)
+
+    boilerplate = {"patterns": [], "removed_lines": 0, "removed_text": []}
+    if detector is not None:
+        page_lines, boilerplate = detector.strip(page_lines)
+        removed_text.extend(boilerplate["removed_text"])
+
+    normalized = []
+    for (page_num, _), lines in zip(pages, page_lines):
+        body = BLANK_LINES_RE.sub('\n\n', '\n'.join(lines))
+        normalized.append((page_num, ARTICLE_SPACING_RE.sub(r'제\1\2', body)))
+
+    report = {
+        "page_number_lines": page_number_lines,
+        "boilerplate_lines": boilerplate["removed_lines"],
+        "boilerplate_patterns": boilerplate["patterns"],
+        "removed_chars": sum(len(line) for line in removed_text),
+        "removed_tokens": sum(len(TOKEN_RE.findall(line)) for line in removed_text),
+    }
+    count("normalize_removed_lines", len(removed_text))
+    count("normalize_removed_chars", report["removed_chars"])
+    return join_pages(normalized), report
+
+
+def normalize_text(text: str, form: str = "NFC", edge_lines: int = EDGE_LINES) -> str:
+    """추출 텍스트 정규화 (보고서 없이 텍스트만)"""
+    return normalize_with_report(text, form=form, edge_lines=edge_lines)[0]
+
+
+def normalize_document(data: Dict, form: str = "NFC") -> Dict:
+    """PDFExtractor 출력 JSON의 text를 정규화한 사본
+
+    normalization 필드에 정규화 전후 글자 수와 제거한 쪽 번호/반복 줄 통계를 기록합니다.
+    removed_tokens는 단어/기호 단위 근사값입니다.
+    """
+    text, report = normalize_with_report(data.get('text', ''), form=form)
+    return {
+        **data,
+        'text': text,
+        'text_length': len(text),
+        'normalization': {'form': form, 'chars_before': len(data.get('text', '')), 'chars_after': len(text),
+                          **report},
+    }
+
+
+def normalize_directory(input_dir: Path, output_dir: Path, form: str = "NFC") -> List[Dict]:
+    """디렉토리의 추출 문서를 모두 정규화해 같은 파일명으로 저장"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summaries = []
+    for path in sorted(input_dir.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            document = normalize_document(json.load(f), form=form)
+        with open(output_dir / path.name, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+        summaries.append({'filename': path.name, **document['normalization']})
+    return summaries
+
+
+# ----------------------------------------------------------------------
+# 측정: 원문과 정규화 문서의 청킹 시간, 청크 수, 임베딩 입력 토큰 수 비교
+# ----------------------------------------------------------------------
+
+def load_token_counter(tokenizer_name: Optional[str] = None):
+    """텍스트 → 토큰 수 함수
+
+    토크나이저를 지정하고 로컬 캐시에 있으면 그 토크나이저로 세고,
+    없으면 단어/기호 단위 근사값을 씁니다 (비교용으로는 충분).
+    """
+    if tokenizer_name:
+        try:
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, local_files_only=True)
+            return lambda text: len(tokenizer(text, add_special_tokens=False)["input_ids"])
+        except Exception as e:
+            print(f"토크나이저 로딩 실패 ({tokenizer_name}: {e}), 근사 토큰 수 사용")
+
+    return lambda text: len(TOKEN_RE.findall(text))
+
+
+def measure(documents_dir: Path, tokenizer_name: Optional[str] = None, repeat: int = 5) -> List[Dict]:
+    """문서별로 원문/정규화 문서를 청킹해 시간, 청크 수, 토큰 수 비교"""
+    from chunker import DocumentChunker
+    from embedder import DocumentEmbedder
+
+    count_tokens = load_token_counter(tokenizer_name)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        chunker = DocumentChunker(str(documents_dir), tmp)
+        normalized_dir = Path(tmp) / "normalized"
+        normalized_dir.mkdir()
+
+        for filename, chunk_func in chunker.chunk_functions(include_standard_contract=True).items():
+            raw_path = documents_dir / filename
+            if not raw_path.exists():
+                continue
+            with open(raw_path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+
+            start = time.perf_counter()
+            normalized = normalize_document(raw)
+            normalize_sec = time.perf_counter() - start
+            normalized_path = normalized_dir / filename
+            with open(normalized_path, 'w', encoding='utf-8') as f:
+                json.dump(normalized, f, ensure_ascii=False)
+
+            row = {"filename": filename, "normalize_ms": normalize_sec * 1000}
+            for label, path in (("raw", raw_path), ("normalized", normalized_path)):
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    chunks = chunk_func(path)
+                    timings.append(time.perf_counter() - start)
+                row[label] = {
+                    "chars": len(raw['text']) if label == "raw" else len(normalized['text']),
+                    "chunk_ms": min(timings) * 1000,
+                    "chunks": len(chunks),
+                    "tokens": sum(count_tokens(DocumentEmbedder.build_text(chunk)) for chunk in chunks),
+                }
+            rows.append(row)
+    return rows
+
+
+def print_measurements(rows: List[Dict]):
+    print("\n" + "=" * 96)
+    print("정규화 효과 (원문 → 정규화)")
+    print("=" * 96)
+    print(f"{'문서':<36}{'글자':>16}{'청크':>11}{'토큰':>18}{'청킹(ms)':>15}")
+    print("-" * 96)
+
+    def change(before, after):
+        return f"{(after - before) / before:+.1%}" if before else "-"
+
+    totals = Counter()
+    for row in rows:
+        raw, norm = row["raw"], row["normalized"]
+        for key in ("chars", "chunks", "tokens", "chunk_ms"):
+            totals[f"raw_{key}"] += raw[key]
+            totals[f"norm_{key}"] += norm[key]
+        print(f"{row['filename'][:34]:<36}"
+              f"{norm['chars']:>9,} {change(raw['chars'], norm['chars']):>6}"
+              f"{raw['chunks']:>5}→{norm['chunks']:<5}"
+              f"{norm['tokens']:>11,} {change(raw['tokens'], norm['tokens']):>6}"
+              f"{raw['chunk_ms']:>7.1f}→{norm['chunk_ms']:<7.1f}")
+    print("-" * 96)
+    print(f"{'합계':<36}"
+          f"{totals['norm_chars']:>9,.0f} {change(totals['raw_chars'], totals['norm_chars']):>6}"
+          f"{totals['raw_chunks']:>5.0f}→{totals['norm_chunks']:<5.0f}"
+          f"{totals['norm_tokens']:>11,.0f} {change(totals['raw_tokens'], totals['norm_tokens']):>6}"
+          f"{totals['raw_chunk_ms']:>7.1f}→{totals['norm_chunk_ms']:<7.1f}")
+    print("=" * 96)
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="추출 텍스트 정규화")
+    parser.add_argument("--input-dir", type=Path,
+                        default=base_dir / "data" / "processed" / "documents" / "standard_contracts")
+    parser.add_argument("--output-dir", type=Path,
+                        default=base_dir / "data" / "processed" / "normalized" / "standard_contracts")
+    parser.add_argument("--form", choices=["NFC", "NFKC"], default="NFC", help="유니코드 정규화 형식")
+    parser.add_argument("--measure", action="store_true", help="청킹 속도/토큰 수 비교만 실행 (저장 안 함)")
+    parser.add_argument("--tokenizer", default=None, help="토큰 수 측정용 토크나이저 (로컬 캐시)")
+    parser.add_argument("--repeat", type=int, default=5, help="청킹 시간 측정 반복 횟수")
+    args = parser.parse_args()
+
+    if args.measure:
+        print_measurements(measure(args.input_dir, args.tokenizer, args.repeat))
+        return
+
+    summaries = normalize_directory(args.input_dir, args.output_dir, form=args.form)
+    for summary in summaries:
+        print(f"- {summary['filename']}: {summary['chars_before']:,} → {summary['chars_after']:,}자 "
+              f"(쪽 번호 {summary['page_number_lines']}줄, 반복 머리말/꼬리말 {summary['boilerplate_lines']}줄 제거)")
+    print(f"저장 위치: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
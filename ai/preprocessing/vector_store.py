@@ -0,0 +1,589 @@
+"""
+chunk_id 단위 추가/갱신/삭제가 가능한 세그먼트 벡터 저장소
+
+embeddings.npy + chunks_with_embeddings.json은 청크 하나만 바뀌어도 전체를 다시 써야 합니다.
+VectorStore는 변경분을 새 세그먼트 파일로 추가하고, 삭제되거나 갱신된 이전 행은 툼스톤으로 표시만 합니다.
+매일 수백 건의 법률 데이터 갱신은 작은 세그먼트 하나와 manifest 교체로 끝나고 기존 세그먼트는 건드리지 않습니다.
+
+- upsert: 같은 chunk_id의 이전 행을 툼스톤 처리하고 새 행 추가 (commit 전에도 같은 프로세스 검색에 반영)
+- delete: 툼스톤만 기록하고 실제 제거는 컴팩션에서
+- commit: 대기 행을 세그먼트 파일로 쓰고 manifest를 tmp 파일 교체로 갱신 (중간에 끊겨도 이전 상태 유지)
+- 컴팩션: 툼스톤 비율이나 세그먼트 수가 기준을 넘으면 백그라운드 스레드에서 살아 있는 행만 한 세그먼트로 합침
+  (합치는 동안의 추가/삭제/검색은 그대로 진행되고, 그 사이 삭제된 행은 합친 세그먼트에서도 툼스톤)
+- 메타데이터 색인: doc_type, category, doc_id 값 → chunk_id 집합 (필터 검색 시 전체 청크를 훑지 않음)
+
+저장 구조:
+    <store>/manifest.json              세그먼트 목록, 세그먼트별 툼스톤 행, 모델
+    <store>/segments/seg-000001.npy    float32 [행 수, 차원]
+    <store>/segments/seg-000001.jsonl  행 순서대로 청크 (임베딩 제외)
+
+사용법:
+    python vector_store.py import --embeddings-dir ../data/processed/embeddings --store ../data/processed/store
+    python vector_store.py upsert --store ../data/processed/store --chunks new_chunks.jsonl
+    python vector_store.py delete --store ../data/processed/store --chunk-ids ID [ID ...]
+    python vector_store.py compact --store ../data/processed/store
+    python vector_store.py stats --store ../data/processed/store
+    python search_server.py --embeddings-dir ../data/processed/store    # manifest.json이 있으면 저장소로 검색
+    python legal_ingest.py --run-id 20251027 --store ../data/processed/legal_store   # 일일 증분 갱신
+"""
+
+import heapq
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from metrics import count, timed
+
+
+MANIFEST = "manifest.json"
+INDEX_FIELDS = ("doc_type", "category", "doc_id")
+# 커밋 전 대기 행이 이만큼 쌓이면 자동으로 세그먼트로 내림 (메모리 상한)
+SEGMENT_ROWS = 20000
+# 툼스톤 비율 또는 세그먼트 수가 기준을 넘으면 컴팩션
+MAX_DEAD_RATIO = 0.2
+MAX_SEGMENTS = 8
+
+
+def replace_json(path: Path, data):
+    """tmp 파일에 쓴 뒤 교체"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _indexable(value) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def find_embedding_files(embeddings_dir: Path) -> Tuple[Optional[Path], Optional[Path]]:
+    """기존 임베딩 디렉토리의 (청크 파일, 임베딩 파일) (표준 문서 또는 법률 데이터)"""
+    embeddings_dir = Path(embeddings_dir)
+    chunks_file = next((embeddings_dir / name for name in ("chunks_with_embeddings.json", "legal_chunks.jsonl")
+                        if (embeddings_dir / name).exists()), None)
+    embeddings_file = next((embeddings_dir / name for name in ("embeddings.npy", "legal_embeddings.npy")
+                            if (embeddings_dir / name).exists()), None)
+    return chunks_file, embeddings_file
+
+
+def iter_embedding_batches(chunks_file: Path, embeddings_file: Path,
+                           batch_rows: int = SEGMENT_ROWS) -> Iterator[Tuple[List[Dict], np.ndarray]]:
+    """청크 파일과 임베딩 행렬을 같은 순서로 batch_rows개씩 읽기 (행렬은 메모리 매핑)"""
+    from chunk_store import iter_chunks
+
+    embeddings = np.load(embeddings_file, mmap_mode='r')
+    batch, offset = [], 0
+    for chunk in iter_chunks(chunks_file):
+        batch.append(chunk)
+        if len(batch) >= batch_rows:
+            yield batch, embeddings[offset:offset + len(batch)]
+            offset, batch = offset + len(batch), []
+    if batch:
+        yield batch, embeddings[offset:offset + len(batch)]
+
+
+class Segment:
+    """세그먼트 하나 (커밋 전 대기 세그먼트는 name이 None이고 행이 계속 추가됨)"""
+
+    def __init__(self, name: Optional[str], vectors: np.ndarray, chunks: List[Dict],
+                 deleted: Iterable[int] = ()):
+        self.name = name
+        self.chunks = list(chunks)
+        self.live = np.ones(len(self.chunks), dtype=bool)
+        self.live[list(deleted)] = False
+        self._blocks = [vectors]
+        self._vectors: Optional[np.ndarray] = vectors
+        self._norms: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def dead(self) -> int:
+        return len(self) - int(self.live.sum())
+
+    def append(self, chunks: List[Dict], vectors: np.ndarray):
+        self.chunks.extend(chunks)
+        self.live = np.concatenate([self.live, np.ones(len(chunks), dtype=bool)])
+        # 배치마다 행렬을 다시 만들지 않고 검색/커밋 시점에 한 번 합침
+        self._blocks.append(vectors)
+        self._vectors = self._norms = None
+
+    @property
+    def vectors(self) -> np.ndarray:
+        if self._vectors is None:
+            self._vectors = np.concatenate(self._blocks)
+            self._blocks = [self._vectors]
+        return self._vectors
+
+    @property
+    def norms(self) -> np.ndarray:
+        if self._norms is None:
+            self._norms = np.linalg.norm(self.vectors, axis=1)
+        return self._norms
+
+
+class VectorStore:
+    """세그먼트 + 툼스톤 기반 증분 벡터 저장소"""
+
+    def __init__(self, store_dir: Path, model_name: Optional[str] = None,
+                 index_fields: Tuple[str, ...] = INDEX_FIELDS, segment_rows: int = SEGMENT_ROWS,
+                 max_dead_ratio: float = MAX_DEAD_RATIO, max_segments: int = MAX_SEGMENTS):
+        """
+        Args:
+            store_dir: 저장소 디렉토리 (없으면 첫 commit에서 생성)
+            model_name: 임베딩 모델 (기존 저장소와 다르면 ValueError)
+            index_fields: 메타데이터 색인을 유지할 청크 필드
+            segment_rows: 커밋 전 대기 행 상한
+            max_dead_ratio: 컴팩션을 시작할 툼스톤 비율
+            max_segments: 컴팩션을 시작할 세그먼트 수
+        """
+        self.store_dir = Path(store_dir)
+        self.segments_dir = self.store_dir / "segments"
+        self.manifest_file = self.store_dir / MANIFEST
+        self.index_fields = index_fields
+        self.segment_rows = segment_rows
+        self.max_dead_ratio = max_dead_ratio
+        self.max_segments = max_segments
+
+        self.segments: List[Segment] = []
+        self.rows: Dict[str, Tuple[Segment, int]] = {}
+        self.index: Dict[str, Dict[object, Set[str]]] = {field: {} for field in index_fields}
+        self.model_name = model_name
+        self.dim: Optional[int] = None
+        self._next_segment = 1
+        self._pending: Optional[Segment] = None
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+
+        if self.manifest_file.exists():
+            self._load()
+
+    @classmethod
+    def exists(cls, store_dir: Path) -> bool:
+        return (Path(store_dir) / MANIFEST).exists()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ---- 로딩/저장 ----
+
+    def _load(self):
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if self.model_name and manifest.get("model_name") and manifest["model_name"] != self.model_name:
+            raise ValueError(f"저장소 모델({manifest['model_name']})과 임베딩 모델({self.model_name})이 다릅니다")
+        self.model_name = manifest.get("model_name") or self.model_name
+        self.dim = manifest.get("dim")
+        self._next_segment = manifest.get("next_segment", 1)
+
+        for entry in manifest["segments"]:
+            vectors = np.load(self.segments_dir / f"{entry['name']}.npy", mmap_mode='r')
+            with open(self.segments_dir / f"{entry['name']}.jsonl", 'r', encoding='utf-8') as f:
+                chunks = [json.loads(line) for line in f if line.strip()]
+            segment = Segment(entry["name"], vectors, chunks, entry.get("deleted", []))
+            self.segments.append(segment)
+            for row in np.flatnonzero(segment.live):
+                self._register(segment, int(row))
+
+    def _write_manifest(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        replace_json(self.manifest_file, {
+            "model_name": self.model_name,
+            "dim": self.dim,
+            "next_segment": self._next_segment,
+            "total_chunks": len(self.rows),
+            "segments": [
+                {"name": segment.name, "rows": len(segment),
+                 "deleted": np.flatnonzero(~segment.live).tolist()}
+                for segment in self.segments
+            ],
+        })
+
+    def _write_chunks(self, name: str, chunks: List[Dict]):
+        path = self.segments_dir / f"{name}.jsonl"
+        tmp_path = path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    def _new_segment_name(self) -> str:
+        name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    # ---- 색인 ----
+
+    def _register(self, segment: Segment, row: int):
+        chunk = segment.chunks[row]
+        chunk_id = chunk["chunk_id"]
+        if chunk_id in self.rows:
+            # 갱신: 이전 행은 툼스톤 (로딩 시에는 나중 세그먼트가 우선)
+            self._unregister(chunk_id)
+        self.rows[chunk_id] = (segment, row)
+        for field in self.index_fields:
+            value = chunk.get(field)
+            if _indexable(value):
+                self.index[field].setdefault(value, set()).add(chunk_id)
+
+    def _unregister(self, chunk_id: str):
+        segment, row = self.rows.pop(chunk_id)
+        segment.live[row] = False
+        chunk = segment.chunks[row]
+        for field in self.index_fields:
+            value = chunk.get(field)
+            if _indexable(value) and value in self.index[field]:
+                postings = self.index[field][value]
+                postings.discard(chunk_id)
+                if not postings:
+                    del self.index[field][value]
+
+    def _match_ids(self, filters: Dict) -> Set[str]:
+        """필터에 맞는 살아 있는 chunk_id (색인 필드는 교집합, 나머지는 청크 값 비교)"""
+        ids = None
+        rest = {}
+        for key, value in filters.items():
+            if key in self.index and _indexable(value):
+                postings = self.index[key].get(value, set())
+                ids = set(postings) if ids is None else ids & postings
+            else:
+                rest[key] = value
+
+        if ids is None:
+            ids = set(self.rows)
+        if rest:
+            ids = {chunk_id for chunk_id in ids
+                   if all(self.get(chunk_id).get(key) == value for key, value in rest.items())}
+        return ids
+
+    # ---- 변경 ----
+
+    @timed("store_upsert")
+    def upsert(self, chunks: List[Dict], embeddings: np.ndarray):
+        """chunk_id 기준 추가/갱신 (commit 전까지 파일에는 반영되지 않음)"""
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if len(chunks) != len(embeddings):
+            raise ValueError(f"청크 수({len(chunks)})와 임베딩 수({len(embeddings)})가 다릅니다")
+        if not len(chunks):
+            return
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(embeddings.shape[1])
+            elif embeddings.shape[1] != self.dim:
+                raise ValueError(f"임베딩 차원({embeddings.shape[1]})이 저장소 차원({self.dim})과 다릅니다")
+
+            if self._pending is None:
+                self._pending = Segment(None, np.zeros((0, self.dim), dtype=np.float32), [])
+            start = len(self._pending)
+            self._pending.append([{k: v for k, v in chunk.items() if k != "embedding"} for chunk in chunks],
+                                 embeddings)
+            for i in range(len(chunks)):
+                self._register(self._pending, start + i)
+            count("store_upserted", len(chunks))
+
+            if len(self._pending) >= self.segment_rows:
+                self.commit()
+
+    def delete(self, chunk_ids: Iterable[str]) -> int:
+        """툼스톤 기록 (없는 chunk_id는 무시), 삭제한 수 반환"""
+        removed = 0
+        with self._lock:
+            for chunk_id in chunk_ids:
+                if chunk_id in self.rows:
+                    self._unregister(chunk_id)
+                    removed += 1
+        count("store_deleted", removed)
+        return removed
+
+    @timed("store_commit")
+    def commit(self, compact: bool = True):
+        """대기 행을 세그먼트로 쓰고 manifest 교체 (compact=True면 필요 시 백그라운드 컴팩션)"""
+        with self._lock:
+            pending = self._pending
+            if pending is not None and len(pending):
+                name = self._new_segment_name()
+                self.segments_dir.mkdir(parents=True, exist_ok=True)
+                path = self.segments_dir / f"{name}.npy"
+                tmp_path = self.segments_dir / f"{name}.tmp.npy"
+                np.save(tmp_path, pending.vectors)
+                os.replace(tmp_path, path)
+                self._write_chunks(name, pending.chunks)
+                pending.name = name
+                self.segments.append(pending)
+            self._pending = None
+            self._write_manifest()
+
+        if compact:
+            self.maybe_compact()
+
+    # ---- 컴팩션 ----
+
+    def needs_compaction(self) -> bool:
+        with self._lock:
+            total = sum(len(segment) for segment in self.segments)
+            dead = sum(segment.dead for segment in self.segments)
+        return len(self.segments) > self.max_segments or (total > 0 and dead / total > self.max_dead_ratio)
+
+    def maybe_compact(self, background: bool = True) -> bool:
+        """기준을 넘으면 컴팩션 시작 (이미 진행 중이면 건너뜀)"""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return False
+            if not self.needs_compaction():
+                return False
+            if not background:
+                self.compact()
+                return True
+            self._compaction = threading.Thread(target=self.compact, name="store-compact", daemon=True)
+            self._compaction.start()
+            return True
+
+    def wait_compaction(self):
+        if self._compaction is not None:
+            self._compaction.join()
+
+    @timed("store_compact")
+    def compact(self) -> Dict:
+        """커밋된 세그먼트의 살아 있는 행을 한 세그먼트로 합침"""
+        with self._lock:
+            snapshot = list(self.segments)
+            lives = [segment.live.copy() for segment in snapshot]
+            if not snapshot or (len(snapshot) == 1 and not snapshot[0].dead):
+                return {"segments": len(snapshot), "removed_rows": 0}
+            name = self._new_segment_name()
+
+        # 새 세그먼트 작성은 락 밖에서 (검색, upsert, commit은 계속 진행)
+        total = int(sum(live.sum() for live in lives))
+        path = self.segments_dir / f"{name}.npy"
+        tmp_path = self.segments_dir / f"{name}.tmp.npy"
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(total, self.dim))
+        chunks = []
+        offset = 0
+        for segment, live in zip(snapshot, lives):
+            rows = np.flatnonzero(live)
+            if len(rows):
+                out[offset:offset + len(rows)] = segment.vectors[rows]
+                offset += len(rows)
+                chunks.extend(segment.chunks[row] for row in rows)
+        out.flush()
+        del out
+        os.replace(tmp_path, path)
+        self._write_chunks(name, chunks)
+        merged = Segment(name, np.load(path, mmap_mode='r'), chunks)
+
+        with self._lock:
+            # 컴팩션 중 삭제/갱신된 행은 합친 세그먼트에서도 툼스톤, 나머지는 새 위치로
+            new_row = 0
+            for segment, live in zip(snapshot, lives):
+                for row in np.flatnonzero(live):
+                    chunk_id = segment.chunks[row]["chunk_id"]
+                    if segment.live[row]:
+                        self.rows[chunk_id] = (merged, new_row)
+                    else:
+                        merged.live[new_row] = False
+                    new_row += 1
+
+            compacted = {id(segment) for segment in snapshot}
+            self.segments = [merged] + [segment for segment in self.segments if id(segment) not in compacted]
+            self._write_manifest()
+
+            removed_rows = sum(len(segment) for segment in snapshot) - total
+            for segment in snapshot:
+                for suffix in (".npy", ".jsonl"):
+                    (self.segments_dir / f"{segment.name}{suffix}").unlink(missing_ok=True)
+
+        count("store_compacted_rows", removed_rows)
+        return {"segments": len(snapshot), "removed_rows": removed_rows}
+
+    # ---- 조회/검색 ----
+
+    def get(self, chunk_id: str) -> Optional[Dict]:
+        with self._lock:
+            location = self.rows.get(chunk_id)
+        if location is None:
+            return None
+        segment, row = location
+        return segment.chunks[row]
+
+    def vector(self, chunk_id: str) -> Optional[np.ndarray]:
+        """저장된 임베딩 (메타데이터만 바뀐 청크를 다시 임베딩하지 않고 upsert할 때 사용)"""
+        with self._lock:
+            location = self.rows.get(chunk_id)
+            if location is None:
+                return None
+            segment, row = location
+            return segment.vectors[row].copy()
+
+    def may_match(self, filters: Optional[Dict]) -> bool:
+        """색인 필드 필터 값이 하나라도 없으면 False (샤드 가지치기용, 색인 밖 필드는 확인하지 않음)"""
+        with self._lock:
+            return all(value in self.index[key] for key, value in (filters or {}).items()
+                       if key in self.index and _indexable(value))
+
+    def ids(self, filters: Optional[Dict] = None) -> Set[str]:
+        """필터에 맞는 chunk_id 집합"""
+        with self._lock:
+            return self._match_ids(filters) if filters else set(self.rows)
+
+    def live_chunks(self) -> List[Dict]:
+        """살아 있는 청크 (세그먼트 순서)"""
+        with self._lock:
+            return [segment.chunks[row] for segment in self._searchable() for row in np.flatnonzero(segment.live)]
+
+    def _searchable(self) -> List[Segment]:
+        if self._pending is not None and len(self._pending):
+            return self.segments + [self._pending]
+        return list(self.segments)
+
+    @timed("store_search")
+    def search(self, query_embedding: np.ndarray, top_k: int = 5, filters: Optional[Dict] = None) -> List[Dict]:
+        """코사인 유사도 상위 k개 (EmbeddingTester.search_by_embedding과 같은 결과 형식)
+
+        필터가 없으면 세그먼트 전체를 계산하고 툼스톤 행만 제외하며,
+        필터가 있으면 메타데이터 색인으로 고른 행만 계산합니다.
+        """
+        with self._lock:
+            if filters:
+                # 살아 있는 청크 전부가 맞는 색인 필터는 제외 (doc_type 샤드에 같은 doc_type 필터 등)
+                filters = {key: value for key, value in filters.items()
+                           if not (key in self.index and _indexable(value)
+                                   and len(self.index[key].get(value, ())) == len(self.rows))}
+            if filters:
+                by_segment: Dict[int, List[int]] = {}
+                for chunk_id in self._match_ids(filters):
+                    segment, row = self.rows[chunk_id]
+                    by_segment.setdefault(id(segment), []).append(row)
+                targets = [(segment, np.array(sorted(by_segment[id(segment)])))
+                           for segment in self._searchable() if id(segment) in by_segment]
+            else:
+                targets = [(segment, None) for segment in self._searchable()]
+            # 대기 세그먼트 행렬은 락 안에서 합쳐 둠
+            targets = [(segment, rows, segment.vectors, segment.norms, segment.live) for segment, rows in targets]
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = max(float(np.linalg.norm(query)), 1e-12)
+
+        candidates = []
+        for segment, rows, vectors, norms, live in targets:
+            if rows is None:
+                similarities = (vectors @ query) / (norms * query_norm)
+                similarities[~live] = -np.inf
+            else:
+                similarities = (vectors[rows] @ query) / (norms[rows] * query_norm)
+            k = min(top_k, len(similarities))
+            if k == 0:
+                continue
+            top = np.argpartition(-similarities, k - 1)[:k]
+            for i in top:
+                if np.isfinite(similarities[i]):
+                    row = int(i) if rows is None else int(rows[i])
+                    candidates.append((float(similarities[i]), segment.chunks[row]))
+
+        best = heapq.nlargest(top_k, candidates, key=lambda item: item[0])
+        return [{"rank": rank, "similarity": similarity, "chunk": chunk}
+                for rank, (similarity, chunk) in enumerate(best, 1)]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            segments = self._searchable()
+            return {
+                "live_chunks": len(self.rows),
+                "segments": len(self.segments),
+                "pending_rows": len(self._pending) if self._pending is not None else 0,
+                "total_rows": sum(len(segment) for segment in segments),
+                "dead_rows": sum(segment.dead for segment in segments),
+                "model_name": self.model_name,
+                "dim": self.dim,
+            }
+
+    def close(self):
+        """대기 행 커밋 후 진행 중인 컴팩션 완료 대기"""
+        self.commit()
+        self.wait_compaction()
+
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+    import time
+
+    from chunk_store import iter_chunks
+
+    default_embeddings = Path(__file__).parent.parent / "data" / "processed" / "embeddings"
+
+    parser = argparse.ArgumentParser(description="증분 벡터 저장소")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="기존 임베딩 디렉토리를 저장소로 변환")
+    import_parser.add_argument("--embeddings-dir", type=Path, default=default_embeddings)
+    import_parser.add_argument("--chunks", type=Path, default=None,
+                               help="청크 파일 (기본: chunks_with_embeddings.json 또는 legal_chunks.jsonl)")
+    import_parser.add_argument("--embeddings", type=Path, default=None,
+                               help="임베딩 파일 (기본: embeddings.npy 또는 legal_embeddings.npy)")
+
+    upsert_parser = subparsers.add_parser("upsert", help="청크 파일을 임베딩해 chunk_id 기준 추가/갱신")
+    upsert_parser.add_argument("--chunks", type=Path, required=True, help="청크 파일 (.json 배열 또는 .jsonl)")
+    upsert_parser.add_argument("--batch-size", type=int, default=8)
+    upsert_parser.add_argument("--backend", default="torch")
+
+    delete_parser = subparsers.add_parser("delete", help="chunk_id 삭제 (툼스톤)")
+    delete_parser.add_argument("--chunk-ids", nargs="+", required=True)
+
+    subparsers.add_parser("compact", help="살아 있는 행만 한 세그먼트로 합치기")
+    subparsers.add_parser("stats", help="세그먼트/툼스톤 현황")
+
+    for sub in subparsers.choices.values():
+        sub.add_argument("--store", type=Path, required=True, help="저장소 디렉토리")
+        sub.add_argument("--model", default="nlpai-lab/KURE-v1")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "upsert":
+        from embedder import DocumentEmbedder
+
+        embedder = DocumentEmbedder(model_name=args.model, batch_size=args.batch_size, backend=args.backend)
+        store = VectorStore(args.store, model_name=embedder.cache_key)
+        chunks = list(iter_chunks(args.chunks))
+        embeddings = embedder.encode_texts([embedder.build_text(chunk) for chunk in chunks], show_progress_bar=True)
+        store.upsert(chunks, embeddings)
+        store.close()
+        print(f"추가/갱신: {len(chunks)}개")
+    elif args.command == "import":
+        found_chunks, found_embeddings = find_embedding_files(args.embeddings_dir)
+        chunks_file = args.chunks or found_chunks
+        embeddings_file = args.embeddings or found_embeddings
+        if chunks_file is None or embeddings_file is None:
+            print(f"청크/임베딩 파일이 없습니다: {args.embeddings_dir}")
+            return
+
+        store = VectorStore(args.store, model_name=args.model)
+        total = 0
+        for chunks, embeddings in iter_embedding_batches(chunks_file, embeddings_file, store.segment_rows):
+            store.upsert(chunks, embeddings)
+            total += len(chunks)
+        store.close()
+        print(f"가져오기: {total}개 ({chunks_file.name}, {embeddings_file.name})")
+    else:
+        store = VectorStore(args.store, model_name=args.model)
+        if args.command == "delete":
+            removed = store.delete(args.chunk_ids)
+            store.close()
+            print(f"삭제: {removed}개")
+        elif args.command == "compact":
+            result = store.compact()
+            print(f"컴팩션: 세그먼트 {result['segments']}개 → 1개, 툼스톤 {result['removed_rows']}행 제거")
+
+    stats = store.stats()
+    print(f"저장소: 청크 {stats['live_chunks']}개, 세그먼트 {stats['segments']}개, "
+          f"툼스톤 {stats['dead_rows']}행 ({time.perf_counter() - start:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()